@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Run the same Document edit script across many .docx files in parallel.
+
+Each input file goes through unpack -> edit -> validate -> pack in a worker
+process. A failure in one document is recorded and never stops the batch, and
+every document gets one JSON line in the results log as soon as it finishes.
+
+Temporary disk usage is bounded: a worker holds at most one unpacked document
+at a time and deletes it before taking the next, so peak usage is roughly
+``jobs`` x (unpacked size of the largest document).
+
+Usage:
+    # my_edits.py
+    def redline(doc, source_path):
+        node = doc["word/document.xml"].get_node(tag="w:r", contains="30 days")
+        ...
+
+    # From Python
+    from scripts.batch import run_batch
+    run_batch(paths, "my_edits:redline", "out/", jobs=8, results_log="results.jsonl")
+
+    # From the command line (PYTHONPATH set to the docx skill root)
+    python -m scripts.batch contracts/*.docx --edit my_edits:redline \\
+        --output-dir out --jobs 8 --results results.jsonl
+"""
+
+import argparse
+import contextlib
+import importlib
+import io
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import traceback
+import zipfile
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+from pathlib import Path
+
+import defusedxml.minidom
+from ooxml.scripts.pack import pack_document
+
+from .document import Document, _generate_rsid
+
+# Characters of captured worker output kept in the results log on failure
+OUTPUT_TAIL_CHARS = 2000
+
+
+def run_batch(
+    input_files,
+    edit,
+    output_dir,
+    jobs=None,
+    results_log=None,
+    author="Claude",
+    initials="C",
+    rsid=None,
+    track_revisions=False,
+    validate=True,
+    temp_root=None,
+):
+    """
+    Apply an edit function to many .docx files using a process pool.
+
+    Args:
+        input_files: Iterable of .docx paths to process
+        edit: Callable ``edit(doc, source_path)`` or an importable "module:function"
+            string. It receives a Document and the original .docx path.
+        output_dir: Directory for edited .docx files (same file names as inputs,
+            so inputs must have distinct file names)
+        jobs: Number of worker processes (default: os.cpu_count())
+        results_log: Optional path of a JSON-lines file with one record per document
+        author: Author name for tracked changes and comments (default: "Claude")
+        initials: Author initials (default: "C")
+        rsid: RSID for all documents. If None, each document gets its own.
+        track_revisions: If True, enables track revisions in settings.xml
+        validate: If True, runs schema and redlining validation before packing
+        temp_root: Directory for per-document scratch space, including the
+            Document's working copy (default: system temp)
+
+    Returns:
+        List of result dicts in completion order, each with keys
+        "input", "output", "status" ("ok" or "error"), "seconds" and,
+        for failures, "error" and "output_tail".
+
+    Raises:
+        ValueError: If two inputs have the same file name (their outputs would
+            overwrite each other)
+    """
+    input_files = [Path(p) for p in input_files]
+    output_dir = Path(output_dir)
+
+    # Compare case-insensitively so outputs can't collide on case-insensitive
+    # file systems either
+    sources_by_name = {}
+    for source in input_files:
+        sources_by_name.setdefault(source.name.lower(), []).append(str(source))
+    collisions = [paths for paths in sources_by_name.values() if len(paths) > 1]
+    if collisions:
+        raise ValueError(
+            "Input files share a file name, so their outputs would overwrite each "
+            "other: " + "; ".join(", ".join(paths) for paths in collisions)
+        )
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+
+    options = {
+        "author": author,
+        "initials": initials,
+        "rsid": rsid,
+        "track_revisions": track_revisions,
+        "validate": validate,
+        "temp_root": str(temp_root) if temp_root else None,
+    }
+
+    results = []
+    log_file = open(results_log, "a", encoding="utf-8") if results_log else None
+    try:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            # Keep only a small window of documents in flight so that a huge
+            # input list does not sit in the executor queue all at once
+            pending = {}  # future -> (source, target, submit time)
+            queue = iter(input_files)
+            window = jobs * 2
+
+            def record(result):
+                results.append(result)
+                if log_file:
+                    log_file.write(json.dumps(result) + "\n")
+                    log_file.flush()
+
+            def submit_next():
+                for source in queue:
+                    target = output_dir / source.name
+                    started = time.perf_counter()
+                    try:
+                        future = executor.submit(
+                            process_document, str(source), str(target), edit, options
+                        )
+                    except BrokenProcessPool as e:
+                        # A worker died earlier; the pool takes no more work
+                        record(_failed_result(source, target, e, started))
+                        continue
+                    pending[future] = (source, target, started)
+                    return True
+                return False
+
+            while len(pending) < window and submit_next():
+                pass
+
+            while pending:
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    source, target, started = pending.pop(future)
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        # The worker process died (BrokenProcessPool) or the
+                        # job could not be sent to it (e.g. unpicklable edit)
+                        result = _failed_result(source, target, e, started)
+                    record(result)
+                    submit_next()
+    finally:
+        if log_file:
+            log_file.close()
+
+    return results
+
+
+def process_document(source, target, edit, options):
+    """
+    Unpack, edit, validate and pack a single document.
+
+    Runs inside a worker process. Never raises: any failure is returned as an
+    error result so that one bad document cannot take down the batch.
+
+    Args:
+        source: Path to the input .docx
+        target: Path to the output .docx
+        edit: Callable or "module:function" string (see run_batch)
+        options: Dict of Document and pipeline options (see run_batch)
+
+    Returns:
+        Result dict for the results log
+    """
+    started = time.perf_counter()
+    result = {"input": source, "output": target}
+    captured = io.StringIO()
+
+    try:
+        with tempfile.TemporaryDirectory(
+            prefix="docx_batch_", dir=options["temp_root"]
+        ) as scratch:
+            unpacked = Path(scratch) / "unpacked"
+            doc = None
+            try:
+                with contextlib.redirect_stdout(captured):
+                    _unpack(source, unpacked)
+                    doc = Document(
+                        unpacked,
+                        rsid=options["rsid"] or _generate_rsid(),
+                        track_revisions=options["track_revisions"],
+                        author=options["author"],
+                        initials=options["initials"],
+                        temp_dir=scratch,
+                    )
+                    _resolve_edit(edit)(doc, Path(source))
+                    doc.save(validate=options["validate"])
+                    pack_document(unpacked, target, validate=False)
+            finally:
+                # Document keeps its own working copy; drop it now rather than
+                # waiting for garbage collection so disk usage stays bounded
+                if doc is not None:
+                    shutil.rmtree(doc.temp_dir, ignore_errors=True)
+        result["status"] = "ok"
+    except Exception as e:
+        result["status"] = "error"
+        result["error"] = f"{type(e).__name__}: {e}"
+        captured.write(traceback.format_exc())
+        result["output_tail"] = captured.getvalue()[-OUTPUT_TAIL_CHARS:]
+        Path(target).unlink(missing_ok=True)
+
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _failed_result(source, target, error, started):
+    """Error result for a document whose worker never returned one."""
+    Path(target).unlink(missing_ok=True)
+    return {
+        "input": str(source),
+        "output": str(target),
+        "status": "error",
+        "error": f"{type(error).__name__}: {error}",
+        "output_tail": "",
+        "seconds": round(time.perf_counter() - started, 3),
+    }
+
+
+def _unpack(input_file, output_dir):
+    """Extract an Office file and pretty-print its XML (same as unpack.py)."""
+    output_dir.mkdir(parents=True, exist_ok=True)
+    with zipfile.ZipFile(input_file) as zf:
+        zf.extractall(output_dir)
+
+    xml_files = list(output_dir.rglob("*.xml")) + list(output_dir.rglob("*.rels"))
+    for xml_file in xml_files:
+        content = xml_file.read_text(encoding="utf-8")
+        dom = defusedxml.minidom.parseString(content)
+        xml_file.write_bytes(dom.toprettyxml(indent="  ", encoding="ascii"))
+
+
+def _resolve_edit(edit):
+    """Return the edit callable, importing it if given as "module:function"."""
+    if callable(edit):
+        return edit
+    module_name, sep, func_name = edit.partition(":")
+    if not sep or not module_name or not func_name:
+        raise ValueError(f"Edit must be 'module:function', got {edit!r}")
+    return getattr(importlib.import_module(module_name), func_name)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Apply a Document edit script to many .docx files in parallel"
+    )
+    parser.add_argument("input_files", nargs="+", help="Input .docx files")
+    parser.add_argument(
+        "--edit",
+        required=True,
+        help="Edit function as module:function, called with (doc, source_path)",
+    )
+    parser.add_argument("--output-dir", required=True, help="Output directory")
+    parser.add_argument(
+        "--jobs", type=int, default=None, help="Worker processes (default: CPU count)"
+    )
+    parser.add_argument("--results", help="JSON-lines results log (appended)")
+    parser.add_argument("--author", default="Claude", help="Author name")
+    parser.add_argument("--initials", default="C", help="Author initials")
+    parser.add_argument("--rsid", help="RSID to use for every document")
+    parser.add_argument(
+        "--track-revisions", action="store_true", help="Enable track revisions"
+    )
+    parser.add_argument(
+        "--no-validate", action="store_true", help="Skip schema/redlining validation"
+    )
+    parser.add_argument("--temp-root", help="Directory for scratch space")
+    args = parser.parse_args()
+
+    try:
+        results = run_batch(
+            args.input_files,
+            args.edit,
+            args.output_dir,
+            jobs=args.jobs,
+            results_log=args.results,
+            author=args.author,
+            initials=args.initials,
+            rsid=args.rsid,
+            track_revisions=args.track_revisions,
+            validate=not args.no_validate,
+            temp_root=args.temp_root,
+        )
+    except ValueError as e:
+        parser.error(str(e))
+
+    failed = [r for r in results if r["status"] != "ok"]
+    print(
+        f"Processed {len(results)} documents: "
+        f"{len(results) - len(failed)} ok, {len(failed)} failed"
+    )
+    for r in failed:
+        print(f"  {r['input']}: {r['error']}", file=sys.stderr)
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
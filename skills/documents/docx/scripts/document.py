@@ -619,6 +619,7 @@ class Document:
         track_revisions=False,
         author="Claude",
         initials="C",
+        temp_dir=None,
     ):
         """
         Initialize with path to unpacked Word document directory.
@@ -630,6 +631,7 @@ class Document:
             track_revisions: If True, enables track revisions in settings.xml (default: False)
             author: Default author name for comments (default: "Claude")
             initials: Default author initials for comments (default: "C")
+            temp_dir: Directory to create the working copy in (default: system temp)
         """
         self.original_path = Path(unpacked_dir)
 
@@ -637,7 +639,7 @@ class Document:
             raise ValueError(f"Directory not found: {unpacked_dir}")
 
         # Create temporary directory with subdirectories for unpacked content and baseline
-        self.temp_dir = tempfile.mkdtemp(prefix="docx_")
+        self.temp_dir = tempfile.mkdtemp(prefix="docx_", dir=temp_dir)
         self.unpacked_path = Path(self.temp_dir) / "unpacked"
         shutil.copytree(self.original_path, self.unpacked_path)
 
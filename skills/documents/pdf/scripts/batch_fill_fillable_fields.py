@@ -0,0 +1,216 @@
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from concurrent.futures.process import BrokenProcessPool
+
+from pypdf import PdfReader, PdfWriter
+
+from extract_form_field_info import get_field_index
+from fill_fillable_fields import get_field_value_errors, monkeypatch_pydpf_method
+
+
+# Fills the same fillable PDF form once per record, for many records. See forms.md.
+#
+# The template is parsed and its fields are extracted and indexed once. Records are validated
+# against that index in the main process, and only valid ones are sent to a pool of worker
+# processes, each of which keeps its own parsed copy of the template and writes one filled PDF
+# per record.
+#
+# Records come from a CSV file (header row of field IDs) or a JSON-lines file (one object per
+# line mapping field IDs to values). The optional `_output` column/key sets the output file name;
+# otherwise records are written as record_00001.pdf, record_00002.pdf, ... Records that can't be
+# parsed, or whose output file name is already used by an earlier record, are reported as invalid.
+# A malformed CSV file is reported at the row where it stops being readable; no later rows are read.
+
+
+OUTPUT_KEY = "_output"
+
+# Parsed template, set in each worker process by init_worker.
+_template_reader = None
+
+
+# Yields a (record, error) pair per record: the record dict and None, or None and a message if
+# the record can't be parsed.
+def read_records(records_path):
+    if records_path.endswith(".csv"):
+        with open(records_path, newline="", encoding="utf-8-sig") as f:
+            reader = csv.DictReader(f)
+            try:
+                for row in reader:
+                    if None in row:
+                        yield None, f"Invalid record on line {reader.line_num}: more cells than header columns"
+                        continue
+                    # Empty cells leave the field unchanged.
+                    yield {k: v for k, v in row.items() if v not in (None, "")}, None
+            except csv.Error as e:
+                yield None, f"Malformed CSV after line {reader.line_num}, no further records read: {e}"
+    else:
+        with open(records_path, encoding="utf-8") as f:
+            for line_number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                except ValueError as e:
+                    yield None, f"Invalid record on line {line_number}: {e}"
+                    continue
+                if not isinstance(record, dict):
+                    yield None, f"Invalid record on line {line_number}: expected a JSON object, got {type(record).__name__}"
+                    continue
+                yield record, None
+
+
+# Converts a record ({field_id: value}) to the field_values.json format, taking each
+# field's page from the template.
+def record_to_fields(record, fields_by_ids):
+    fields = []
+    for field_id, value in record.items():
+        if field_id == OUTPUT_KEY:
+            continue
+        existing_field = fields_by_ids.get(field_id)
+        fields.append({
+            "field_id": field_id,
+            "page": existing_field["page"] if existing_field else None,
+            "value": value,
+        })
+    return fields
+
+
+def init_worker(template_pdf_path):
+    global _template_reader
+    monkeypatch_pydpf_method()
+    with open(template_pdf_path, "rb") as f:
+        _template_reader = PdfReader(io.BytesIO(f.read()))
+
+
+def fill_record(fields_by_page, output_pdf_path):
+    writer = PdfWriter(clone_from=_template_reader)
+    for page, field_values in fields_by_page.items():
+        writer.update_page_form_field_values(writer.pages[page - 1], field_values, auto_regenerate=False)
+    # See fill_fillable_fields.py.
+    writer.set_need_appearances_writer(True)
+    with open(output_pdf_path, "wb") as f:
+        writer.write(f)
+
+
+def _fill_record_safely(record_number, fields_by_page, output_pdf_path):
+    started = time.perf_counter()
+    result = {"record": record_number, "output": output_pdf_path}
+    try:
+        fill_record(fields_by_page, output_pdf_path)
+        result["status"] = "ok"
+    except Exception as e:
+        result["status"] = "error"
+        result["errors"] = [f"{type(e).__name__}: {e}"]
+    result["seconds"] = round(time.perf_counter() - started, 3)
+    return result
+
+
+# Fills `template_pdf_path` once for each record in `records_path`, writing the PDFs to `output_dir`.
+# Returns one result dict per record (in completion order) with "status" of "ok", "invalid"
+# (with the validation "errors") or "error". If `results_log` is given, each result is also
+# appended to it as a JSON line as soon as it's available.
+def fill_pdf_batch(template_pdf_path, records_path, output_dir, jobs=None, results_log=None):
+    fields_by_ids = {f["field_id"]: f for f in get_field_index(template_pdf_path)["field_info"]}
+    os.makedirs(output_dir, exist_ok=True)
+    jobs = jobs or os.cpu_count() or 1
+
+    results = []
+    log_file = open(results_log, "a", encoding="utf-8") if results_log else None
+
+    def report(result):
+        results.append(result)
+        if log_file:
+            log_file.write(json.dumps(result) + "\n")
+            log_file.flush()
+
+    try:
+        with ProcessPoolExecutor(max_workers=jobs, initializer=init_worker, initargs=(template_pdf_path,)) as executor:
+            # Only keep a few records per worker in flight so large record files aren't queued all at once.
+            pending = {}  # future -> (record number, output path, submit time)
+            records_by_output = {}
+
+            def report_failure(record_number, output_pdf_path, started, e):
+                report({
+                    "record": record_number,
+                    "output": output_pdf_path,
+                    "status": "error",
+                    "errors": [f"{type(e).__name__}: {e}"],
+                    "seconds": round(time.perf_counter() - started, 3),
+                })
+
+            def report_done(done):
+                for future in done:
+                    record_number, output_pdf_path, started = pending.pop(future)
+                    try:
+                        report(future.result())
+                    except Exception as e:
+                        # The worker process died (BrokenProcessPool), so this record has no result.
+                        report_failure(record_number, output_pdf_path, started, e)
+            for record_number, (record, error) in enumerate(read_records(records_path), 1):
+                if error:
+                    report({"record": record_number, "output": None, "status": "invalid", "errors": [error]})
+                    continue
+
+                output_name = str(record.get(OUTPUT_KEY) or f"record_{record_number:05d}.pdf")
+                output_pdf_path = os.path.join(output_dir, os.path.basename(output_name))
+                # Compare case-insensitively so records can't overwrite each other on
+                # case-insensitive file systems either.
+                output_key = os.path.normcase(output_pdf_path).lower()
+                if output_key in records_by_output:
+                    error = f"Output file {output_pdf_path} is already used by record {records_by_output[output_key]}"
+                    report({"record": record_number, "output": output_pdf_path, "status": "invalid", "errors": [error]})
+                    continue
+                records_by_output[output_key] = record_number
+
+                fields = record_to_fields(record, fields_by_ids)
+                errors = get_field_value_errors(fields, fields_by_ids)
+                if errors:
+                    report({"record": record_number, "output": output_pdf_path, "status": "invalid", "errors": errors})
+                    continue
+
+                fields_by_page = {}
+                for field in fields:
+                    fields_by_page.setdefault(field["page"], {})[field["field_id"]] = field["value"]
+                started = time.perf_counter()
+                try:
+                    future = executor.submit(_fill_record_safely, record_number, fields_by_page, output_pdf_path)
+                except BrokenProcessPool as e:
+                    # A worker died earlier; the pool takes no more work.
+                    report_failure(record_number, output_pdf_path, started, e)
+                    continue
+                pending[future] = (record_number, output_pdf_path, started)
+
+                if len(pending) >= jobs * 2:
+                    report_done(wait(pending, return_when=FIRST_COMPLETED).done)
+
+            report_done(wait(pending).done)
+    finally:
+        if log_file:
+            log_file.close()
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fill a fillable PDF form once for each record in a CSV or JSON-lines file")
+    parser.add_argument("template_pdf", help="PDF with fillable form fields")
+    parser.add_argument("records", help="CSV file with a header row of field IDs, or JSON-lines file of {field_id: value} objects")
+    parser.add_argument("output_dir", help="Directory for the filled PDFs")
+    parser.add_argument("--jobs", type=int, default=None, help="Worker processes (default: CPU count)")
+    parser.add_argument("--results", help="JSON-lines file to append per-record results to")
+    args = parser.parse_args()
+
+    results = fill_pdf_batch(args.template_pdf, args.records, args.output_dir, jobs=args.jobs, results_log=args.results)
+
+    failed = sorted((r for r in results if r["status"] != "ok"), key=lambda r: r["record"])
+    print(f"Filled {len(results) - len(failed)} of {len(results)} records")
+    for r in failed:
+        for err in r["errors"]:
+            print(f"Record {r['record']}: {err}")
+    sys.exit(1 if failed else 0)
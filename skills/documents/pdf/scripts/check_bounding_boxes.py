@@ -1,4 +1,6 @@
+from collections import defaultdict
 from dataclasses import dataclass
+import argparse
 import json
 import sys
 
@@ -6,6 +8,8 @@ import sys
 # Script to check that the `fields.json` file that Claude creates when analyzing PDFs
 # does not have overlapping bounding boxes. See forms.md.
 
+MAX_MESSAGES = 20
+
 
 @dataclass
 class RectAndField:
@@ -14,57 +18,117 @@ class RectAndField:
     field: dict
 
 
-# Returns a list of messages that are printed to stdout for Claude to read.
-def get_bounding_box_messages(fields_json_stream) -> list[str]:
-    messages = []
-    fields = json.load(fields_json_stream)
-    messages.append(f"Read {len(fields['form_fields'])} fields")
+def rects_intersect(r1, r2):
+    disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
+    disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
+    return not (disjoint_horizontal or disjoint_vertical)
+
 
-    def rects_intersect(r1, r2):
-        disjoint_horizontal = r1[0] >= r2[2] or r1[2] <= r2[0]
-        disjoint_vertical = r1[1] >= r2[3] or r1[3] <= r2[1]
-        return not (disjoint_horizontal or disjoint_vertical)
+# Returns all (i, j) index pairs with i < j whose rects are on the same page and intersect,
+# sorted by (i, j). Rects are grouped by page and swept left to right, so only rects whose
+# horizontal extents still overlap the current one are compared.
+def find_intersecting_pairs(rects_and_fields: list[RectAndField]) -> list[tuple[int, int]]:
+    by_page = defaultdict(list)
+    for i, rf in enumerate(rects_and_fields):
+        by_page[rf.field["page_number"]].append(i)
 
+    pairs = []
+    for indices in by_page.values():
+        indices.sort(key=lambda i: rects_and_fields[i].rect[0])
+        active = []
+        for i in indices:
+            rect = rects_and_fields[i].rect
+            # Rects ending at or before this one's left edge can't intersect it or any later rect.
+            active = [a for a in active if rects_and_fields[a].rect[2] > rect[0]]
+            for a in active:
+                if rects_intersect(rects_and_fields[a].rect, rect):
+                    pairs.append((min(a, i), max(a, i)))
+            active.append(i)
+    pairs.sort()
+    return pairs
+
+
+def _box_info(rf: RectAndField) -> dict:
+    return {"description": rf.field["description"], "rect_type": rf.rect_type, "rect": rf.rect}
+
+
+# Returns every problem found in `fields` (the parsed fields.json) as machine-readable dicts,
+# in the same order that get_bounding_box_messages reports them.
+def get_bounding_box_conflicts(fields: dict) -> list[dict]:
     rects_and_fields = []
     for f in fields["form_fields"]:
         rects_and_fields.append(RectAndField(f["label_bounding_box"], "label", f))
         rects_and_fields.append(RectAndField(f["entry_bounding_box"], "entry", f))
 
-    has_error = False
+    intersections = defaultdict(list)
+    for i, j in find_intersecting_pairs(rects_and_fields):
+        intersections[i].append(j)
+
+    conflicts = []
     for i, ri in enumerate(rects_and_fields):
-        # This is O(N^2); we can optimize if it becomes a problem.
-        for j in range(i + 1, len(rects_and_fields)):
+        for j in intersections[i]:
             rj = rects_and_fields[j]
-            if ri.field["page_number"] == rj.field["page_number"] and rects_intersect(ri.rect, rj.rect):
-                has_error = True
-                if ri.field is rj.field:
-                    messages.append(f"FAILURE: intersection between label and entry bounding boxes for `{ri.field['description']}` ({ri.rect}, {rj.rect})")
-                else:
-                    messages.append(f"FAILURE: intersection between {ri.rect_type} bounding box for `{ri.field['description']}` ({ri.rect}) and {rj.rect_type} bounding box for `{rj.field['description']}` ({rj.rect})")
-                if len(messages) >= 20:
-                    messages.append("Aborting further checks; fix bounding boxes and try again")
-                    return messages
+            conflicts.append({
+                "type": "intersection",
+                "page_number": ri.field["page_number"],
+                "same_field": ri.field is rj.field,
+                "boxes": [_box_info(ri), _box_info(rj)],
+            })
         if ri.rect_type == "entry":
             if "entry_text" in ri.field:
                 font_size = ri.field["entry_text"].get("font_size", 14)
                 entry_height = ri.rect[3] - ri.rect[1]
                 if entry_height < font_size:
-                    has_error = True
-                    messages.append(f"FAILURE: entry bounding box height ({entry_height}) for `{ri.field['description']}` is too short for the text content (font size: {font_size}). Increase the box height or decrease the font size.")
-                    if len(messages) >= 20:
-                        messages.append("Aborting further checks; fix bounding boxes and try again")
-                        return messages
+                    conflicts.append({
+                        "type": "entry_too_short",
+                        "page_number": ri.field["page_number"],
+                        "boxes": [_box_info(ri)],
+                        "entry_height": entry_height,
+                        "font_size": font_size,
+                    })
+    return conflicts
 
-    if not has_error:
+
+def _conflict_message(conflict: dict) -> str:
+    if conflict["type"] == "entry_too_short":
+        box = conflict["boxes"][0]
+        return f"FAILURE: entry bounding box height ({conflict['entry_height']}) for `{box['description']}` is too short for the text content (font size: {conflict['font_size']}). Increase the box height or decrease the font size."
+    b1, b2 = conflict["boxes"]
+    if conflict["same_field"]:
+        return f"FAILURE: intersection between label and entry bounding boxes for `{b1['description']}` ({b1['rect']}, {b2['rect']})"
+    return f"FAILURE: intersection between {b1['rect_type']} bounding box for `{b1['description']}` ({b1['rect']}) and {b2['rect_type']} bounding box for `{b2['description']}` ({b2['rect']})"
+
+
+# Returns a list of messages that are printed to stdout for Claude to read.
+# Stops after MAX_MESSAGES messages unless `max_messages` is None.
+def get_bounding_box_messages(fields_json_stream, max_messages=MAX_MESSAGES) -> list[str]:
+    messages = []
+    fields = json.load(fields_json_stream)
+    messages.append(f"Read {len(fields['form_fields'])} fields")
+
+    conflicts = get_bounding_box_conflicts(fields)
+    for conflict in conflicts:
+        messages.append(_conflict_message(conflict))
+        if max_messages is not None and len(messages) >= max_messages:
+            messages.append("Aborting further checks; fix bounding boxes and try again")
+            return messages
+
+    if not conflicts:
         messages.append("SUCCESS: All bounding boxes are valid")
     return messages
 
 if __name__ == "__main__":
-    if len(sys.argv) != 2:
-        print("Usage: check_bounding_boxes.py [fields.json]")
-        sys.exit(1)
-    # Input file should be in the `fields.json` format described in forms.md.
-    with open(sys.argv[1]) as f:
-        messages = get_bounding_box_messages(f)
+    parser = argparse.ArgumentParser(description="Check fields.json for overlapping or too-short bounding boxes")
+    parser.add_argument("fields_json", help="fields.json file in the format described in forms.md")
+    parser.add_argument("--all", action="store_true", help=f"Report every conflict instead of stopping after {MAX_MESSAGES} messages")
+    parser.add_argument("--json", action="store_true", help="Print all conflicts as a JSON list")
+    args = parser.parse_args()
+
+    with open(args.fields_json) as f:
+        if args.json:
+            conflicts = get_bounding_box_conflicts(json.load(f))
+            print(json.dumps(conflicts, indent=2))
+            sys.exit(1 if conflicts else 0)
+        messages = get_bounding_box_messages(f, max_messages=None if args.all else MAX_MESSAGES)
     for msg in messages:
         print(msg)
@@ -1,7 +1,7 @@
 import unittest
 import json
 import io
-from check_bounding_boxes import get_bounding_box_messages
+from check_bounding_boxes import get_bounding_box_conflicts, get_bounding_box_messages
 
 
 # Currently this is not run automatically in CI; it's just for documentation and manual checking.
@@ -221,6 +221,76 @@ class TestGetBoundingBoxMessages(unittest.TestCase):
         self.assertTrue(any("SUCCESS" in msg for msg in messages))
         self.assertFalse(any("FAILURE" in msg for msg in messages))
     
+    def test_report_all_conflicts(self):
+        """Test that max_messages=None reports every conflict without aborting"""
+        fields = []
+        for i in range(25):
+            fields.append({
+                "description": f"Field{i}",
+                "page_number": 1,
+                "label_bounding_box": [10, 10, 50, 30],  # All overlap
+                "entry_bounding_box": [20, 15, 60, 35]   # All overlap
+            })
+        
+        stream = self.create_json_stream({"form_fields": fields})
+        messages = get_bounding_box_messages(stream, max_messages=None)
+        self.assertFalse(any("Aborting" in msg for msg in messages))
+        # 50 boxes that all overlap each other
+        failure_count = sum(1 for msg in messages if "FAILURE" in msg)
+        self.assertEqual(failure_count, 50 * 49 // 2)
+    
+    def test_conflicts_machine_readable(self):
+        """Test the structured conflict output"""
+        data = {
+            "form_fields": [
+                {
+                    "description": "Name",
+                    "page_number": 3,
+                    "label_bounding_box": [10, 10, 60, 30],
+                    "entry_bounding_box": [50, 10, 150, 20],  # Overlaps label, height 10
+                    "entry_text": {"font_size": 12}
+                }
+            ]
+        }
+        
+        conflicts = get_bounding_box_conflicts(data)
+        self.assertEqual([c["type"] for c in conflicts], ["intersection", "entry_too_short"])
+        self.assertEqual(conflicts[0]["page_number"], 3)
+        self.assertTrue(conflicts[0]["same_field"])
+        self.assertEqual([b["rect_type"] for b in conflicts[0]["boxes"]], ["label", "entry"])
+        self.assertEqual(conflicts[1]["entry_height"], 10)
+        self.assertEqual(conflicts[1]["font_size"], 12)
+    
+    def test_intersections_match_pairwise_check(self):
+        """Test that the sweep finds exactly the pairs a full pairwise comparison finds"""
+        import random
+        rng = random.Random(0)
+        fields = []
+        for i in range(60):
+            x, y = rng.randint(0, 200), rng.randint(0, 200)
+            fields.append({
+                "description": f"Field{i}",
+                "page_number": rng.randint(1, 3),
+                "label_bounding_box": [x, y, x + rng.randint(1, 40), y + rng.randint(1, 20)],
+                "entry_bounding_box": [x + 20, y, x + 20 + rng.randint(1, 60), y + rng.randint(1, 20)]
+            })
+        
+        boxes = []
+        for f in fields:
+            boxes.append((f["label_bounding_box"], f["page_number"]))
+            boxes.append((f["entry_bounding_box"], f["page_number"]))
+        expected = 0
+        for i in range(len(boxes)):
+            for j in range(i + 1, len(boxes)):
+                r1, p1 = boxes[i]
+                r2, p2 = boxes[j]
+                disjoint = r1[0] >= r2[2] or r1[2] <= r2[0] or r1[1] >= r2[3] or r1[3] <= r2[1]
+                if p1 == p2 and not disjoint:
+                    expected += 1
+        
+        conflicts = get_bounding_box_conflicts({"form_fields": fields})
+        self.assertEqual(sum(1 for c in conflicts if c["type"] == "intersection"), expected)
+    
 
 if __name__ == '__main__':
     unittest.main()
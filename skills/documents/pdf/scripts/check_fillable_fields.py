@@ -1,12 +1,12 @@
 import sys
-from pypdf import PdfReader
+
+from extract_form_field_info import get_field_index
 
 
 # Script for Claude to run to determine whether a PDF has fillable form fields. See forms.md.
 
 
-reader = PdfReader(sys.argv[1])
-if (reader.get_fields()):
+if get_field_index(sys.argv[1])["has_fields"]:
     print("This PDF has fillable form fields")
 else:
     print("This PDF does not have fillable form fields; you will need to visually determine where to enter data")
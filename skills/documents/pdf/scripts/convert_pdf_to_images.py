@@ -1,29 +1,78 @@
 import os
 import sys
+from concurrent.futures import ProcessPoolExecutor
 
 from pdf2image import convert_from_path
+from pypdf import PdfReader
 
 
 # Converts each page of a PDF to a PNG image.
 
 
-def convert(pdf_path, output_dir, max_dim=1000):
-    images = convert_from_path(pdf_path, dpi=200)
+MAX_DPI = 200
+PAGES_PER_TASK = 4
 
-    for i, image in enumerate(images):
-        # Scale image if needed to keep width/height under `max_dim`
-        width, height = image.size
-        if width > max_dim or height > max_dim:
-            scale_factor = min(max_dim / width, max_dim / height)
-            new_width = int(width * scale_factor)
-            new_height = int(height * scale_factor)
-            image = image.resize((new_width, new_height))
-        
-        image_path = os.path.join(output_dir, f"page_{i+1}.png")
-        image.save(image_path)
-        print(f"Saved page {i+1} as {image_path} (size: {image.size})")
 
-    print(f"Converted {len(images)} pages to PNG images")
+def convert(pdf_path, output_dir, max_dim=1000, jobs=None):
+    # Pages are rendered in batches of up to PAGES_PER_TASK consecutive pages, directly at the
+    # DPI that makes them fit in `max_dim`, by a small pool of worker processes. PNGs are written
+    # as soon as their batch is rendered, so memory use doesn't grow with the number of pages.
+    page_dpis = get_page_dpis(pdf_path, max_dim)
+    tasks = [
+        (pdf_path, output_dir, max_dim, page_dpis[start:start + PAGES_PER_TASK], start + 1)
+        for start in range(0, len(page_dpis), PAGES_PER_TASK)
+    ]
+
+    with ProcessPoolExecutor(max_workers=jobs or min(4, os.cpu_count() or 1)) as executor:
+        for results in executor.map(convert_pages, *zip(*tasks)):
+            for page_number, image_path, size in results:
+                print(f"Saved page {page_number} as {image_path} (size: {size})")
+
+    print(f"Converted {len(page_dpis)} pages to PNG images")
+
+
+# Returns the DPI for each page so that its width/height is at most `max_dim` (never above MAX_DPI).
+def get_page_dpis(pdf_path, max_dim):
+    dpis = []
+    for page in PdfReader(pdf_path).pages:
+        # pdf2image runs pdftoppm without -cropbox, so it renders the media box;
+        # sizes are in points (1/72 inch).
+        box = page.mediabox
+        longest_side_inches = max(float(box.width), float(box.height)) / 72
+        if longest_side_inches <= 0:
+            dpis.append(MAX_DPI)
+        else:
+            dpis.append(min(MAX_DPI, max_dim / longest_side_inches))
+    return dpis
+
+
+# Renders pages `first_page`, `first_page + 1`, ... (one per entry in `dpis`) and saves them as PNGs.
+# Consecutive pages with the same DPI are rendered by a single pdftoppm call.
+def convert_pages(pdf_path, output_dir, max_dim, dpis, first_page):
+    results = []
+    start = 0
+    while start < len(dpis):
+        end = start + 1
+        while end < len(dpis) and dpis[end] == dpis[start]:
+            end += 1
+        images = convert_from_path(
+            pdf_path, dpi=dpis[start], first_page=first_page + start, last_page=first_page + end - 1
+        )
+        for page_number, image in enumerate(images, first_page + start):
+            # Rounding can leave the image a pixel over `max_dim`; scale it if needed.
+            width, height = image.size
+            if width > max_dim or height > max_dim:
+                scale_factor = min(max_dim / width, max_dim / height)
+                new_width = int(width * scale_factor)
+                new_height = int(height * scale_factor)
+                image = image.resize((new_width, new_height))
+
+            image_path = os.path.join(output_dir, f"page_{page_number}.png")
+            image.save(image_path)
+            results.append((page_number, image_path, image.size))
+            image.close()
+        start = end
+    return results
 
 
 if __name__ == "__main__":
@@ -1,5 +1,8 @@
+import hashlib
 import json
+import os
 import sys
+import tempfile
 
 from pypdf import PdfReader
 
@@ -8,6 +11,12 @@ from pypdf import PdfReader
 # Claude uses to fill the fields. See forms.md.
 
 
+# Field info is cached in this directory next to the PDF, one file per PDF content hash.
+# Bump the version whenever the cached data changes.
+FIELD_INDEX_CACHE_DIR = ".field_info_cache"
+FIELD_INDEX_VERSION = 2
+
+
 # This matches the format used by PdfReader `get_fields` and `update_page_form_field_values` methods.
 def get_full_annotation_field_id(annotation):
     components = []
@@ -59,8 +68,11 @@ def make_field_dict(field, field_id):
 #     // Per-type additional fields described in forms.md
 #   },
 # ]
-def get_field_info(reader: PdfReader):
-    fields = reader.get_fields()
+# IDs of fields whose location can't be determined are appended to `unlocated_field_ids` if it's
+# given, and printed otherwise.
+def get_field_info(reader: PdfReader, unlocated_field_ids: list = None):
+    # get_fields returns None for PDFs without an AcroForm.
+    fields = reader.get_fields() or {}
 
     field_info_by_id = {}
     possible_radio_names = set()
@@ -119,6 +131,8 @@ def get_field_info(reader: PdfReader):
     for field_info in field_info_by_id.values():
         if "page" in field_info:
             fields_with_location.append(field_info)
+        elif unlocated_field_ids is not None:
+            unlocated_field_ids.append(field_info.get("field_id"))
         else:
             print(f"Unable to determine location for field id: {field_info.get('field_id')}, ignoring")
 
@@ -137,9 +151,69 @@ def get_field_info(reader: PdfReader):
     return sorted_fields
 
 
+def get_pdf_hash(pdf_path: str) -> str:
+    sha = hashlib.sha256()
+    with open(pdf_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            sha.update(chunk)
+    return sha.hexdigest()
+
+
+# Returns the field index for a PDF:
+# {
+#   "has_fields": whether the PDF has any form fields (see check_fillable_fields.py),
+#   "field_info": the list returned by get_field_info,
+#   "unlocated_field_ids": IDs of fields left out of "field_info" because their location is unknown,
+#   "page_sizes": [[width, height], ...] of each page's media box, in PDF points,
+# }
+# The index is stored in FIELD_INDEX_CACHE_DIR (or `cache_dir`) under the PDF's content hash,
+# so processing the same PDF again skips reading its fields and annotations. `reader` can be
+# passed to avoid parsing the PDF again if the index isn't cached yet.
+def get_field_index(pdf_path: str, reader: PdfReader = None, cache_dir: str = None) -> dict:
+    if cache_dir is None:
+        cache_dir = os.path.join(os.path.dirname(os.path.abspath(pdf_path)), FIELD_INDEX_CACHE_DIR)
+    cache_path = os.path.join(cache_dir, get_pdf_hash(pdf_path) + ".json")
+
+    try:
+        with open(cache_path) as f:
+            index = json.load(f)
+        if index.get("version") == FIELD_INDEX_VERSION:
+            return index
+    except (OSError, ValueError):
+        pass
+
+    if reader is None:
+        reader = PdfReader(pdf_path)
+    has_fields = bool(reader.get_fields())
+    unlocated_field_ids = []
+    field_info = get_field_info(reader, unlocated_field_ids) if has_fields else []
+    index = {
+        "version": FIELD_INDEX_VERSION,
+        "has_fields": has_fields,
+        # Round-trip through JSON so a fresh index has the same plain types as a cached one.
+        "field_info": json.loads(json.dumps(field_info)),
+        "unlocated_field_ids": unlocated_field_ids,
+        "page_sizes": [[float(page.mediabox.width), float(page.mediabox.height)] for page in reader.pages],
+    }
+
+    # Write to a temporary file first so concurrent readers never see a partial index.
+    # The cache is only an optimization, so failing to write it isn't an error.
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "w") as f:
+            json.dump(index, f)
+        os.replace(temp_path, cache_path)
+    except OSError:
+        pass
+    return index
+
+
 def write_field_info(pdf_path: str, json_output_path: str):
-    reader = PdfReader(pdf_path)
-    field_info = get_field_info(reader)
+    index = get_field_index(pdf_path)
+    for field_id in index["unlocated_field_ids"]:
+        print(f"Unable to determine location for field id: {field_id}, ignoring")
+    field_info = index["field_info"]
     with open(json_output_path, "w") as f:
         json.dump(field_info, f, indent=2)
     print(f"Wrote {len(field_info)} fields to {json_output_path}")
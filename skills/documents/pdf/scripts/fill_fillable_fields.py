@@ -3,7 +3,7 @@ import sys
 
 from pypdf import PdfReader, PdfWriter
 
-from extract_form_field_info import get_field_info
+from extract_form_field_info import get_field_index
 
 
 # Fills fillable form fields in a PDF. See forms.md.
@@ -24,24 +24,11 @@ def fill_pdf_fields(input_pdf_path: str, fields_json_path: str, output_pdf_path:
     
     reader = PdfReader(input_pdf_path)
 
-    has_error = False
-    field_info = get_field_info(reader)
-    fields_by_ids = {f["field_id"]: f for f in field_info}
-    for field in fields:
-        existing_field = fields_by_ids.get(field["field_id"])
-        if not existing_field:
-            has_error = True
-            print(f"ERROR: `{field['field_id']}` is not a valid field ID")
-        elif field["page"] != existing_field["page"]:
-            has_error = True
-            print(f"ERROR: Incorrect page number for `{field['field_id']}` (got {field['page']}, expected {existing_field['page']})")
-        else:
-            if "value" in field:
-                err = validation_error_for_field_value(existing_field, field["value"])
-                if err:
-                    print(err)
-                    has_error = True
-    if has_error:
+    field_info = get_field_index(input_pdf_path, reader=reader)["field_info"]
+    errors = get_field_value_errors(fields, {f["field_id"]: f for f in field_info})
+    for err in errors:
+        print(err)
+    if errors:
         sys.exit(1)
 
     writer = PdfWriter(clone_from=reader)
@@ -56,6 +43,24 @@ def fill_pdf_fields(input_pdf_path: str, fields_json_path: str, output_pdf_path:
         writer.write(f)
 
 
+# Returns the error messages for `fields` (in the field_values.json format) that don't match
+# the template's fields in `fields_by_ids` (field info dicts keyed by field ID).
+def get_field_value_errors(fields, fields_by_ids):
+    errors = []
+    for field in fields:
+        existing_field = fields_by_ids.get(field["field_id"])
+        if not existing_field:
+            errors.append(f"ERROR: `{field['field_id']}` is not a valid field ID")
+        elif field["page"] != existing_field["page"]:
+            errors.append(f"ERROR: Incorrect page number for `{field['field_id']}` (got {field['page']}, expected {existing_field['page']})")
+        else:
+            if "value" in field:
+                err = validation_error_for_field_value(existing_field, field["value"])
+                if err:
+                    errors.append(err)
+    return errors
+
+
 def validation_error_for_field_value(field_info, field_value):
     field_type = field_info["type"]
     field_id = field_info["field_id"]
@@ -4,6 +4,8 @@ import sys
 from pypdf import PdfReader, PdfWriter
 from pypdf.annotations import FreeText
 
+from extract_form_field_info import get_field_index
+
 
 # Fills a PDF by adding text annotations defined in `fields.json`. See forms.md.
 
@@ -39,11 +41,9 @@ def fill_pdf_form(input_pdf_path, fields_json_path, output_pdf_path):
     # Copy all pages to writer
     writer.append(reader)
     
-    # Get PDF dimensions for each page
-    pdf_dimensions = {}
-    for i, page in enumerate(reader.pages):
-        mediabox = page.mediabox
-        pdf_dimensions[i + 1] = [mediabox.width, mediabox.height]
+    # Get PDF dimensions for each page (cached with the PDF's field index)
+    page_sizes = get_field_index(input_pdf_path, reader=reader)["page_sizes"]
+    pdf_dimensions = {i + 1: size for i, size in enumerate(page_sizes)}
     
     # Process each form field
     annotations = []
@@ -0,0 +1,546 @@
+#!/usr/bin/env python3
+"""
+Extract a text inventory straight from the PowerPoint package with lxml.
+
+This is a read-only fast path for high-volume indexing. It streams slide,
+layout and master parts out of the zip instead of building python-pptx's
+object model, resolves placeholder position inheritance itself, and returns
+the same JSON structure as inventory.get_inventory_as_dict.
+
+Differences from inventory.py:
+- Text overflow estimation (overflow.frame) is not performed
+- Everything else (positions, placeholder types, default font sizes, slide
+  overflow, overlaps, warnings, paragraph properties) is reported the same way
+
+Usage:
+    python fast_inventory.py input.pptx output.json [--issues-only]
+"""
+
+import argparse
+import sys
+import zipfile
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from inventory import (
+    P_NS,
+    InventoryDict,
+    ParagraphDict,
+    ShapeDict,
+    _read_slide_part_names,
+    find_overlapping_pairs,
+    save_inventory_dict,
+    sort_shapes_by_position,
+)
+from lxml import etree
+from pptx.enum.text import MSO_UNDERLINE
+
+A_NS = "{http://schemas.openxmlformats.org/drawingml/2006/main}"
+
+EMU_PER_INCH = 914400.0
+
+# <p:ph type="..."> values -> PP_PLACEHOLDER member names used by inventory.py
+PLACEHOLDER_TYPES = {
+    "body": "BODY",
+    "chart": "CHART",
+    "clipArt": "CLIP_ART",
+    "ctrTitle": "CENTER_TITLE",
+    "dgm": "ORG_CHART",
+    "dt": "DATE",
+    "ftr": "FOOTER",
+    "hdr": "HEADER",
+    "media": "MEDIA_CLIP",
+    "obj": "OBJECT",
+    "pic": "PICTURE",
+    "sldImg": "SLIDE_IMAGE",
+    "sldNum": "SLIDE_NUMBER",
+    "subTitle": "SUBTITLE",
+    "tbl": "TABLE",
+    "title": "TITLE",
+    "vertBody": "VERTICAL_BODY",
+    "vertObj": "VERTICAL_OBJECT",
+    "vertTitle": "VERTICAL_TITLE",
+}
+
+# Layout placeholder type -> master placeholder type it inherits from
+MASTER_PLACEHOLDER_TYPES = {
+    "body": "body",
+    "chart": "body",
+    "clipArt": "body",
+    "ctrTitle": "title",
+    "dgm": "body",
+    "dt": "dt",
+    "ftr": "ftr",
+    "media": "body",
+    "obj": "body",
+    "pic": "body",
+    "sldNum": "sldNum",
+    "subTitle": "body",
+    "tbl": "body",
+    "title": "title",
+}
+
+# <a:schemeClr val="..."> values -> MSO_THEME_COLOR member names
+THEME_COLORS = {
+    "accent1": "ACCENT_1",
+    "accent2": "ACCENT_2",
+    "accent3": "ACCENT_3",
+    "accent4": "ACCENT_4",
+    "accent5": "ACCENT_5",
+    "accent6": "ACCENT_6",
+    "bg1": "BACKGROUND_1",
+    "bg2": "BACKGROUND_2",
+    "dk1": "DARK_1",
+    "dk2": "DARK_2",
+    "folHlink": "FOLLOWED_HYPERLINK",
+    "hlink": "HYPERLINK",
+    "lt1": "LIGHT_1",
+    "lt2": "LIGHT_2",
+    "tx1": "TEXT_1",
+    "tx2": "TEXT_2",
+}
+
+ALIGNMENTS = {"ctr": "CENTER", "r": "RIGHT", "just": "JUSTIFY"}
+
+# Common bullet symbols that indicate manual bullets
+BULLET_SYMBOLS = ["•", "●", "○"]
+
+
+def main():
+    """Main entry point for command-line usage."""
+    parser = argparse.ArgumentParser(
+        description="Extract text inventory from PowerPoint without loading it with "
+        "python-pptx (no text overflow estimation)."
+    )
+    parser.add_argument("input", help="Input PowerPoint file (.pptx)")
+    parser.add_argument("output", help="Output JSON file for inventory")
+    parser.add_argument(
+        "--issues-only",
+        action="store_true",
+        help="Include only text shapes that have slide overflow, overlap or warnings",
+    )
+    args = parser.parse_args()
+
+    input_path = Path(args.input)
+    if not input_path.exists() or input_path.suffix.lower() != ".pptx":
+        print(f"Error: Invalid PowerPoint file: {args.input}")
+        sys.exit(1)
+
+    try:
+        inventory = extract_text_inventory_fast(
+            input_path, issues_only=args.issues_only
+        )
+        output_path = Path(args.output)
+        output_path.parent.mkdir(parents=True, exist_ok=True)
+        save_inventory_dict(inventory, output_path)
+    except Exception as e:
+        print(f"Error processing presentation: {e}")
+        sys.exit(1)
+
+    total_shapes = sum(len(shapes) for shapes in inventory.values())
+    print(f"Found text in {len(inventory)} slides with {total_shapes} text elements")
+    print(f"Output saved to: {args.output}")
+
+
+class FastShape:
+    """Position and text properties of one text shape, read from slide XML."""
+
+    def __init__(
+        self,
+        sp: etree._Element,
+        left_emu: int,
+        top_emu: int,
+        width_emu: int,
+        height_emu: int,
+        placeholder_type: Optional[str],
+        default_font_size: Optional[float],
+    ):
+        self.sp = sp
+        self.left_emu = left_emu
+        self.top_emu = top_emu
+        self.width_emu = width_emu
+        self.height_emu = height_emu
+        self.left = round(left_emu / EMU_PER_INCH, 2)
+        self.top = round(top_emu / EMU_PER_INCH, 2)
+        self.width = round(width_emu / EMU_PER_INCH, 2)
+        self.height = round(height_emu / EMU_PER_INCH, 2)
+        self.placeholder_type = placeholder_type
+        self.default_font_size = default_font_size
+        self.shape_id = ""
+        self.slide_overflow_right: Optional[float] = None
+        self.slide_overflow_bottom: Optional[float] = None
+        self.overlapping_shapes: Dict[str, float] = {}
+        self.warnings: List[str] = []
+
+    @property
+    def has_any_issues(self) -> bool:
+        """Check if shape has any issues (slide overflow, overlap, or warnings)."""
+        return (
+            self.slide_overflow_right is not None
+            or self.slide_overflow_bottom is not None
+            or len(self.overlapping_shapes) > 0
+            or len(self.warnings) > 0
+        )
+
+    def to_dict(self) -> ShapeDict:
+        """Convert to the same dictionary layout as ShapeData.to_dict()."""
+        result: ShapeDict = {
+            "left": self.left,
+            "top": self.top,
+            "width": self.width,
+            "height": self.height,
+        }
+        if self.placeholder_type:
+            result["placeholder_type"] = self.placeholder_type
+        if self.default_font_size:
+            result["default_font_size"] = self.default_font_size
+
+        slide_overflow = {}
+        if self.slide_overflow_right is not None:
+            slide_overflow["overflow_right"] = self.slide_overflow_right
+        if self.slide_overflow_bottom is not None:
+            slide_overflow["overflow_bottom"] = self.slide_overflow_bottom
+        if slide_overflow:
+            result["overflow"] = {"slide": slide_overflow}
+
+        if self.overlapping_shapes:
+            result["overlap"] = {"overlapping_shapes": self.overlapping_shapes}
+        if self.warnings:
+            result["warnings"] = self.warnings
+
+        result["paragraphs"] = [
+            paragraph_to_dict(p)
+            for p in self.sp.iterfind(f"{P_NS}txBody/{A_NS}p")
+            if paragraph_text(p).strip()
+        ]
+        return result
+
+
+class PlaceholderSource:
+    """Placeholder elements of a layout or master part, for inheritance lookups."""
+
+    def __init__(self, root: Optional[etree._Element]):
+        self.placeholders: List[Tuple[etree._Element, str, str]] = []
+        if root is None:
+            return
+        sp_tree = root.find(f"{P_NS}cSld/{P_NS}spTree")
+        if sp_tree is None:
+            return
+        for sp in sp_tree.iterfind(f"{P_NS}sp"):
+            ph = sp.find(f"{P_NS}nvSpPr/{P_NS}nvPr/{P_NS}ph")
+            if ph is not None:
+                self.placeholders.append(
+                    (sp, ph.get("type", "obj"), ph.get("idx", "0"))
+                )
+
+    def by_idx(self, idx: str) -> Optional[etree._Element]:
+        """Get the first placeholder with the given idx."""
+        for sp, _, ph_idx in self.placeholders:
+            if ph_idx == idx:
+                return sp
+        return None
+
+    def by_type(self, ph_type: str) -> Optional[etree._Element]:
+        """Get the first placeholder with the given type."""
+        for sp, sp_type, _ in self.placeholders:
+            if sp_type == ph_type:
+                return sp
+        return None
+
+
+def extract_text_inventory_fast(
+    pptx_path: Path, issues_only: bool = False
+) -> InventoryDict:
+    """Extract text inventory as dictionaries directly from the package XML.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        issues_only: If True, only include shapes that have slide overflow,
+            overlap or warnings
+
+    Returns:
+        Nested dictionary {slide-N: {shape-N: shape dict}} in the same format as
+        inventory.get_inventory_as_dict, without frame overflow data
+    """
+    inventory: InventoryDict = {}
+    layout_cache: Dict[str, Tuple[PlaceholderSource, PlaceholderSource]] = {}
+
+    with zipfile.ZipFile(pptx_path) as zf:
+        parts, presentation = _read_slide_part_names(zf)
+        sld_sz = presentation.find(f"{P_NS}sldSz")
+        slide_size = (
+            (int(sld_sz.get("cx")), int(sld_sz.get("cy")))
+            if sld_sz is not None
+            else None
+        )
+
+        for slide_idx, (slide_name, layout_name, master_name) in enumerate(parts):
+            if layout_name not in layout_cache:
+                layout_cache[layout_name] = (
+                    PlaceholderSource(_parse_part(zf, layout_name)),
+                    PlaceholderSource(_parse_part(zf, master_name)),
+                )
+            layout, master = layout_cache[layout_name]
+
+            slide_root = etree.fromstring(zf.read(slide_name))
+            sp_tree = slide_root.find(f"{P_NS}cSld/{P_NS}spTree")
+            if sp_tree is None:
+                continue
+
+            shapes = collect_text_shapes(sp_tree, layout, master)
+            if not shapes:
+                continue
+
+            # Sort by visual position and assign stable IDs, as inventory.py does
+            shapes = sort_shapes_by_position(shapes)  # type: ignore
+            for idx, shape in enumerate(shapes):
+                shape.shape_id = f"shape-{idx}"
+                if slide_size:
+                    _calculate_slide_overflow(shape, *slide_size)
+                _detect_bullet_issues(shape)
+
+            rects = [(s.left, s.top, s.width, s.height) for s in shapes]
+            for i, j, overlap_area in find_overlapping_pairs(rects):
+                shapes[i].overlapping_shapes[shapes[j].shape_id] = overlap_area
+                shapes[j].overlapping_shapes[shapes[i].shape_id] = overlap_area
+
+            if issues_only:
+                shapes = [s for s in shapes if s.has_any_issues]
+            if shapes:
+                inventory[f"slide-{slide_idx}"] = {
+                    s.shape_id: s.to_dict() for s in shapes
+                }
+
+    return inventory
+
+
+def collect_text_shapes(
+    container: etree._Element,
+    layout: PlaceholderSource,
+    master: PlaceholderSource,
+    parent_left: int = 0,
+    parent_top: int = 0,
+) -> List[FastShape]:
+    """Recursively collect text shapes with absolute positions.
+
+    Mirrors inventory.collect_shapes_with_absolute_positions: group offsets are
+    accumulated onto their children's positions.
+    """
+    result = []
+    for child in container:
+        if child.tag == f"{P_NS}grpSp":
+            off = child.find(f"{P_NS}grpSpPr/{A_NS}xfrm/{A_NS}off")
+            group_left = int(off.get("x", 0)) if off is not None else 0
+            group_top = int(off.get("y", 0)) if off is not None else 0
+            result.extend(
+                collect_text_shapes(
+                    child,
+                    layout,
+                    master,
+                    parent_left + group_left,
+                    parent_top + group_top,
+                )
+            )
+        elif child.tag == f"{P_NS}sp":
+            shape = _build_text_shape(child, layout, master, parent_left, parent_top)
+            if shape:
+                result.append(shape)
+    return result
+
+
+def _build_text_shape(
+    sp: etree._Element,
+    layout: PlaceholderSource,
+    master: PlaceholderSource,
+    parent_left: int,
+    parent_top: int,
+) -> Optional[FastShape]:
+    """Create a FastShape for an <p:sp> with meaningful text, or None."""
+    paragraphs = sp.findall(f"{P_NS}txBody/{A_NS}p")
+    text = "\n".join(paragraph_text(p) for p in paragraphs).strip()
+    if not text:
+        return None
+
+    ph = sp.find(f"{P_NS}nvSpPr/{P_NS}nvPr/{P_NS}ph")
+    placeholder_type = None
+    default_font_size = None
+    inherited = []
+    if ph is not None:
+        ph_type = ph.get("type", "obj")
+        placeholder_type = PLACEHOLDER_TYPES.get(ph_type)
+
+        # Skip slide numbers and numeric footers
+        if placeholder_type == "SLIDE_NUMBER":
+            return None
+        if placeholder_type == "FOOTER" and text.isdigit():
+            return None
+
+        # Position inherits from the layout placeholder with the same idx,
+        # which in turn inherits from the master placeholder of its type
+        layout_sp = layout.by_idx(ph.get("idx", "0"))
+        if layout_sp is not None:
+            inherited.append(layout_sp)
+            layout_ph = layout_sp.find(f"{P_NS}nvSpPr/{P_NS}nvPr/{P_NS}ph")
+            layout_type = layout_ph.get("type", "obj")
+            master_type = MASTER_PLACEHOLDER_TYPES.get(layout_type)
+            master_sp = master.by_type(master_type) if master_type else None
+            if master_sp is not None:
+                inherited.append(master_sp)
+
+        # Default font size comes from the layout placeholder of the same type
+        type_sp = layout.by_type(ph_type)
+        if type_sp is not None:
+            for elem in type_sp.iter(f"{A_NS}defRPr"):
+                if sz := elem.get("sz"):
+                    default_font_size = float(sz) / 100.0
+                    break
+
+    off, ext = None, None
+    for source in [sp] + inherited:
+        xfrm = source.find(f"{P_NS}spPr/{A_NS}xfrm")
+        if xfrm is None:
+            continue
+        off = off if off is not None else xfrm.find(f"{A_NS}off")
+        ext = ext if ext is not None else xfrm.find(f"{A_NS}ext")
+        if off is not None and ext is not None:
+            break
+
+    left = int(off.get("x", 0)) if off is not None else 0
+    top = int(off.get("y", 0)) if off is not None else 0
+    width = int(ext.get("cx", 0)) if ext is not None else 0
+    height = int(ext.get("cy", 0)) if ext is not None else 0
+
+    return FastShape(
+        sp,
+        parent_left + left,
+        parent_top + top,
+        width,
+        height,
+        placeholder_type,
+        default_font_size,
+    )
+
+
+def paragraph_text(p: etree._Element) -> str:
+    """Get paragraph text the way python-pptx does (line breaks become \\v)."""
+    parts = []
+    for child in p:
+        if child.tag in (f"{A_NS}r", f"{A_NS}fld"):
+            t = child.find(f"{A_NS}t")
+            parts.append((t.text or "") if t is not None else "")
+        elif child.tag == f"{A_NS}br":
+            parts.append("\v")
+    return "".join(parts)
+
+
+def paragraph_to_dict(p: etree._Element) -> ParagraphDict:
+    """Convert an <a:p> to the same dictionary layout as ParagraphData.to_dict()."""
+    result: ParagraphDict = {"text": paragraph_text(p).strip()}
+    pPr = p.find(f"{A_NS}pPr")
+    first_run = p.find(f"{A_NS}r")
+    r_pr = first_run.find(f"{A_NS}rPr") if first_run is not None else None
+
+    font_size = None
+    if r_pr is not None and r_pr.get("sz"):
+        font_size = int(r_pr.get("sz")) / 100.0
+
+    if pPr is not None:
+        if (
+            pPr.find(f"{A_NS}buChar") is not None
+            or pPr.find(f"{A_NS}buAutoNum") is not None
+        ):
+            result["bullet"] = True
+            result["level"] = int(pPr.get("lvl", 0))
+        alignment = ALIGNMENTS.get(pPr.get("algn", ""))
+        if alignment:
+            result["alignment"] = alignment
+        for key, tag in (("space_before", "spcBef"), ("space_after", "spcAft")):
+            spc_pts = pPr.find(f"{A_NS}{tag}/{A_NS}spcPts")
+            if spc_pts is not None and int(spc_pts.get("val", 0)):
+                result[key] = int(spc_pts.get("val")) / 100.0
+
+    # Font properties come from the first run
+    if r_pr is not None:
+        latin = r_pr.find(f"{A_NS}latin")
+        if latin is not None and latin.get("typeface"):
+            result["font_name"] = latin.get("typeface")
+        if font_size:
+            result["font_size"] = font_size
+        for key, attr in (("bold", "b"), ("italic", "i")):
+            if r_pr.get(attr) is not None:
+                result[key] = r_pr.get(attr) in ("1", "true")
+        if r_pr.get("u") is not None:
+            # Same values as python-pptx's font.underline: True/False for
+            # single/none, the MSO_UNDERLINE member for every other style
+            underline = MSO_UNDERLINE.from_xml(r_pr.get("u"))
+            if underline == MSO_UNDERLINE.NONE:
+                result["underline"] = False
+            elif underline == MSO_UNDERLINE.SINGLE_LINE:
+                result["underline"] = True
+            else:
+                result["underline"] = underline
+
+        fill = r_pr.find(f"{A_NS}solidFill")
+        if fill is not None:
+            srgb = fill.find(f"{A_NS}srgbClr")
+            scheme = fill.find(f"{A_NS}schemeClr")
+            if srgb is not None and srgb.get("val"):
+                result["color"] = srgb.get("val").upper()
+            elif scheme is not None and scheme.get("val") in THEME_COLORS:
+                result["theme_color"] = THEME_COLORS[scheme.get("val")]
+
+    if pPr is not None:
+        ln_spc = pPr.find(f"{A_NS}lnSpc")
+        if ln_spc is not None:
+            spc_pts = ln_spc.find(f"{A_NS}spcPts")
+            spc_pct = ln_spc.find(f"{A_NS}spcPct")
+            if spc_pts is not None:
+                result["line_spacing"] = round(int(spc_pts.get("val")) / 100.0, 2)
+            elif spc_pct is not None:
+                # Multiplier - convert to points
+                multiplier = int(spc_pct.get("val")) / 100000.0
+                result["line_spacing"] = round(multiplier * (font_size or 12.0), 2)
+
+    return result
+
+
+def _parse_part(
+    zf: zipfile.ZipFile, part_name: Optional[str]
+) -> Optional[etree._Element]:
+    """Parse a package part, or return None if it is missing."""
+    if not part_name:
+        return None
+    try:
+        return etree.fromstring(zf.read(part_name))
+    except KeyError:
+        return None
+
+
+def _calculate_slide_overflow(
+    shape: FastShape, slide_width: int, slide_height: int
+) -> None:
+    """Record how far a shape extends past the slide (same rules as ShapeData)."""
+    right_edge = shape.left_emu + shape.width_emu
+    if right_edge > slide_width:
+        overflow_inches = round((right_edge - slide_width) / EMU_PER_INCH, 2)
+        if overflow_inches > 0.01:
+            shape.slide_overflow_right = overflow_inches
+
+    bottom_edge = shape.top_emu + shape.height_emu
+    if bottom_edge > slide_height:
+        overflow_inches = round((bottom_edge - slide_height) / EMU_PER_INCH, 2)
+        if overflow_inches > 0.01:
+            shape.slide_overflow_bottom = overflow_inches
+
+
+def _detect_bullet_issues(shape: FastShape) -> None:
+    """Warn about manual bullet symbols (same rule as ShapeData)."""
+    for p in shape.sp.iterfind(f"{P_NS}txBody/{A_NS}p"):
+        text = paragraph_text(p).strip()
+        if text and any(text.startswith(symbol + " ") for symbol in BULLET_SYMBOLS):
+            shape.warnings.append("manual_bullet_symbol: use proper bullet formatting")
+            break
+
+
+if __name__ == "__main__":
+    main()
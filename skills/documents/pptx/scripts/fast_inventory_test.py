@@ -0,0 +1,100 @@
+import json
+import tempfile
+import unittest
+from pathlib import Path
+
+from pptx import Presentation
+from pptx.enum.text import MSO_UNDERLINE
+from pptx.util import Inches, Pt
+
+from fast_inventory import extract_text_inventory_fast
+from inventory import get_inventory_as_dict
+
+
+def without_frame_overflow(inventory):
+    """Drop overflow.frame, which fast_inventory doesn't estimate"""
+    for shapes in inventory.values():
+        for shape in shapes.values():
+            overflow = shape.get("overflow")
+            if overflow is None:
+                continue
+            overflow.pop("frame", None)
+            if not overflow:
+                del shape["overflow"]
+    return inventory
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestFastInventoryParity(unittest.TestCase):
+
+    def setUp(self):
+        self.temp_dir = tempfile.TemporaryDirectory()
+        self.pptx_path = Path(self.temp_dir.name) / "deck.pptx"
+
+    def tearDown(self):
+        self.temp_dir.cleanup()
+
+    def assert_same_inventory(self, prs):
+        """Save the deck and compare both extractors' JSON output"""
+        prs.save(self.pptx_path)
+        expected = without_frame_overflow(get_inventory_as_dict(self.pptx_path))
+        actual = extract_text_inventory_fast(self.pptx_path)
+        self.assertTrue(expected)
+        self.assertEqual(actual, expected)
+        # Enum values must serialize the same way too
+        self.assertEqual(
+            json.loads(json.dumps(actual)), json.loads(json.dumps(expected))
+        )
+
+    def test_every_layout_placeholder(self):
+        """Placeholders of every default layout, including the vertical ones"""
+        prs = Presentation()
+        for layout in prs.slide_layouts:
+            slide = prs.slides.add_slide(layout)
+            for placeholder in slide.placeholders:
+                if placeholder.has_text_frame:
+                    placeholder.text_frame.text = f"{layout.name} {placeholder.name}"
+        self.assert_same_inventory(prs)
+
+    def test_underline_styles(self):
+        """Single, none and other underline styles"""
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        textbox = slide.shapes.add_textbox(Inches(1), Inches(1), Inches(6), Inches(4))
+        styles = [
+            True,
+            False,
+            None,
+            MSO_UNDERLINE.DOUBLE_LINE,
+            MSO_UNDERLINE.WAVY_LINE,
+            MSO_UNDERLINE.DOTTED_HEAVY_LINE,
+            MSO_UNDERLINE.WORDS,
+        ]
+        for i, style in enumerate(styles):
+            paragraph = (
+                textbox.text_frame.paragraphs[0]
+                if i == 0
+                else textbox.text_frame.add_paragraph()
+            )
+            run = paragraph.add_run()
+            run.text = f"Underline {style}"
+            run.font.size = Pt(14)
+            run.font.underline = style
+        self.assert_same_inventory(prs)
+
+    def test_overlap_and_slide_overflow(self):
+        """Overlapping shapes and shapes running off the slide"""
+        prs = Presentation()
+        slide = prs.slides.add_slide(prs.slide_layouts[6])
+        boxes = [
+            (Inches(1), Inches(1), Inches(4), Inches(2)),
+            (Inches(3), Inches(2), Inches(4), Inches(2)),
+            (Inches(8), Inches(6), Inches(4), Inches(2)),
+        ]
+        for i, box in enumerate(boxes):
+            slide.shapes.add_textbox(*box).text_frame.text = f"Box {i}"
+        self.assert_same_inventory(prs)
+
+
+if __name__ == "__main__":
+    unittest.main()
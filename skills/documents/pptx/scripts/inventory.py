@@ -16,20 +16,31 @@ Classes:
 
 Main Functions:
     extract_text_inventory: Extract all text from a presentation
+    extract_text_inventory_parallel: Extract slides in worker processes
+    get_cached_inventory_as_dict: Reuse cached results for unchanged slides
     save_inventory: Save extracted data to JSON
 
 Usage:
-    python inventory.py input.pptx output.json
+    python inventory.py input.pptx output.json [--jobs N] [--cache]
 """
 
 import argparse
+import gzip
+import hashlib
 import json
+import os
 import platform
+import posixpath
 import sys
+import tempfile
+import zipfile
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional, Tuple, Union
 
+from lxml import etree
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 from pptx.enum.text import PP_ALIGN
@@ -46,6 +57,59 @@ InventoryData = Dict[
 ]  # Dict of slide_id -> {shape_id -> ShapeData}
 InventoryDict = Dict[str, Dict[str, ShapeDict]]  # JSON-serializable inventory
 
+# XML namespaces for reading presentation parts directly from the package
+P_NS = "{http://schemas.openxmlformats.org/presentationml/2006/main}"
+R_NS = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+
+# Per-slide inventory cache; bump the version whenever ShapeData output changes
+INVENTORY_CACHE_VERSION = 2
+INVENTORY_CACHE_SUFFIX = ".inventory-cache.gz"
+
+
+# Per-process font lookup caches shared by all ShapeData instances
+_font_index: Optional[List[Tuple[Path, List[str]]]] = None
+_font_path_cache: Dict[str, Optional[str]] = {}
+_font_object_cache: Dict[Tuple[Optional[str], int], Any] = {}
+_text_width_cache: Dict[Any, Dict[str, float]] = {}
+_measure_draw: Optional[Any] = None
+
+
+def _font_directories() -> List[str]:
+    """Get the font directories searched on this platform, in priority order."""
+    if platform.system() == "Darwin":  # macOS
+        return ["/System/Library/Fonts/", "/Library/Fonts/", "~/Library/Fonts/"]
+    return ["/usr/share/fonts/truetype/", "/usr/local/share/fonts/", "~/.fonts/"]
+
+
+def _font_extensions() -> List[str]:
+    """Get the font file extensions recognized on this platform."""
+    if platform.system() == "Darwin":  # macOS
+        return [".ttf", ".otf", ".ttc", ".dfont"]
+    return [".ttf", ".otf"]
+
+
+def _get_measure_draw() -> Any:
+    """Get a shared ImageDraw used only for text measurement."""
+    global _measure_draw
+    if _measure_draw is None:
+        _measure_draw = ImageDraw.Draw(Image.new("RGB", (1, 1)))
+    return _measure_draw
+
+
+def _get_font_index() -> List[Tuple[Path, List[str]]]:
+    """Scan the font directories once and return (directory, file names) pairs."""
+    global _font_index
+    if _font_index is None:
+        _font_index = []
+        for font_dir in _font_directories():
+            font_dir_path = Path(font_dir).expanduser()
+            try:
+                files = [f.name for f in font_dir_path.iterdir() if f.is_file()]
+            except (OSError, PermissionError):
+                continue
+            _font_index.append((font_dir_path, files))
+    return _font_index
+
 
 def main():
     """Main entry point for command-line usage."""
@@ -60,6 +124,12 @@ Examples:
   python inventory.py presentation.pptx inventory.json --issues-only
     Extracts only text shapes that have overflow or overlap issues
 
+  python inventory.py presentation.pptx inventory.json --jobs 8
+    Extracts slides in 8 worker processes (useful for large decks)
+
+  python inventory.py presentation.pptx inventory.json --cache
+    Re-inventories only slides changed since the last --cache run
+
 The output JSON includes:
   - All text content organized by slide and shape
   - Correct absolute positions for shapes in groups
@@ -76,6 +146,17 @@ The output JSON includes:
         action="store_true",
         help="Include only text shapes that have overflow or overlap issues",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of worker processes for slide extraction (default: 1)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=f"Reuse per-slide results from <input>{INVENTORY_CACHE_SUFFIX} for unchanged slides",
+    )
 
     args = parser.parse_args()
 
@@ -94,11 +175,18 @@ The output JSON includes:
             print(
                 "Filtering to include only text shapes with issues (overflow/overlap)"
             )
-        inventory = extract_text_inventory(input_path, issues_only=args.issues_only)
+        if args.cache:
+            inventory = get_cached_inventory_as_dict(
+                input_path, issues_only=args.issues_only, jobs=args.jobs
+            )
+        else:
+            inventory = get_inventory_as_dict(
+                input_path, issues_only=args.issues_only, jobs=args.jobs
+            )
 
         output_path = Path(args.output)
         output_path.parent.mkdir(parents=True, exist_ok=True)
-        save_inventory(inventory, output_path)
+        save_inventory_dict(inventory, output_path)
 
         print(f"Output saved to: {args.output}")
 
@@ -280,13 +368,17 @@ class ShapeData:
     def get_font_path(font_name: str) -> Optional[str]:
         """Get the font file path for a given font name.
 
+        Lookups are answered from a per-process index of the font directories,
+        built on first use, so repeated calls do not touch the filesystem.
+
         Args:
             font_name: Name of the font (e.g., 'Arial', 'Calibri')
 
         Returns:
             Path to the font file, or None if not found
         """
-        system = platform.system()
+        if font_name in _font_path_cache:
+            return _font_path_cache[font_name]
 
         # Common font file variations to try
         font_variations = [
@@ -295,52 +387,58 @@ class ShapeData:
             font_name.replace(" ", ""),
             font_name.replace(" ", "-"),
         ]
+        extensions = _font_extensions()
+        font_name_lower = font_name.lower().replace(" ", "")
 
-        # Define font directories and extensions by platform
-        if system == "Darwin":  # macOS
-            font_dirs = [
-                "/System/Library/Fonts/",
-                "/Library/Fonts/",
-                "~/Library/Fonts/",
-            ]
-            extensions = [".ttf", ".otf", ".ttc", ".dfont"]
-        else:  # Linux
-            font_dirs = [
-                "/usr/share/fonts/truetype/",
-                "/usr/local/share/fonts/",
-                "~/.fonts/",
-            ]
-            extensions = [".ttf", ".otf"]
-
-        # Try to find the font file
-        from pathlib import Path
-
-        for font_dir in font_dirs:
-            font_dir_path = Path(font_dir).expanduser()
-            if not font_dir_path.exists():
-                continue
-
+        result = None
+        for font_dir_path, files in _get_font_index():
             # First try exact matches
             for variant in font_variations:
                 for ext in extensions:
-                    font_path = font_dir_path / f"{variant}{ext}"
-                    if font_path.exists():
-                        return str(font_path)
+                    if f"{variant}{ext}" in files:
+                        result = str(font_dir_path / f"{variant}{ext}")
+                        break
+                if result:
+                    break
+            if result:
+                break
 
             # Then try fuzzy matching - find files containing the font name
-            try:
-                for file_path in font_dir_path.iterdir():
-                    if file_path.is_file():
-                        file_name_lower = file_path.name.lower()
-                        font_name_lower = font_name.lower().replace(" ", "")
-                        if font_name_lower in file_name_lower and any(
-                            file_name_lower.endswith(ext) for ext in extensions
-                        ):
-                            return str(file_path)
-            except (OSError, PermissionError):
-                continue
+            for file_name in files:
+                file_name_lower = file_name.lower()
+                if font_name_lower in file_name_lower and any(
+                    file_name_lower.endswith(ext) for ext in extensions
+                ):
+                    result = str(font_dir_path / file_name)
+                    break
+            if result:
+                break
 
-        return None
+        _font_path_cache[font_name] = result
+        return result
+
+    @staticmethod
+    def get_font(font_name: str, font_size: int) -> Any:
+        """Get a PIL font for measuring text, loading each (path, size) only once.
+
+        Args:
+            font_name: Name of the font (e.g., 'Arial', 'Calibri')
+            font_size: Font size in points
+
+        Returns:
+            ImageFont instance, or PIL's default font if the font cannot be loaded
+        """
+        font_path = ShapeData.get_font_path(font_name)
+        key = (font_path, font_size)
+        if key not in _font_object_cache:
+            font = None
+            if font_path:
+                try:
+                    font = ImageFont.truetype(font_path, size=font_size)
+                except Exception:
+                    pass
+            _font_object_cache[key] = font or ImageFont.load_default()
+        return _font_object_cache[key]
 
     @staticmethod
     def get_slide_dimensions(slide: Any) -> tuple[Optional[int], Optional[int]]:
@@ -531,8 +629,23 @@ class ShapeData:
             self.inches_to_pixels(usable_height),
         )
 
+    @staticmethod
+    def _text_width(text: str, draw, font) -> float:
+        """Measure text width in pixels, memoized per font across all shapes."""
+        widths = _text_width_cache.setdefault(font, {})
+        width = widths.get(text)
+        if width is None:
+            width = draw.textlength(text, font=font)
+            widths[text] = width
+        return width
+
     def _wrap_text_line(self, line: str, max_width_px: int, draw, font) -> List[str]:
-        """Wrap a single line of text to fit within max_width_px."""
+        """Wrap a single line of text to fit within max_width_px.
+
+        Each distinct word and the space are measured once per font; candidate
+        line widths are accumulated arithmetically instead of re-measuring the
+        growing line for every word.
+        """
         if not line:
             return [""]
 
@@ -543,16 +656,24 @@ class ShapeData:
         # Need to wrap - split into words
         wrapped = []
         words = line.split(" ")
+        space_width = self._text_width(" ", draw, font)
         current_line = ""
+        current_width = 0.0
 
         for word in words:
-            test_line = current_line + (" " if current_line else "") + word
-            if draw.textlength(test_line, font=font) <= max_width_px:
-                current_line = test_line
+            word_width = self._text_width(word, draw, font)
+            if current_line:
+                test_width = current_width + space_width + word_width
+            else:
+                test_width = word_width
+            if test_width <= max_width_px:
+                current_line = current_line + (" " if current_line else "") + word
+                current_width = test_width
             else:
                 if current_line:
                     wrapped.append(current_line)
                 current_line = word
+                current_width = word_width
 
         if current_line:
             wrapped.append(current_line)
@@ -574,8 +695,7 @@ class ShapeData:
             return
 
         # Set up PIL for text measurement
-        dummy_img = Image.new("RGB", (1, 1))
-        draw = ImageDraw.Draw(dummy_img)
+        draw = _get_measure_draw()
 
         # Get default font size from placeholder or use conservative estimate
         default_font_size = self._get_default_font_size()
@@ -593,15 +713,7 @@ class ShapeData:
             font_name = para_data.font_name or "Arial"
             font_size = int(para_data.font_size or default_font_size)
 
-            font = None
-            font_path = self.get_font_path(font_name)
-            if font_path:
-                try:
-                    font = ImageFont.truetype(font_path, size=font_size)
-                except Exception:
-                    font = ImageFont.load_default()
-            else:
-                font = ImageFont.load_default()
+            font = self.get_font(font_name, font_size)
 
             # Wrap all lines in this paragraph
             all_wrapped_lines = []
@@ -879,6 +991,46 @@ def calculate_overlap(
     return False, 0
 
 
+def find_overlapping_pairs(
+    rects: List[Tuple[float, float, float, float]], tolerance: float = 0.05
+) -> List[Tuple[int, int, float]]:
+    """Find all pairs of overlapping rectangles with a sort-and-sweep pass.
+
+    Rectangles are swept left to right; only rectangles whose horizontal
+    extent still reaches the current left edge are compared, so sparse
+    layouts cost O(n log n) instead of comparing every pair.
+
+    Args:
+        rects: List of (left, top, width, height) rectangles in inches
+        tolerance: Minimum overlap in inches to consider as overlapping (default: 0.05")
+
+    Returns:
+        List of (i, j, overlap_area) with i < j, sorted by (i, j), where i and j
+        are indices into rects and overlap_area is in square inches
+    """
+    order = sorted(range(len(rects)), key=lambda idx: rects[idx][0])
+    active: List[int] = []
+    pairs = []
+
+    for idx in order:
+        left = rects[idx][0]
+        # Drop rectangles that end before this one starts (within tolerance);
+        # they cannot overlap this or any later rectangle
+        active = [a for a in active if rects[a][0] + rects[a][2] - left > tolerance]
+
+        for other in active:
+            overlaps, overlap_area = calculate_overlap(
+                rects[other], rects[idx], tolerance
+            )
+            if overlaps:
+                pairs.append((min(idx, other), max(idx, other), overlap_area))
+
+        active.append(idx)
+
+    pairs.sort()
+    return pairs
+
+
 def detect_overlaps(shapes: List[ShapeData]) -> None:
     """Detect overlapping shapes and update their overlapping_shapes dictionaries.
 
@@ -888,27 +1040,93 @@ def detect_overlaps(shapes: List[ShapeData]) -> None:
     Args:
         shapes: List of ShapeData objects with shape_id attributes set
     """
-    n = len(shapes)
+    # Ensure shape IDs are set
+    for i, shape in enumerate(shapes):
+        assert shape.shape_id, f"Shape at index {i} has no shape_id"
 
-    # Compare each pair of shapes
-    for i in range(n):
-        for j in range(i + 1, n):
-            shape1 = shapes[i]
-            shape2 = shapes[j]
+    rects = [(s.left, s.top, s.width, s.height) for s in shapes]
 
-            # Ensure shape IDs are set
-            assert shape1.shape_id, f"Shape at index {i} has no shape_id"
-            assert shape2.shape_id, f"Shape at index {j} has no shape_id"
+    # Pairs come back in (i, j) order, so each dict lists its overlaps
+    # in the same order as the shapes list
+    for i, j, overlap_area in find_overlapping_pairs(rects):
+        # Add shape IDs with overlap area in square inches
+        shapes[i].overlapping_shapes[shapes[j].shape_id] = overlap_area
+        shapes[j].overlapping_shapes[shapes[i].shape_id] = overlap_area
 
-            rect1 = (shape1.left, shape1.top, shape1.width, shape1.height)
-            rect2 = (shape2.left, shape2.top, shape2.width, shape2.height)
 
-            overlaps, overlap_area = calculate_overlap(rect1, rect2)
+def extract_slide_inventory(
+    slide: Any, issues_only: bool = False
+) -> Dict[str, ShapeData]:
+    """Extract text content from a single slide.
+
+    Args:
+        slide: The slide to inventory
+        issues_only: If True, only include shapes that have overflow or overlap issues
+
+    Returns:
+        Dictionary of shape-N -> ShapeData, sorted by visual position.
+        Empty if the slide has no (matching) text shapes.
+    """
+    # Collect all valid shapes from this slide with absolute positions
+    shapes_with_positions = []
+    for shape in slide.shapes:  # type: ignore
+        shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+
+    if not shapes_with_positions:
+        return {}
+
+    # Convert to ShapeData with absolute positions and slide reference
+    shape_data_list = [
+        ShapeData(
+            swp.shape,
+            swp.absolute_left,
+            swp.absolute_top,
+            slide,
+        )
+        for swp in shapes_with_positions
+    ]
+
+    # Sort by visual position and assign stable IDs in one step
+    sorted_shapes = sort_shapes_by_position(shape_data_list)
+    for idx, shape_data in enumerate(sorted_shapes):
+        shape_data.shape_id = f"shape-{idx}"
+
+    # Detect overlaps using the stable shape IDs
+    if len(sorted_shapes) > 1:
+        detect_overlaps(sorted_shapes)
+
+    # Filter for issues only if requested (after overlap detection)
+    if issues_only:
+        sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+
+    # Create slide inventory using the stable shape IDs
+    return {shape_data.shape_id: shape_data for shape_data in sorted_shapes}
 
-            if overlaps:
-                # Add shape IDs with overlap area in square inches
-                shape1.overlapping_shapes[shape2.shape_id] = overlap_area
-                shape2.overlapping_shapes[shape1.shape_id] = overlap_area
+
+def extract_shapes_by_id(slide: Any, shape_ids: List[int]) -> Dict[int, ShapeData]:
+    """Build ShapeData for specific shapes on a slide, skipping all others.
+
+    Used to re-measure only the shapes that changed instead of re-inventorying
+    the whole slide. Shape IDs (cNvPr ids) are unique within a slide and stay
+    stable across save and reload. Shapes without text are omitted. The
+    returned ShapeData objects have no shape_id and no overlap information.
+
+    Args:
+        slide: The slide containing the shapes
+        shape_ids: python-pptx shape_id values of the shapes to measure
+
+    Returns:
+        Dictionary of shape_id -> ShapeData for the requested shapes that have text
+    """
+    wanted = set(shape_ids)
+    result = {}
+    for shape in slide.shapes:  # type: ignore
+        for swp in collect_shapes_with_absolute_positions(shape):
+            if swp.shape.shape_id in wanted:
+                result[swp.shape.shape_id] = ShapeData(
+                    swp.shape, swp.absolute_left, swp.absolute_top, slide
+                )
+    return result
 
 
 def extract_text_inventory(
@@ -931,50 +1149,104 @@ def extract_text_inventory(
     inventory: InventoryData = {}
 
     for slide_idx, slide in enumerate(prs.slides):
-        # Collect all valid shapes from this slide with absolute positions
-        shapes_with_positions = []
-        for shape in slide.shapes:  # type: ignore
-            shapes_with_positions.extend(collect_shapes_with_absolute_positions(shape))
+        slide_inventory = extract_slide_inventory(slide, issues_only=issues_only)
+        if slide_inventory:
+            inventory[f"slide-{slide_idx}"] = slide_inventory
 
-        if not shapes_with_positions:
-            continue
+    return inventory
 
-        # Convert to ShapeData with absolute positions and slide reference
-        shape_data_list = [
-            ShapeData(
-                swp.shape,
-                swp.absolute_left,
-                swp.absolute_top,
-                slide,
-            )
-            for swp in shapes_with_positions
-        ]
 
-        # Sort by visual position and assign stable IDs in one step
-        sorted_shapes = sort_shapes_by_position(shape_data_list)
-        for idx, shape_data in enumerate(sorted_shapes):
-            shape_data.shape_id = f"shape-{idx}"
+# Presentation opened once per worker process by _init_inventory_worker
+_worker_prs: Optional[Any] = None
 
-        # Detect overlaps using the stable shape IDs
-        if len(sorted_shapes) > 1:
-            detect_overlaps(sorted_shapes)
 
-        # Filter for issues only if requested (after overlap detection)
-        if issues_only:
-            sorted_shapes = [sd for sd in sorted_shapes if sd.has_any_issues]
+def _init_inventory_worker(pptx_path: str) -> None:
+    """Open the presentation once in each inventory worker process."""
+    global _worker_prs
+    _worker_prs = Presentation(pptx_path)
 
-        if not sorted_shapes:
-            continue
 
-        # Create slide inventory using the stable shape IDs
-        inventory[f"slide-{slide_idx}"] = {
-            shape_data.shape_id: shape_data for shape_data in sorted_shapes
-        }
+def _extract_slide_dict(slide_idx: int, issues_only: bool) -> Dict[str, ShapeDict]:
+    """Inventory one slide in a worker process and return it as dictionaries."""
+    slide = _worker_prs.slides[slide_idx]  # type: ignore
+    slide_inventory = extract_slide_inventory(slide, issues_only=issues_only)
+    return {
+        shape_key: shape_data.to_dict()
+        for shape_key, shape_data in slide_inventory.items()
+    }
 
-    return inventory
+
+def extract_text_inventory_parallel(
+    pptx_path: Path, issues_only: bool = False, jobs: Optional[int] = None
+) -> InventoryDict:
+    """Extract text inventory with slides processed in a pool of worker processes.
+
+    Each worker opens the presentation once and inventories whole slides, so
+    results are returned as JSON-serializable dictionaries (ShapeData objects
+    hold references to python-pptx shapes and cannot cross process boundaries).
+    Slides are merged in slide order, giving the same result as
+    get_inventory_as_dict.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Number of worker processes (default: os.cpu_count())
+
+    Returns:
+        Nested dictionary with all data serialized for JSON
+    """
+    slide_count = len(Presentation(str(pptx_path)).slides)
+    slide_dicts = _extract_slide_dicts(
+        pptx_path, list(range(slide_count)), issues_only, jobs
+    )
+    return {
+        f"slide-{slide_idx}": slide_dict
+        for slide_idx, slide_dict in enumerate(slide_dicts)
+        if slide_dict
+    }
+
+
+def _extract_slide_dicts(
+    pptx_path: Path,
+    slide_indices: List[int],
+    issues_only: bool,
+    jobs: Optional[int],
+) -> List[Dict[str, ShapeDict]]:
+    """Inventory the given slides as dictionaries, in the order of slide_indices.
+
+    Slides without text shapes produce empty dictionaries. Uses a process pool
+    when more than one job is requested, otherwise opens the deck in-process.
+    """
+    jobs = min(jobs or os.cpu_count() or 1, max(len(slide_indices), 1))
+    if jobs <= 1:
+        prs = Presentation(str(pptx_path))
+        return [
+            {
+                shape_key: shape_data.to_dict()
+                for shape_key, shape_data in extract_slide_inventory(
+                    prs.slides[slide_idx], issues_only=issues_only
+                ).items()
+            }
+            for slide_idx in slide_indices
+        ]
+
+    with ProcessPoolExecutor(
+        max_workers=jobs,
+        initializer=_init_inventory_worker,
+        initargs=(str(pptx_path),),
+    ) as executor:
+        return list(
+            executor.map(
+                partial(_extract_slide_dict, issues_only=issues_only),
+                slide_indices,
+                chunksize=max(1, len(slide_indices) // (jobs * 4)),
+            )
+        )
 
 
-def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> InventoryDict:
+def get_inventory_as_dict(
+    pptx_path: Path, issues_only: bool = False, jobs: int = 1
+) -> InventoryDict:
     """Extract text inventory and return as JSON-serializable dictionaries.
 
     This is a convenience wrapper around extract_text_inventory that returns
@@ -984,19 +1256,229 @@ def get_inventory_as_dict(pptx_path: Path, issues_only: bool = False) -> Invento
     Args:
         pptx_path: Path to the PowerPoint file
         issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Number of worker processes; values above 1 use
+            extract_text_inventory_parallel (default: 1)
 
     Returns:
         Nested dictionary with all data serialized for JSON
     """
+    if jobs > 1:
+        return extract_text_inventory_parallel(
+            pptx_path, issues_only=issues_only, jobs=jobs
+        )
+
     inventory = extract_text_inventory(pptx_path, issues_only=issues_only)
+    return inventory_to_dict(inventory)
+
+
+def get_cached_inventory_as_dict(
+    pptx_path: Path,
+    issues_only: bool = False,
+    jobs: int = 1,
+    cache_path: Optional[Path] = None,
+) -> InventoryDict:
+    """Extract text inventory as dictionaries, reusing results for unchanged slides.
+
+    Each slide is keyed by a hash of its XML, its layout and master XML, the
+    slide size and the installed font set. Slides whose key is found in the
+    cache file are not re-opened or re-measured; only changed slides are
+    inventoried (in parallel when jobs > 1). When every slide is cached the
+    presentation is never loaded with python-pptx. The cache always holds
+    every text shape, so runs with and without issues_only share it.
+
+    Args:
+        pptx_path: Path to the PowerPoint file
+        issues_only: If True, only include shapes that have overflow or overlap issues
+        jobs: Number of worker processes for changed slides (default: 1)
+        cache_path: Cache file location (default: <deck>.inventory-cache.gz next to the deck)
+
+    Returns:
+        Nested dictionary with all data serialized for JSON, identical to
+        get_inventory_as_dict
+    """
+    pptx_path = Path(pptx_path)
+    if cache_path is None:
+        cache_path = pptx_path.with_name(pptx_path.name + INVENTORY_CACHE_SUFFIX)
+
+    slide_keys = _slide_cache_keys(pptx_path)
+    cached = _load_inventory_cache(cache_path)
+
+    missing = [idx for idx, key in enumerate(slide_keys) if key not in cached]
+    if missing:
+        for slide_idx, slide_dict in zip(
+            missing, _extract_slide_dicts(pptx_path, missing, issues_only=False, jobs=jobs)
+        ):
+            cached[slide_keys[slide_idx]] = slide_dict
+
+        # Only keep entries for the current slides so the cache does not grow
+        _save_inventory_cache(cache_path, {key: cached[key] for key in slide_keys})
+
+    inventory: InventoryDict = {}
+    for slide_idx, key in enumerate(slide_keys):
+        slide_dict = cached[key]
+        if issues_only:
+            # Same filter as extract_slide_inventory, applied to the serialized
+            # shapes (to_dict only writes these keys when there is an issue)
+            slide_dict = {
+                shape_key: shape_dict
+                for shape_key, shape_dict in slide_dict.items()
+                if "overflow" in shape_dict
+                or "overlap" in shape_dict
+                or "warnings" in shape_dict
+            }
+        if slide_dict:
+            inventory[f"slide-{slide_idx}"] = slide_dict
+    return inventory
+
+
+def _resolve_part_target(part_name: str, target: str) -> str:
+    """Resolve a relationship target relative to its source part."""
+    if target.startswith("/"):
+        return target.lstrip("/")
+    return posixpath.normpath(posixpath.join(posixpath.dirname(part_name), target))
+
+
+def _read_part_rels(zf: zipfile.ZipFile, part_name: str) -> Dict[str, Tuple[str, str]]:
+    """Read a part's relationships as rId -> (relationship type, target part name)."""
+    rels_name = posixpath.join(
+        posixpath.dirname(part_name), "_rels", posixpath.basename(part_name) + ".rels"
+    )
+    try:
+        rels_xml = zf.read(rels_name)
+    except KeyError:
+        return {}
+    rels = {}
+    for rel in etree.fromstring(rels_xml):
+        if rel.get("TargetMode") == "External":
+            continue
+        rels[rel.get("Id")] = (
+            rel.get("Type", ""),
+            _resolve_part_target(part_name, rel.get("Target", "")),
+        )
+    return rels
+
+
+def _related_part(rels: Dict[str, Tuple[str, str]], rel_type: str) -> Optional[str]:
+    """Get the target of the first relationship whose type ends with rel_type."""
+    for type_uri, target in rels.values():
+        if type_uri.endswith(rel_type):
+            return target
+    return None
 
-    # Convert ShapeData objects to dictionaries
+
+def _read_slide_part_names(
+    zf: zipfile.ZipFile,
+) -> Tuple[List[Tuple[str, Optional[str], Optional[str]]], etree._Element]:
+    """List (slide, layout, master) part names in presentation order.
+
+    Returns:
+        Tuple of (parts, presentation root element)
+    """
+    presentation = etree.fromstring(zf.read("ppt/presentation.xml"))
+    pres_rels = _read_part_rels(zf, "ppt/presentation.xml")
+
+    parts = []
+    for sld_id in presentation.iterfind(f"{P_NS}sldIdLst/{P_NS}sldId"):
+        slide_name = pres_rels[sld_id.get(f"{R_NS}id")][1]
+        layout_name = _related_part(_read_part_rels(zf, slide_name), "/slideLayout")
+        master_name = (
+            _related_part(_read_part_rels(zf, layout_name), "/slideMaster")
+            if layout_name
+            else None
+        )
+        parts.append((slide_name, layout_name, master_name))
+    return parts, presentation
+
+
+def _slide_cache_keys(pptx_path: Path) -> List[str]:
+    """Compute a content hash for every slide, in presentation order."""
+    # Overflow estimation depends on which fonts are installed
+    font_hash = hashlib.sha256(
+        json.dumps([(str(d), sorted(f)) for d, f in _get_font_index()]).encode()
+    ).hexdigest()
+
+    with zipfile.ZipFile(pptx_path) as zf:
+        parts, presentation = _read_slide_part_names(zf)
+        sld_sz = presentation.find(f"{P_NS}sldSz")
+        slide_size = (
+            f"{sld_sz.get('cx')}x{sld_sz.get('cy')}" if sld_sz is not None else ""
+        )
+
+        part_hashes: Dict[str, str] = {}
+
+        def part_hash(part_name: Optional[str]) -> str:
+            if not part_name:
+                return ""
+            if part_name not in part_hashes:
+                part_hashes[part_name] = hashlib.sha256(
+                    zf.read(part_name)
+                ).hexdigest()
+            return part_hashes[part_name]
+
+        keys = []
+        for slide_name, layout_name, master_name in parts:
+            key_source = "|".join(
+                [
+                    str(INVENTORY_CACHE_VERSION),
+                    slide_size,
+                    font_hash,
+                    part_hash(slide_name),
+                    part_hash(layout_name),
+                    part_hash(master_name),
+                ]
+            )
+            keys.append(hashlib.sha256(key_source.encode()).hexdigest())
+    return keys
+
+
+def _load_inventory_cache(cache_path: Path) -> Dict[str, Dict[str, ShapeDict]]:
+    """Load slide inventories from a cache file, or an empty cache if unusable."""
+    try:
+        with gzip.open(cache_path, "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, EOFError, ValueError):
+        # Missing, truncated or corrupt
+        return {}
+    if not isinstance(data, dict) or data.get("version") != INVENTORY_CACHE_VERSION:
+        return {}
+    slides = data.get("slides")
+    return slides if isinstance(slides, dict) else {}
+
+
+def _save_inventory_cache(
+    cache_path: Path, slides: Dict[str, Dict[str, ShapeDict]]
+) -> None:
+    """Write slide inventories to a cache file, ignoring unwritable locations.
+
+    The cache is written to a temporary file in the same directory and then moved
+    into place, so interrupted or concurrent runs never leave a partial cache.
+    """
+    temp_path = None
+    try:
+        fd, temp_path = tempfile.mkstemp(
+            dir=cache_path.parent, prefix=cache_path.name, suffix=".tmp"
+        )
+        with os.fdopen(fd, "wb") as raw, gzip.open(raw, "wt", encoding="utf-8") as f:
+            json.dump(
+                {"version": INVENTORY_CACHE_VERSION, "slides": slides},
+                f,
+                separators=(",", ":"),
+                ensure_ascii=False,
+            )
+        os.replace(temp_path, cache_path)
+    except OSError as e:
+        print(f"Warning: Could not write inventory cache {cache_path}: {e}")
+        if temp_path and os.path.exists(temp_path):
+            os.remove(temp_path)
+
+
+def inventory_to_dict(inventory: InventoryData) -> InventoryDict:
+    """Convert ShapeData objects in an inventory to dictionaries."""
     dict_inventory: InventoryDict = {}
     for slide_key, shapes in inventory.items():
         dict_inventory[slide_key] = {
             shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
         }
-
     return dict_inventory
 
 
@@ -1005,13 +1487,11 @@ def save_inventory(inventory: InventoryData, output_path: Path) -> None:
 
     Converts ShapeData objects to dictionaries for JSON serialization.
     """
-    # Convert ShapeData objects to dictionaries
-    json_inventory: InventoryDict = {}
-    for slide_key, shapes in inventory.items():
-        json_inventory[slide_key] = {
-            shape_key: shape_data.to_dict() for shape_key, shape_data in shapes.items()
-        }
+    save_inventory_dict(inventory_to_dict(inventory), output_path)
+
 
+def save_inventory_dict(json_inventory: InventoryDict, output_path: Path) -> None:
+    """Save an already-serialized inventory to JSON file with proper formatting."""
     with open(output_path, "w", encoding="utf-8") as f:
         json.dump(json_inventory, f, indent=2, ensure_ascii=False)
 
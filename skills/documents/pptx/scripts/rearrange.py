@@ -12,6 +12,7 @@ Slides can be repeated (e.g., 34 appears twice).
 import argparse
 import shutil
 import sys
+from collections import Counter
 from copy import deepcopy
 from pathlib import Path
 
@@ -72,8 +73,16 @@ Note: Slide indices are 0-based (first slide is 0, second is 1, etc.)
         sys.exit(1)
 
 
+R_EMBED = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
+
+
 def duplicate_slide(pres, index):
-    """Duplicate a slide in the presentation."""
+    """Duplicate a slide in the presentation.
+
+    Image and media parts are shared with the source slide: the copy gets new
+    relationships pointing at the existing parts, one per source relationship,
+    rather than new copies of the media.
+    """
     source = pres.slides[index]
 
     # Use source's layout to preserve formatting
@@ -85,71 +94,48 @@ def duplicate_slide(pres, index):
         if "image" in rel.reltype or "media" in rel.reltype:
             image_rels[rel_id] = rel
 
+    # Relate the new slide to the same image/media parts, once per relationship
+    rId_map = {
+        old_rId: new_slide.part.rels.get_or_add(rel.reltype, rel._target)
+        for old_rId, rel in image_rels.items()
+    }
+
     # CRITICAL: Clear placeholder shapes to avoid duplicates
+    sp_tree = new_slide.shapes._spTree
     for shape in new_slide.shapes:
         sp = shape.element
         sp.getparent().remove(sp)
 
-    # Copy all shapes from source
+    # Copy all shapes from source, keeping them before p:extLst if present
+    ext_lst = sp_tree.find(
+        "{http://schemas.openxmlformats.org/presentationml/2006/main}extLst"
+    )
     for shape in source.shapes:
-        el = shape.element
-        new_el = deepcopy(el)
-        new_slide.shapes._spTree.insert_element_before(new_el, "p:extLst")
+        new_el = deepcopy(shape.element)
+        if ext_lst is not None:
+            ext_lst.addprevious(new_el)
+        else:
+            sp_tree.append(new_el)
 
-        # Handle picture shapes - need to update the blip reference
+        # Handle picture shapes - point blip references at the new relationship IDs
         # Look for all blip elements (they can be in pic or other contexts)
-        # Using the element's own xpath method without namespaces argument
-        blips = new_el.xpath(".//a:blip[@r:embed]")
-        for blip in blips:
-            old_rId = blip.get(
-                "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed"
-            )
-            if old_rId in image_rels:
-                # Create a new relationship in the destination slide for this image
-                old_rel = image_rels[old_rId]
-                # get_or_add returns the rId directly, or adds and returns new rId
-                new_rId = new_slide.part.rels.get_or_add(
-                    old_rel.reltype, old_rel._target
-                )
-                # Update the blip's embed reference to use the new relationship ID
-                blip.set(
-                    "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}embed",
-                    new_rId,
-                )
-
-    # Copy any additional image/media relationships that might be referenced elsewhere
-    for rel_id, rel in image_rels.items():
-        try:
-            new_slide.part.rels.get_or_add(rel.reltype, rel._target)
-        except Exception:
-            pass  # Relationship might already exist
+        for blip in new_el.xpath(".//a:blip[@r:embed]"):
+            old_rId = blip.get(R_EMBED)
+            if old_rId in rId_map:
+                blip.set(R_EMBED, rId_map[old_rId])
 
     return new_slide
 
 
-def delete_slide(pres, index):
-    """Delete a slide from the presentation."""
-    rId = pres.slides._sldIdLst[index].rId
-    pres.part.drop_rel(rId)
-    del pres.slides._sldIdLst[index]
-
-
-def reorder_slides(pres, slide_index, target_index):
-    """Move a slide from one position to another."""
-    slides = pres.slides._sldIdLst
-
-    # Remove slide element from current position
-    slide_element = slides[slide_index]
-    slides.remove(slide_element)
-
-    # Insert at target position
-    slides.insert(target_index, slide_element)
-
-
 def rearrange_presentation(template_path, output_path, slide_sequence):
     """
     Create a new presentation with slides from template in specified order.
 
+    The first occurrence of each template slide uses the original slide and
+    later occurrences use duplicates. The final order is then written as a
+    single rewrite of p:sldIdLst, so the whole operation is linear in the
+    number of slides.
+
     Args:
         template_path: Path to template PPTX file
         output_path: Path for output PPTX file
@@ -169,57 +155,44 @@ def rearrange_presentation(template_path, output_path, slide_sequence):
         if idx < 0 or idx >= total_slides:
             raise ValueError(f"Slide index {idx} out of range (0-{total_slides - 1})")
 
-    # Track original slides and their duplicates
-    slide_map = []  # List of actual slide indices for final presentation
-    duplicated = {}  # Track duplicates: original_idx -> [duplicate_indices]
+    sld_id_lst = prs.slides._sldIdLst
+    original_sld_ids = list(sld_id_lst)
+    occurrences = Counter(slide_sequence)
 
-    # Step 1: DUPLICATE repeated slides
+    # Step 1: Pick the slide for each position, DUPLICATING repeated slides.
+    # Duplicates are appended at the end, so template indices stay valid.
     print(f"Processing {len(slide_sequence)} slides from template...")
+    final_sld_ids = []
+    used = set()
     for i, template_idx in enumerate(slide_sequence):
-        if template_idx in duplicated and duplicated[template_idx]:
-            # Already duplicated this slide, use the duplicate
-            slide_map.append(duplicated[template_idx].pop(0))
-            print(f"  [{i}] Using duplicate of slide {template_idx}")
-        elif slide_sequence.count(template_idx) > 1 and template_idx not in duplicated:
-            # First occurrence of a repeated slide - create duplicates
-            slide_map.append(template_idx)
-            duplicates = []
-            count = slide_sequence.count(template_idx) - 1
-            print(
-                f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
-            )
-            for _ in range(count):
-                duplicate_slide(prs, template_idx)
-                duplicates.append(len(prs.slides) - 1)
-            duplicated[template_idx] = duplicates
+        if template_idx not in used:
+            used.add(template_idx)
+            final_sld_ids.append(original_sld_ids[template_idx])
+            count = occurrences[template_idx] - 1
+            if count:
+                print(
+                    f"  [{i}] Using original slide {template_idx}, creating {count} duplicate(s)"
+                )
+            else:
+                print(f"  [{i}] Using original slide {template_idx}")
         else:
-            # Unique slide or first occurrence already handled, use original
-            slide_map.append(template_idx)
-            print(f"  [{i}] Using original slide {template_idx}")
-
-    # Step 2: DELETE unwanted slides (work backwards)
-    slides_to_keep = set(slide_map)
-    print(f"\nDeleting {len(prs.slides) - len(slides_to_keep)} unused slides...")
-    for i in range(len(prs.slides) - 1, -1, -1):
-        if i not in slides_to_keep:
-            delete_slide(prs, i)
-            # Update slide_map indices after deletion
-            slide_map = [idx - 1 if idx > i else idx for idx in slide_map]
-
-    # Step 3: REORDER to final sequence
-    print(f"Reordering {len(slide_map)} slides to final sequence...")
-    for target_pos in range(len(slide_map)):
-        # Find which slide should be at target_pos
-        current_pos = slide_map[target_pos]
-        if current_pos != target_pos:
-            reorder_slides(prs, current_pos, target_pos)
-            # Update slide_map: the move shifts other slides
-            for i in range(len(slide_map)):
-                if slide_map[i] > current_pos and slide_map[i] <= target_pos:
-                    slide_map[i] -= 1
-                elif slide_map[i] < current_pos and slide_map[i] >= target_pos:
-                    slide_map[i] += 1
-            slide_map[target_pos] = target_pos
+            duplicate_slide(prs, template_idx)
+            final_sld_ids.append(sld_id_lst[-1])
+            print(f"  [{i}] Using duplicate of slide {template_idx}")
+
+    # Step 2: DELETE unwanted slides and REORDER in one rewrite of p:sldIdLst
+    keep = {sld_id.rId for sld_id in final_sld_ids}
+    unused = [sld_id for sld_id in original_sld_ids if sld_id.rId not in keep]
+    print(f"\nDeleting {len(unused)} unused slides...")
+    for sld_id in unused:
+        # Only p:sldIdLst refers to a slide relationship, so drop it directly
+        prs.part.rels.pop(sld_id.rId)
+
+    print(f"Reordering {len(final_sld_ids)} slides to final sequence...")
+    for sld_id in list(sld_id_lst):
+        sld_id_lst.remove(sld_id)
+    for sld_id in final_sld_ids:
+        sld_id_lst.append(sld_id)
 
     # Save the presentation
     prs.save(output_path)
@@ -14,7 +14,12 @@ import sys
 from pathlib import Path
 from typing import Any, Dict, List
 
-from inventory import InventoryData, extract_text_inventory
+from inventory import (
+    InventoryData,
+    extract_shapes_by_id,
+    extract_text_inventory,
+    find_overlapping_pairs,
+)
 from pptx import Presentation
 from pptx.dml.color import RGBColor
 from pptx.enum.dml import MSO_THEME_COLOR
@@ -159,6 +164,48 @@ def detect_frame_overflow(inventory: InventoryData) -> Dict[str, Dict[str, float
     return overflow_map
 
 
+def text_extent(shape_data) -> tuple:
+    """Area covered by a shape's text: its frame plus any overflow below it."""
+    overflow = shape_data.frame_overflow_bottom or 0.0
+    return (
+        shape_data.left,
+        shape_data.top,
+        shape_data.width,
+        shape_data.height + overflow,
+    )
+
+
+def detect_new_text_overlaps(
+    inventory: InventoryData, updated_inventory: InventoryData
+) -> List[str]:
+    """Find replaced shapes whose text now runs into another replaced shape.
+
+    Shapes without replacement text were cleared, so only the replaced shapes
+    are compared. Each slide is checked with the same overlap pass as the
+    inventory, once with the shapes' original text extents and once with their
+    new ones; only overlaps that are new or grew are reported.
+
+    Returns list of warning messages.
+    """
+    warnings = []
+    for slide_key, updated_shapes in updated_inventory.items():
+        shape_keys = list(updated_shapes.keys())
+        original = [text_extent(inventory[slide_key][k]) for k in shape_keys]
+        updated = [text_extent(updated_shapes[k]) for k in shape_keys]
+
+        original_pairs = {
+            (i, j): area for i, j, area in find_overlapping_pairs(original)
+        }
+        for i, j, area in find_overlapping_pairs(updated):
+            if area > original_pairs.get((i, j), 0.0) + 0.01:
+                warnings.append(
+                    f"{slide_key}/{shape_keys[i]} and {slide_key}/{shape_keys[j]}: "
+                    f"text now overlaps by {area:.2f} sq in "
+                    f"(was {original_pairs.get((i, j), 0.0):.2f})"
+                )
+    return warnings
+
+
 def validate_replacements(inventory: InventoryData, replacements: Dict) -> List[str]:
     """Validate that all shapes in replacements exist in inventory.
 
@@ -201,6 +248,43 @@ def validate_replacements(inventory: InventoryData, replacements: Dict) -> List[
     return errors
 
 
+def reinventory_replaced_shapes(
+    pptx_path: Path, replaced_shape_ids: Dict[str, Dict[str, int]]
+) -> InventoryData:
+    """Re-measure only the shapes that received replacement text.
+
+    Every other inventoried shape was cleared, so it has no text left to
+    overflow or warn about; those shapes are not measured again. Results keep
+    the shape keys from the original inventory.
+
+    Args:
+        pptx_path: Path to the presentation with replacements applied
+        replaced_shape_ids: slide_key -> shape_key -> python-pptx shape_id
+
+    Returns:
+        Inventory containing only the replaced shapes that still have text
+    """
+    inventory: InventoryData = {}
+    if not replaced_shape_ids:
+        return inventory
+
+    prs = Presentation(str(pptx_path))
+    for slide_key, shape_ids in replaced_shape_ids.items():
+        slide = prs.slides[int(slide_key.split("-")[1])]
+        measured = extract_shapes_by_id(slide, list(shape_ids.values()))
+
+        slide_inventory = {}
+        for shape_key, shape_id in shape_ids.items():
+            if shape_id in measured:
+                shape_data = measured[shape_id]
+                shape_data.shape_id = shape_key
+                slide_inventory[shape_key] = shape_data
+        if slide_inventory:
+            inventory[slide_key] = slide_inventory
+
+    return inventory
+
+
 def check_duplicate_keys(pairs):
     """Check for duplicate keys when loading JSON."""
     result = {}
@@ -245,6 +329,9 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     shapes_cleared = 0
     shapes_replaced = 0
 
+    # slide_key -> shape_key -> python-pptx shape_id of shapes given new text
+    replaced_shape_ids: Dict[str, Dict[str, int]] = {}
+
     # Process each slide from inventory
     for slide_key, shapes_dict in inventory.items():
         if not slide_key.startswith("slide-"):
@@ -278,6 +365,7 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
                 continue
 
             shapes_replaced += 1
+            replaced_shape_ids.setdefault(slide_key, {})[shape_key] = shape.shape_id
 
             # Add replacement paragraphs
             for i, para_data in enumerate(replacement_shape_data["paragraphs"]):
@@ -298,7 +386,7 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
         prs.save(str(tmp_path))
 
     try:
-        updated_inventory = extract_text_inventory(tmp_path)
+        updated_inventory = reinventory_replaced_shapes(tmp_path, replaced_shape_ids)
         updated_overflow = detect_frame_overflow(updated_inventory)
     finally:
         tmp_path.unlink()  # Clean up temp file
@@ -318,6 +406,9 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
                     f'(was {original:.2f}", now {new_overflow:.2f}")'
                 )
 
+    # Overflowing text that now runs into other replaced shapes (reported, not fatal)
+    overlap_warnings = detect_new_text_overlaps(inventory, updated_inventory)
+
     # Collect warnings from updated shapes
     warnings = []
     for slide_key, shapes_dict in updated_inventory.items():
@@ -351,6 +442,10 @@ def apply_replacements(pptx_file: str, json_file: str, output_file: str):
     print(f"  - Shapes processed: {shapes_processed}")
     print(f"  - Shapes cleared: {shapes_cleared}")
     print(f"  - Shapes replaced: {shapes_replaced}")
+    if overlap_warnings:
+        print("\nWARNING: Text now overlaps other shapes:")
+        for warning in overlap_warnings:
+            print(f"  - {warning}")
 
 
 def main():
@@ -20,6 +20,7 @@ Grid limits by column count:
 
 Usage:
     python thumbnail.py input.pptx [output_prefix] [--cols N] [--outline-placeholders]
+                        [--jobs N] [--cache]
 
 Examples:
     python thumbnail.py presentation.pptx
@@ -38,15 +39,30 @@ Examples:
 
     python thumbnail.py template.pptx analysis --outline-placeholders
     # Creates thumbnail grids with red outlines around text placeholders
+
+    python thumbnail.py large-deck.pptx grid --jobs 8 --cache
+    # Rasterizes pages with 8 pdftoppm processes and caches slide images in
+    # large-deck.pptx.thumbnail-cache/ so later runs only render changed slides
 """
 
 import argparse
+import hashlib
+import os
+import shutil
 import subprocess
 import sys
 import tempfile
+import zipfile
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
-from inventory import extract_text_inventory
+from inventory import (
+    P_NS,
+    _read_part_rels,
+    _read_slide_part_names,
+    get_cached_inventory_as_dict,
+    get_inventory_as_dict,
+)
 from PIL import Image, ImageDraw, ImageFont
 from pptx import Presentation
 
@@ -63,6 +79,8 @@ BORDER_WIDTH = 2  # Border width around thumbnails
 FONT_SIZE_RATIO = 0.12  # Font size as fraction of thumbnail width
 LABEL_PADDING_RATIO = 0.4  # Label padding as fraction of font size
 
+THUMBNAIL_CACHE_SUFFIX = ".thumbnail-cache"  # Slide image cache dir next to the deck
+
 
 def main():
     parser = argparse.ArgumentParser(
@@ -86,6 +104,18 @@ def main():
         action="store_true",
         help="Outline text placeholders with a colored border",
     )
+    parser.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Number of parallel pdftoppm processes (default: 1)",
+    )
+    parser.add_argument(
+        "--cache",
+        action="store_true",
+        help=f"Reuse slide images from <input>{THUMBNAIL_CACHE_SUFFIX}/ "
+        "and render only changed slides (also caches the placeholder inventory)",
+    )
 
     args = parser.parse_args()
 
@@ -113,13 +143,24 @@ def main():
             if args.outline_placeholders:
                 print("Extracting placeholder regions...")
                 placeholder_regions, slide_dimensions = get_placeholder_regions(
-                    input_path
+                    input_path, use_cache=args.cache
                 )
                 if placeholder_regions:
                     print(f"Found placeholders on {len(placeholder_regions)} slides")
 
             # Convert slides to images
-            slide_images = convert_to_images(input_path, Path(temp_dir), CONVERSION_DPI)
+            cache_dir = (
+                input_path.with_name(input_path.name + THUMBNAIL_CACHE_SUFFIX)
+                if args.cache
+                else None
+            )
+            slide_images = convert_to_images(
+                input_path,
+                Path(temp_dir),
+                CONVERSION_DPI,
+                jobs=args.jobs,
+                cache_dir=cache_dir,
+            )
             if not slide_images:
                 print("Error: No slides found")
                 sys.exit(1)
@@ -156,16 +197,22 @@ def create_hidden_slide_placeholder(size):
     return img
 
 
-def get_placeholder_regions(pptx_path):
+def get_placeholder_regions(pptx_path, use_cache=False):
     """Extract ALL text regions from the presentation.
 
+    With ``use_cache``, the inventory is cached per slide next to the deck, so
+    repeated runs on the same template skip re-measuring unchanged slides.
+
     Returns a tuple of (placeholder_regions, slide_dimensions).
     text_regions is a dict mapping slide indices to lists of text regions.
     Each region is a dict with 'left', 'top', 'width', 'height' in inches.
     slide_dimensions is a tuple of (width_inches, height_inches).
     """
     prs = Presentation(str(pptx_path))
-    inventory = extract_text_inventory(pptx_path, prs)
+    if use_cache:
+        inventory = get_cached_inventory_as_dict(pptx_path)
+    else:
+        inventory = get_inventory_as_dict(pptx_path)
     placeholder_regions = {}
 
     # Get actual slide dimensions in inches (EMU to inches conversion)
@@ -181,10 +228,10 @@ def get_placeholder_regions(pptx_path):
             # The inventory only contains shapes with text, so all shapes should be highlighted
             regions.append(
                 {
-                    "left": shape_data.left,
-                    "top": shape_data.top,
-                    "width": shape_data.width,
-                    "height": shape_data.height,
+                    "left": shape_data["left"],
+                    "top": shape_data["top"],
+                    "width": shape_data["width"],
+                    "height": shape_data["height"],
                 }
             )
 
@@ -194,8 +241,15 @@ def get_placeholder_regions(pptx_path):
     return placeholder_regions, (slide_width_inches, slide_height_inches)
 
 
-def convert_to_images(pptx_path, temp_dir, dpi):
-    """Convert PowerPoint to images via PDF, handling hidden slides."""
+def convert_to_images(pptx_path, temp_dir, dpi, jobs=1, cache_dir=None):
+    """Convert PowerPoint to images via PDF, handling hidden slides.
+
+    PDF pages are rasterized by up to ``jobs`` parallel pdftoppm processes, each
+    working on a contiguous page range. With ``cache_dir``, rendered slides are
+    stored under a hash of the slide and every part it depends on (layout,
+    master, theme, media); only slides without a cached image are rasterized,
+    and soffice is skipped entirely when nothing changed.
+    """
     # Detect hidden slides
     print("Analyzing presentation...")
     prs = Presentation(str(pptx_path))
@@ -212,45 +266,80 @@ def convert_to_images(pptx_path, temp_dir, dpi):
     if hidden_slides:
         print(f"Hidden slides: {sorted(hidden_slides)}")
 
-    pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
-
-    # Convert to PDF
-    print("Converting to PDF...")
-    result = subprocess.run(
-        [
-            "soffice",
-            "--headless",
-            "--convert-to",
-            "pdf",
-            "--outdir",
-            str(temp_dir),
-            str(pptx_path),
-        ],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0 or not pdf_path.exists():
-        raise RuntimeError("PDF conversion failed")
-
-    # Convert PDF to images
-    print(f"Converting to images at {dpi} DPI...")
-    result = subprocess.run(
-        ["pdftoppm", "-jpeg", "-r", str(dpi), str(pdf_path), str(temp_dir / "slide")],
-        capture_output=True,
-        text=True,
-    )
-    if result.returncode != 0:
-        raise RuntimeError("Image conversion failed")
+    # Visible slides appear in the PDF in order: slide number -> PDF page number
+    visible_slides = [n for n in range(1, total_slides + 1) if n not in hidden_slides]
+    pdf_pages = {slide_num: page for page, slide_num in enumerate(visible_slides, 1)}
+
+    # Look up previously rendered slides
+    slide_images = {}
+    cache_keys = {}
+    if cache_dir:
+        cache_dir = Path(cache_dir)
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        keys = slide_render_keys(pptx_path, dpi)
+        for slide_num in visible_slides:
+            cache_keys[slide_num] = keys[slide_num - 1]
+            cached_path = cache_dir / f"{cache_keys[slide_num]}.jpg"
+            if cached_path.exists():
+                slide_images[slide_num] = cached_path
+        if slide_images:
+            print(f"Reusing {len(slide_images)} cached slide images")
+
+    to_render = [n for n in visible_slides if n not in slide_images]
+    if to_render:
+        pdf_path = temp_dir / f"{pptx_path.stem}.pdf"
+
+        # Convert to PDF
+        print("Converting to PDF...")
+        result = subprocess.run(
+            [
+                "soffice",
+                "--headless",
+                "--convert-to",
+                "pdf",
+                "--outdir",
+                str(temp_dir),
+                str(pptx_path),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0 or not pdf_path.exists():
+            raise RuntimeError("PDF conversion failed")
 
-    visible_images = sorted(temp_dir.glob("slide-*.jpg"))
+        # Convert PDF to images
+        print(f"Converting {len(to_render)} slides to images at {dpi} DPI...")
+        rendered = rasterize_pages(
+            pdf_path, [pdf_pages[n] for n in to_render], temp_dir, dpi, jobs
+        )
+        for slide_num in to_render:
+            image_path = rendered.get(pdf_pages[slide_num])
+            if image_path is None:
+                continue
+            if cache_dir:
+                cached_path = cache_dir / f"{cache_keys[slide_num]}.jpg"
+                # Copy to a temporary file first so an interrupted or concurrent
+                # run never leaves a partial image under the final name
+                fd, temp_path = tempfile.mkstemp(dir=cache_dir, suffix=".tmp")
+                os.close(fd)
+                try:
+                    shutil.copyfile(image_path, temp_path)
+                    os.replace(temp_path, cached_path)
+                except OSError:
+                    Path(temp_path).unlink(missing_ok=True)
+                    raise
+            slide_images[slide_num] = image_path
+
+        if cache_dir:
+            prune_thumbnail_cache(cache_dir, set(cache_keys.values()))
 
     # Create full list with placeholders for hidden slides
     all_images = []
-    visible_idx = 0
 
     # Get placeholder dimensions from first visible slide
-    if visible_images:
-        with Image.open(visible_images[0]) as img:
+    rendered_slides = [n for n in visible_slides if n in slide_images]
+    if rendered_slides:
+        with Image.open(slide_images[rendered_slides[0]]) as img:
             placeholder_size = img.size
     else:
         placeholder_size = (1920, 1080)
@@ -262,15 +351,148 @@ def convert_to_images(pptx_path, temp_dir, dpi):
             placeholder_img = create_hidden_slide_placeholder(placeholder_size)
             placeholder_img.save(placeholder_path, "JPEG")
             all_images.append(placeholder_path)
-        else:
+        elif slide_num in slide_images:
             # Use the actual visible slide image
-            if visible_idx < len(visible_images):
-                all_images.append(visible_images[visible_idx])
-                visible_idx += 1
+            all_images.append(slide_images[slide_num])
 
     return all_images
 
 
+def rasterize_pages(pdf_path, pages, temp_dir, dpi, jobs=1):
+    """Rasterize selected PDF pages to JPEG with parallel pdftoppm processes.
+
+    Pages are grouped into contiguous ranges, split into at most ``jobs``
+    chunks, and each chunk is rendered by its own pdftoppm invocation.
+
+    Returns:
+        Dict mapping page number (1-based) to image path
+    """
+    ranges = split_page_ranges(sorted(pages), max(1, jobs))
+
+    def render(range_idx, first, last):
+        prefix = temp_dir / f"range-{range_idx}"
+        result = subprocess.run(
+            [
+                "pdftoppm",
+                "-jpeg",
+                "-r",
+                str(dpi),
+                "-f",
+                str(first),
+                "-l",
+                str(last),
+                str(pdf_path),
+                str(prefix),
+            ],
+            capture_output=True,
+            text=True,
+        )
+        if result.returncode != 0:
+            raise RuntimeError("Image conversion failed")
+        # pdftoppm zero-pads page numbers consistently within one run
+        images = sorted(temp_dir.glob(f"range-{range_idx}-*.jpg"))
+        return dict(zip(range(first, last + 1), images))
+
+    rendered = {}
+    with ThreadPoolExecutor(max_workers=max(1, jobs)) as executor:
+        futures = [
+            executor.submit(render, idx, first, last)
+            for idx, (first, last) in enumerate(ranges)
+        ]
+        for future in futures:
+            rendered.update(future.result())
+    return rendered
+
+
+def split_page_ranges(pages, chunks):
+    """Split sorted page numbers into (first, last) ranges for parallel rendering.
+
+    Runs of consecutive pages are kept together; long runs are cut so the
+    work spreads over roughly ``chunks`` ranges.
+    """
+    if not pages:
+        return []
+    chunk_size = max(1, -(-len(pages) // chunks))  # Ceiling division
+
+    ranges = []
+    first = prev = pages[0]
+    count = 1
+    for page in pages[1:]:
+        if page == prev + 1 and count < chunk_size:
+            prev = page
+            count += 1
+            continue
+        ranges.append((first, prev))
+        first = prev = page
+        count = 1
+    ranges.append((first, prev))
+    return ranges
+
+
+def slide_render_keys(pptx_path, dpi):
+    """Hash each slide with every part that affects how it renders.
+
+    A slide's key covers the slide XML and all parts reachable from it through
+    relationships (layout, master, theme, images, charts, ...), except other
+    slides and notes, plus the slide's position in the deck (for slide number
+    fields and anything else that depends on it), the slide size and rendering DPI.
+
+    Returns:
+        List of hex digests in slide order
+    """
+    with zipfile.ZipFile(pptx_path) as zf:
+        parts, presentation = _read_slide_part_names(zf)
+        sld_sz = presentation.find(f"{P_NS}sldSz")
+        base = f"{dpi}|" + (
+            f"{sld_sz.get('cx')}x{sld_sz.get('cy')}" if sld_sz is not None else ""
+        )
+
+        part_hashes = {}
+        part_deps = {}
+
+        def dependencies(part_name):
+            if part_name not in part_deps:
+                part_deps[part_name] = [
+                    target
+                    for rel_type, target in _read_part_rels(zf, part_name).values()
+                    if not rel_type.endswith(("/slide", "/notesSlide"))
+                ]
+            return part_deps[part_name]
+
+        def part_hash(part_name):
+            if part_name not in part_hashes:
+                try:
+                    data = zf.read(part_name)
+                except KeyError:
+                    data = b""
+                part_hashes[part_name] = hashlib.sha256(data).hexdigest()
+            return part_hashes[part_name]
+
+        keys = []
+        for position, (slide_name, _, _) in enumerate(parts, 1):
+            # Walk every part this slide depends on
+            seen = {slide_name}
+            stack = [slide_name]
+            while stack:
+                for target in dependencies(stack.pop()):
+                    if target not in seen:
+                        seen.add(target)
+                        stack.append(target)
+
+            digest = hashlib.sha256(f"{base}|{position}".encode())
+            for name in sorted(seen):
+                digest.update(f"{name}:{part_hash(name)}|".encode())
+            keys.append(digest.hexdigest())
+    return keys
+
+
+def prune_thumbnail_cache(cache_dir, keep_keys):
+    """Delete cached slide images that no longer belong to any slide."""
+    for image_path in cache_dir.glob("*.jpg"):
+        if image_path.stem not in keep_keys:
+            image_path.unlink(missing_ok=True)
+
+
 def create_grids(
     image_paths,
     cols,
@@ -378,56 +600,21 @@ def create_grid(
             # Get original dimensions before thumbnail
             orig_w, orig_h = img.size
 
-            # Apply placeholder outlines if enabled
-            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
-                # Convert to RGBA for transparency support
-                if img.mode != "RGBA":
-                    img = img.convert("RGBA")
-
-                # Get the regions for this slide
-                regions = placeholder_regions[start_slide_num + i]
-
-                # Calculate scale factors using actual slide dimensions
-                if slide_dimensions:
-                    slide_width_inches, slide_height_inches = slide_dimensions
-                else:
-                    # Fallback: estimate from image size at CONVERSION_DPI
-                    slide_width_inches = orig_w / CONVERSION_DPI
-                    slide_height_inches = orig_h / CONVERSION_DPI
-
-                x_scale = orig_w / slide_width_inches
-                y_scale = orig_h / slide_height_inches
-
-                # Create a highlight overlay
-                overlay = Image.new("RGBA", img.size, (255, 255, 255, 0))
-                overlay_draw = ImageDraw.Draw(overlay)
-
-                # Highlight each placeholder region
-                for region in regions:
-                    # Convert from inches to pixels in the original image
-                    px_left = int(region["left"] * x_scale)
-                    px_top = int(region["top"] * y_scale)
-                    px_width = int(region["width"] * x_scale)
-                    px_height = int(region["height"] * y_scale)
-
-                    # Draw highlight outline with red color and thick stroke
-                    # Using a bright red outline instead of fill
-                    stroke_width = max(
-                        5, min(orig_w, orig_h) // 150
-                    )  # Thicker proportional stroke width
-                    overlay_draw.rectangle(
-                        [(px_left, px_top), (px_left + px_width, px_top + px_height)],
-                        outline=(255, 0, 0, 255),  # Bright red, fully opaque
-                        width=stroke_width,
-                    )
-
-                # Composite the overlay onto the image using alpha blending
-                img = Image.alpha_composite(img, overlay)
-                # Convert back to RGB for JPEG saving
-                img = img.convert("RGB")
-
+            # Let the JPEG decoder downscale while decoding (no-op for other formats)
+            img.draft("RGB", (width, height))
+            img = img.convert("RGB")
             img.thumbnail((width, height), Image.Resampling.LANCZOS)
             w, h = img.size
+
+            # Apply placeholder outlines if enabled, drawn at thumbnail resolution
+            if placeholder_regions and (start_slide_num + i) in placeholder_regions:
+                draw_placeholder_outlines(
+                    img,
+                    placeholder_regions[start_slide_num + i],
+                    (orig_w, orig_h),
+                    slide_dimensions,
+                )
+
             tx = x + (width - w) // 2
             ty = y_thumbnail + (height - h) // 2
             grid.paste(img, (tx, ty))
@@ -446,5 +633,47 @@ def create_grid(
     return grid
 
 
+def draw_placeholder_outlines(img, regions, orig_size, slide_dimensions=None):
+    """Outline text regions in red on an already-thumbnailed slide image.
+
+    Args:
+        img: RGB thumbnail to draw on (modified in place)
+        regions: List of dicts with 'left', 'top', 'width', 'height' in inches
+        orig_size: (width, height) of the full-size slide image in pixels
+        slide_dimensions: Optional (width_inches, height_inches) of the slide
+    """
+    orig_w, orig_h = orig_size
+    w, h = img.size
+
+    # Calculate scale factors using actual slide dimensions
+    if slide_dimensions:
+        slide_width_inches, slide_height_inches = slide_dimensions
+    else:
+        # Fallback: estimate from image size at CONVERSION_DPI
+        slide_width_inches = orig_w / CONVERSION_DPI
+        slide_height_inches = orig_h / CONVERSION_DPI
+
+    x_scale = w / slide_width_inches
+    y_scale = h / slide_height_inches
+
+    # Same proportional stroke as on the full-size image, scaled down
+    orig_stroke_width = max(5, min(orig_w, orig_h) // 150)
+    stroke_width = max(1, round(orig_stroke_width * w / orig_w))
+
+    draw = ImageDraw.Draw(img)
+    for region in regions:
+        # Convert from inches to pixels in the thumbnail
+        px_left = int(region["left"] * x_scale)
+        px_top = int(region["top"] * y_scale)
+        px_width = int(region["width"] * x_scale)
+        px_height = int(region["height"] * y_scale)
+
+        draw.rectangle(
+            [(px_left, px_top), (px_left + px_width, px_top + px_height)],
+            outline=(255, 0, 0),  # Bright red
+            width=stroke_width,
+        )
+
+
 if __name__ == "__main__":
     main()
@@ -0,0 +1,1481 @@
+#!/usr/bin/env python3
+"""
+Pure-Python Formula Engine
+Recalculates formulas in an Excel file without starting LibreOffice
+
+Formulas are read straight from the sheet XML, parsed, and ordered by a dependency
+graph so every cell is evaluated after the cells it refers to. After input cells are
+changed, only the formulas that depend on them (directly or indirectly) are evaluated
+again; cached values of all other formulas are reused.
+
+Only a subset of Excel is supported (see FUNCTIONS). Workbooks that use anything else
+(other functions, defined names, array formulas, ranges used as single values,
+wildcard lookups, circular references, ...) are recalculated with LibreOffice via
+recalc.py instead.
+"""
+
+import argparse
+import json
+import math
+import os
+import re
+import shutil
+import tempfile
+import zipfile
+import xml.dom.minidom
+import xml.etree.ElementTree as ET
+from collections import defaultdict, deque
+from decimal import Decimal, ROUND_DOWN, ROUND_HALF_UP, ROUND_UP
+from pathlib import Path
+
+from recalc import (
+    _column_index,
+    _column_letter,
+    _local_name,
+    check_workbook,
+    get_sheet_parts,
+    recalc,
+)
+
+
+MAX_ROW = 1048576
+MAX_COLUMN = 16384
+
+
+class UnsupportedFormula(Exception):
+    """Raised when a workbook needs features this engine does not implement"""
+
+
+class ExcelError:
+    """An Excel error value such as #DIV/0!"""
+
+    __slots__ = ('code',)
+
+    def __init__(self, code):
+        self.code = code
+
+    def __eq__(self, other):
+        return isinstance(other, ExcelError) and other.code == self.code
+
+    def __hash__(self):
+        return hash(self.code)
+
+    def __repr__(self):
+        return self.code
+
+
+DIV0 = ExcelError('#DIV/0!')
+NA = ExcelError('#N/A')
+NUM = ExcelError('#NUM!')
+REF = ExcelError('#REF!')
+VALUE = ExcelError('#VALUE!')
+
+
+class Range:
+    """Values of a cell range, as a list of rows"""
+
+    __slots__ = ('rows',)
+
+    def __init__(self, rows):
+        self.rows = rows
+
+    def values(self):
+        for row in self.rows:
+            yield from row
+
+
+class _Propagate(Exception):
+    """Carries an error value out of a function implementation"""
+
+    def __init__(self, error):
+        self.error = error
+
+
+# ---------------------------------------------------------------------------
+# Tokenizer and parser
+# ---------------------------------------------------------------------------
+
+TOKEN_RE = re.compile(r'''
+    (?P<ws>\s+)
+  | (?P<string>"(?:[^"]|"")*")
+  | (?P<error>\#(?:NULL!|DIV/0!|VALUE!|REF!|NAME\?|NUM!|N/A))
+  | (?P<ref>
+        (?:(?P<sheet>'(?:[^']|'')+'|[A-Za-z_][\w.]*)!)?
+        (?P<a>\$?[A-Za-z]{1,3}\$?\d+|\$?[A-Za-z]{1,3}(?=:))
+        (?::(?P<b>\$?[A-Za-z]{1,3}\$?\d+|\$?[A-Za-z]{1,3}))?
+        (?![\w(!])
+    )
+  | (?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)
+  | (?P<bool>(?:TRUE|FALSE)(?![\w(]))
+  | (?P<func>[A-Za-z_][\w.]*(?=\())
+  | (?P<op><>|<=|>=|[-+*/^&=<>%])
+  | (?P<paren>[(),])
+''', re.VERBOSE | re.IGNORECASE)
+
+CELL_PART_RE = re.compile(r'^(\$?)([A-Za-z]{1,3})(\$?)(\d*)$')
+
+COMPARISON_OPS = ('=', '<>', '<', '>', '<=', '>=')
+
+
+def tokenize(formula):
+    """
+    Split a formula (without the leading '=') into (kind, text, match) tokens
+
+    Raises:
+        UnsupportedFormula: for syntax outside the supported subset (defined names,
+            external references, array constants, row ranges, ...)
+    """
+    tokens = []
+    pos = 0
+    while pos < len(formula):
+        match = TOKEN_RE.match(formula, pos)
+        if not match:
+            raise UnsupportedFormula(f'Unsupported formula syntax at "{formula[pos:pos + 20]}"')
+        tokens.append((match.lastgroup, match.group(), match))
+        pos = match.end()
+    return tokens
+
+
+def _shift_cell_part(part, row_offset, col_offset):
+    """Move a relative cell or column reference like A1, $A1 or B by the given offsets"""
+    col_abs, letters, row_abs, digits = CELL_PART_RE.match(part).groups()
+    col = _column_index(letters.upper())
+    if not col_abs:
+        col += col_offset
+    result = col_abs + _column_letter(col) if 1 <= col <= MAX_COLUMN else None
+    if digits:
+        row = int(digits)
+        if not row_abs:
+            row += row_offset
+        if result is None or not 1 <= row <= MAX_ROW:
+            raise UnsupportedFormula('Shared formula moves a reference off the sheet')
+        result += row_abs + str(row)
+    elif result is None:
+        raise UnsupportedFormula('Shared formula moves a reference off the sheet')
+    return result
+
+
+def translate_formula(formula, row_offset, col_offset):
+    """
+    Return a formula moved by the given offsets, like copying it to another cell
+
+    Used to expand shared formulas, which store their text only in the first cell.
+    """
+    parts = []
+    for kind, text, match in tokenize(formula):
+        if kind == 'ref':
+            sheet, a, b = match.group('sheet'), match.group('a'), match.group('b')
+            text = (sheet + '!' if sheet else '') + _shift_cell_part(a, row_offset, col_offset)
+            if b:
+                text += ':' + _shift_cell_part(b, row_offset, col_offset)
+        parts.append(text)
+    return ''.join(parts)
+
+
+def _cell_part(part):
+    """Return (row or None, column) for a cell or column reference like $B$3 or B"""
+    _, letters, _, digits = CELL_PART_RE.match(part).groups()
+    return (int(digits) if digits else None), _column_index(letters.upper())
+
+
+class _Parser:
+    """Recursive-descent parser producing tuple-based syntax trees"""
+
+    def __init__(self, formula, sheet, sheet_lookup):
+        self.tokens = [t for t in tokenize(formula) if t[0] != 'ws']
+        self.pos = 0
+        self.sheet = sheet
+        self.sheet_lookup = sheet_lookup
+
+    def parse(self):
+        node = self.scalar(self.comparison())
+        if self.pos != len(self.tokens):
+            raise UnsupportedFormula(f'Unexpected "{self.tokens[self.pos][1]}"')
+        return node
+
+    def scalar(self, node):
+        """Reject multi-cell ranges where a single value is expected"""
+        # Excel would apply the operation to every cell (array formulas) or use
+        # implicit intersection; neither is implemented
+        if node[0] == 'range' and node[2:4] != node[4:6]:
+            raise UnsupportedFormula('Range used where a single value is expected')
+        return node
+
+    def peek(self):
+        return self.tokens[self.pos][:2] if self.pos < len(self.tokens) else (None, None)
+
+    def take(self):
+        token = self.tokens[self.pos]
+        self.pos += 1
+        return token
+
+    def expect(self, text):
+        if self.peek()[1] != text:
+            raise UnsupportedFormula(f'Expected "{text}"')
+        self.pos += 1
+
+    def binary(self, operand, operators):
+        node = operand()
+        while self.peek()[0] == 'op' and self.peek()[1] in operators:
+            op = self.take()[1]
+            node = ('op', op, self.scalar(node), self.scalar(operand()))
+        return node
+
+    def comparison(self):
+        return self.binary(self.concat, COMPARISON_OPS)
+
+    def concat(self):
+        return self.binary(self.additive, ('&',))
+
+    def additive(self):
+        return self.binary(self.multiplicative, ('+', '-'))
+
+    def multiplicative(self):
+        return self.binary(self.power, ('*', '/'))
+
+    def power(self):
+        # Excel binds unary minus tighter than ^, so -2^2 is 4
+        return self.binary(self.unary, ('^',))
+
+    def unary(self):
+        kind, text = self.peek()
+        if kind == 'op' and text in ('-', '+'):
+            self.pos += 1
+            operand = self.scalar(self.unary())
+            return ('neg', operand) if text == '-' else operand
+        return self.postfix()
+
+    def postfix(self):
+        node = self.primary()
+        while self.peek() == ('op', '%'):
+            self.pos += 1
+            node = ('pct', self.scalar(node))
+        return node
+
+    def primary(self):
+        if self.pos >= len(self.tokens):
+            raise UnsupportedFormula('Unexpected end of formula')
+        kind, text, match = self.take()
+        if kind == 'number':
+            return ('num', float(text))
+        if kind == 'string':
+            return ('str', text[1:-1].replace('""', '"'))
+        if kind == 'bool':
+            return ('bool', text.upper() == 'TRUE')
+        if kind == 'error':
+            return ('err', ExcelError(text.upper()))
+        if kind == 'ref':
+            return self.reference(match)
+        if kind == 'func':
+            return self.call(text)
+        if text == '(':
+            node = self.comparison()
+            self.expect(')')
+            return node
+        raise UnsupportedFormula(f'Unexpected "{text}"')
+
+    def call(self, name):
+        name = name.upper()
+        for prefix in ('_XLFN.', '_XLWS.'):
+            if name.startswith(prefix):
+                name = name[len(prefix):]
+        if name not in FUNCTIONS:
+            raise UnsupportedFormula(f'Unsupported function {name}')
+        self.expect('(')
+        args = []
+        if self.peek()[1] != ')':
+            while True:
+                # Omitted arguments, as in IF(A1,,1)
+                if self.peek()[1] in (',', ')'):
+                    args.append(('empty',))
+                else:
+                    args.append(self.comparison())
+                if self.peek()[1] != ',':
+                    break
+                self.pos += 1
+        self.expect(')')
+        range_positions = RANGE_ARGUMENTS.get(name, ())
+        for i, arg in enumerate(args):
+            if range_positions is not None and i not in range_positions:
+                self.scalar(arg)
+        return ('call', name, args)
+
+    def reference(self, match):
+        sheet = self.sheet
+        if match.group('sheet'):
+            name = match.group('sheet')
+            if name.startswith("'"):
+                name = name[1:-1].replace("''", "'")
+            sheet = self.sheet_lookup.get(name.lower())
+            if sheet is None:
+                raise UnsupportedFormula(f'Reference to unknown sheet {name}')
+
+        row1, col1 = _cell_part(match.group('a'))
+        if not match.group('b'):
+            return ('ref', sheet, row1, col1)
+        row2, col2 = _cell_part(match.group('b'))
+        if (row1 is None) != (row2 is None):
+            raise UnsupportedFormula(f'Unsupported range {match.group()}')
+        if row1 is None:
+            # Whole columns; None means "down to the last used row"
+            return ('range', sheet, 1, min(col1, col2), None, max(col1, col2))
+        return ('range', sheet, min(row1, row2), min(col1, col2), max(row1, row2), max(col1, col2))
+
+
+def parse_formula(formula, sheet, sheet_lookup):
+    """
+    Parse a formula into a syntax tree
+
+    Args:
+        formula: Formula text without the leading '='
+        sheet: Name of the sheet the formula is on (for unqualified references)
+        sheet_lookup: Dict of lowercase sheet name -> sheet name
+
+    Raises:
+        UnsupportedFormula: if the formula uses unsupported syntax or functions
+    """
+    return _Parser(formula, sheet, sheet_lookup).parse()
+
+
+def _references(node):
+    """Yield every 'ref' and 'range' node of a syntax tree"""
+    kind = node[0]
+    if kind in ('ref', 'range'):
+        yield node
+    elif kind == 'op':
+        yield from _references(node[2])
+        yield from _references(node[3])
+    elif kind in ('neg', 'pct'):
+        yield from _references(node[1])
+    elif kind == 'call':
+        for arg in node[2]:
+            yield from _references(arg)
+
+
+# ---------------------------------------------------------------------------
+# Value conversions (following Excel's coercion rules)
+# ---------------------------------------------------------------------------
+
+def _general(number):
+    """Format a number like Excel's General format does in text contexts"""
+    if number.is_integer() and abs(number) < 1e15:
+        return str(int(number))
+    return format(number, '.15g').upper()
+
+
+def _to_number(value):
+    """Coerce a value to float, returning an ExcelError if that's impossible"""
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return float(value)
+    if isinstance(value, (float, ExcelError)):
+        return value
+    try:
+        number = float(value.strip())
+    except ValueError:
+        return VALUE
+    return number if math.isfinite(number) else VALUE
+
+
+def _to_text(value):
+    if value is None:
+        return ''
+    if isinstance(value, bool):
+        return 'TRUE' if value else 'FALSE'
+    if isinstance(value, float):
+        return _general(value)
+    return value
+
+
+def _type_rank(value):
+    # Excel orders numbers < text < booleans
+    if isinstance(value, bool):
+        return 2
+    if isinstance(value, str):
+        return 1
+    return 0
+
+
+def _compare(a, b):
+    """Compare two values the way Excel's comparison operators do; returns -1, 0 or 1"""
+    if a is None:
+        a = '' if isinstance(b, str) else False if isinstance(b, bool) else 0.0
+    if b is None:
+        b = '' if isinstance(a, str) else False if isinstance(a, bool) else 0.0
+    rank_a, rank_b = _type_rank(a), _type_rank(b)
+    if rank_a != rank_b:
+        return (rank_a > rank_b) - (rank_a < rank_b)
+    if isinstance(a, str):
+        a, b = a.lower(), b.lower()
+    return (a > b) - (a < b)
+
+
+def _value(arg):
+    """The single value of a function argument (one-cell ranges are unwrapped)"""
+    if isinstance(arg, Range):
+        if len(arg.rows) == 1 and len(arg.rows[0]) == 1:
+            return arg.rows[0][0]
+        raise _Propagate(VALUE)
+    return arg
+
+
+def _num(arg):
+    number = _to_number(_value(arg))
+    if isinstance(number, ExcelError):
+        raise _Propagate(number)
+    return number
+
+
+def _int(arg):
+    return int(_num(arg))
+
+
+def _text(arg):
+    value = _value(arg)
+    if isinstance(value, ExcelError):
+        raise _Propagate(value)
+    return _to_text(value)
+
+
+def _bool(arg):
+    value = _value(arg)
+    if isinstance(value, ExcelError):
+        raise _Propagate(value)
+    if isinstance(value, str):
+        if value.upper() in ('TRUE', 'FALSE'):
+            return value.upper() == 'TRUE'
+        raise _Propagate(VALUE)
+    return bool(value)
+
+
+def _numbers(args):
+    """
+    Yield the numbers in function arguments, like SUM sees them
+
+    Inside ranges, text, booleans and blanks are skipped; arguments given directly
+    are coerced to numbers. Errors anywhere are propagated.
+    """
+    for arg in args:
+        if isinstance(arg, Range):
+            for value in arg.values():
+                if isinstance(value, ExcelError):
+                    raise _Propagate(value)
+                if isinstance(value, float):
+                    yield value
+        elif arg is not None:
+            yield _num(arg)
+
+
+# ---------------------------------------------------------------------------
+# Functions
+# ---------------------------------------------------------------------------
+
+def _fn_sum(*args):
+    return math.fsum(_numbers(args))
+
+
+def _fn_average(*args):
+    numbers = list(_numbers(args))
+    if not numbers:
+        raise _Propagate(DIV0)
+    return math.fsum(numbers) / len(numbers)
+
+
+def _fn_min(*args):
+    return min(_numbers(args), default=0.0)
+
+
+def _fn_max(*args):
+    return max(_numbers(args), default=0.0)
+
+
+def _fn_product(*args):
+    return math.prod(_numbers(args))
+
+
+def _fn_count(*args):
+    count = 0
+    for arg in args:
+        if isinstance(arg, Range):
+            count += sum(1 for v in arg.values() if isinstance(v, float))
+        elif arg is not None and not isinstance(_to_number(arg), ExcelError):
+            count += 1
+    return float(count)
+
+
+def _fn_counta(*args):
+    count = 0
+    for arg in args:
+        if isinstance(arg, Range):
+            count += sum(1 for v in arg.values() if v is not None)
+        elif arg is not None:
+            count += 1
+    return float(count)
+
+
+def _fn_sumproduct(*args):
+    arrays = [arg.rows if isinstance(arg, Range) else [[arg]] for arg in args]
+    shape = (len(arrays[0]), len(arrays[0][0]))
+    if any((len(a), len(a[0])) != shape for a in arrays):
+        raise _Propagate(VALUE)
+    total = 0.0
+    for r in range(shape[0]):
+        for c in range(shape[1]):
+            product = 1.0
+            for array in arrays:
+                value = array[r][c]
+                if isinstance(value, ExcelError):
+                    raise _Propagate(value)
+                product *= value if isinstance(value, float) else 0.0
+            total += product
+    return total
+
+
+def _fn_if(condition, if_true=True, if_false=False):
+    result = if_true if _bool(condition) else if_false
+    return 0.0 if result is None else result
+
+
+def _fn_iferror(value, value_if_error):
+    value = _value(value)
+    return _value(value_if_error) if isinstance(value, ExcelError) else value
+
+
+def _logical_values(args):
+    for arg in args:
+        if isinstance(arg, Range):
+            for value in arg.values():
+                if isinstance(value, ExcelError):
+                    raise _Propagate(value)
+                if isinstance(value, (bool, float)):
+                    yield bool(value)
+        elif arg is not None:
+            yield _bool(arg)
+
+
+def _fn_and(*args):
+    values = list(_logical_values(args))
+    if not values:
+        raise _Propagate(VALUE)
+    return all(values)
+
+
+def _fn_or(*args):
+    values = list(_logical_values(args))
+    if not values:
+        raise _Propagate(VALUE)
+    return any(values)
+
+
+def _fn_not(value):
+    return not _bool(value)
+
+
+def _round(number, digits, rounding):
+    quantum = Decimal(1).scaleb(-int(digits))
+    return float(Decimal(repr(number)).quantize(quantum, rounding=rounding))
+
+
+def _fn_round(number, digits=0.0):
+    # Excel rounds halves away from zero
+    return _round(_num(number), _num(digits), ROUND_HALF_UP)
+
+
+def _fn_roundup(number, digits=0.0):
+    return _round(_num(number), _num(digits), ROUND_UP)
+
+
+def _fn_rounddown(number, digits=0.0):
+    return _round(_num(number), _num(digits), ROUND_DOWN)
+
+
+def _fn_int(number):
+    return float(math.floor(_num(number)))
+
+
+def _fn_abs(number):
+    return abs(_num(number))
+
+
+def _fn_mod(number, divisor):
+    number, divisor = _num(number), _num(divisor)
+    if divisor == 0:
+        raise _Propagate(DIV0)
+    return number - divisor * math.floor(number / divisor)
+
+
+def _fn_power(number, power):
+    return _power(_num(number), _num(power))
+
+
+def _fn_sqrt(number):
+    number = _num(number)
+    if number < 0:
+        raise _Propagate(NUM)
+    return math.sqrt(number)
+
+
+def _fn_concatenate(*args):
+    return ''.join(_text(arg) for arg in args)
+
+
+def _fn_concat(*args):
+    parts = []
+    for arg in args:
+        values = arg.values() if isinstance(arg, Range) else [arg]
+        for value in values:
+            if isinstance(value, ExcelError):
+                raise _Propagate(value)
+            parts.append(_to_text(value))
+    return ''.join(parts)
+
+
+def _fn_len(text):
+    return float(len(_text(text)))
+
+
+def _fn_upper(text):
+    return _text(text).upper()
+
+
+def _fn_lower(text):
+    return _text(text).lower()
+
+
+def _fn_trim(text):
+    # Excel only trims and collapses spaces, not other whitespace
+    return re.sub(' +', ' ', _text(text).strip(' '))
+
+
+def _fn_left(text, count=1.0):
+    count = _int(count)
+    if count < 0:
+        raise _Propagate(VALUE)
+    return _text(text)[:count]
+
+
+def _fn_right(text, count=1.0):
+    count = _int(count)
+    if count < 0:
+        raise _Propagate(VALUE)
+    return _text(text)[-count:] if count else ''
+
+
+def _fn_mid(text, start, count):
+    start, count = _int(start), _int(count)
+    if start < 1 or count < 0:
+        raise _Propagate(VALUE)
+    return _text(text)[start - 1:start - 1 + count]
+
+
+def _fn_isblank(value):
+    return _value(value) is None
+
+
+def _fn_isnumber(value):
+    value = _value(value)
+    return isinstance(value, float)
+
+
+def _fn_istext(value):
+    return isinstance(_value(value), str)
+
+
+def _fn_iserror(value):
+    return isinstance(_value(value), ExcelError)
+
+
+def _fn_na():
+    return NA
+
+
+def _criteria_matcher(criteria):
+    """Return a predicate implementing SUMIF/COUNTIF criteria like ">5", "<>x" or "a*" """
+    criteria = _value(criteria)
+    if isinstance(criteria, ExcelError):
+        raise _Propagate(criteria)
+    op, operand = '=', criteria
+    if isinstance(criteria, str):
+        match = re.match(r'(<=|>=|<>|<|>|=)?(.*)$', criteria, re.DOTALL)
+        op, operand = match.group(1) or '=', match.group(2)
+        number = _to_number(operand) if operand.strip() else VALUE
+        if not isinstance(number, ExcelError):
+            operand = number
+        elif operand.upper() in ('TRUE', 'FALSE'):
+            operand = operand.upper() == 'TRUE'
+    elif criteria is None:
+        operand = 0.0
+
+    if isinstance(operand, str):
+        if op in ('=', '<>'):
+            if operand == '':
+                # "=" matches blank cells, "<>" matches non-blank ones
+                return (lambda v: v is None or v == '') if op == '=' else (lambda v: v is not None and v != '')
+            pattern = re.compile(
+                ''.join('.*' if ch == '*' else '.' if ch == '?' else re.escape(ch) for ch in operand),
+                re.IGNORECASE | re.DOTALL,
+            )
+            matches = lambda v: isinstance(v, str) and pattern.fullmatch(v) is not None
+            return matches if op == '=' else (lambda v: not matches(v))
+
+    def compare(value):
+        if op == '<>':
+            return value is None or _type_rank(value) != _type_rank(operand) or _compare(value, operand) != 0
+        if value is None or isinstance(value, ExcelError) or _type_rank(value) != _type_rank(operand):
+            return False
+        result = _compare(value, operand)
+        return {'=': result == 0, '<': result < 0, '>': result > 0,
+                '<=': result <= 0, '>=': result >= 0}[op]
+    return compare
+
+
+def _conditional_values(criteria_range, criteria, values_range):
+    if not isinstance(criteria_range, Range):
+        raise _Propagate(VALUE)
+    values_range = criteria_range if values_range is None else values_range
+    if not isinstance(values_range, Range):
+        raise _Propagate(VALUE)
+    matches = _criteria_matcher(criteria)
+    for r, row in enumerate(criteria_range.rows):
+        for c, value in enumerate(row):
+            if matches(value):
+                if r < len(values_range.rows) and c < len(values_range.rows[r]):
+                    yield values_range.rows[r][c]
+                else:
+                    yield None
+
+
+def _fn_sumif(criteria_range, criteria, sum_range=None):
+    return math.fsum(_numbers([Range([list(_conditional_values(criteria_range, criteria, sum_range))])]))
+
+
+def _fn_averageif(criteria_range, criteria, average_range=None):
+    return _fn_average(Range([list(_conditional_values(criteria_range, criteria, average_range))]))
+
+
+def _fn_countif(criteria_range, criteria):
+    return float(sum(1 for _ in _conditional_values(criteria_range, criteria, None)))
+
+
+def _lookup_position(lookup, values, match_type):
+    """0-based position of lookup in values for MATCH-style match types, or None"""
+    if isinstance(lookup, ExcelError):
+        raise _Propagate(lookup)
+    if match_type == 0:
+        if isinstance(lookup, str) and any(ch in lookup for ch in '*?~'):
+            raise UnsupportedFormula(f'Wildcard lookup value {lookup!r}')
+        for i, value in enumerate(values):
+            if value is not None and _type_rank(value) == _type_rank(lookup) and _compare(value, lookup) == 0:
+                return i
+        return None
+    # Approximate match on sorted data: the last value <= lookup (or >= for -1),
+    # so the last of several equal values wins
+    found = None
+    for i, value in enumerate(values):
+        if value is None or _type_rank(value) != _type_rank(lookup):
+            continue
+        result = _compare(value, lookup)
+        if (result <= 0) if match_type > 0 else (result >= 0):
+            found = i
+        else:
+            break
+    return found
+
+
+def _fn_match(lookup, lookup_range, match_type=1.0):
+    if not isinstance(lookup_range, Range):
+        raise _Propagate(NA)
+    rows = lookup_range.rows
+    if len(rows) == 1:
+        values = rows[0]
+    elif all(len(row) == 1 for row in rows):
+        values = [row[0] for row in rows]
+    else:
+        raise _Propagate(NA)
+    match_type = _num(match_type)
+    position = _lookup_position(_value(lookup), values, 0 if match_type == 0 else (1 if match_type > 0 else -1))
+    if position is None:
+        raise _Propagate(NA)
+    return float(position + 1)
+
+
+def _fn_vlookup(lookup, table, column, approximate=True):
+    if not isinstance(table, Range):
+        raise _Propagate(VALUE)
+    column = _int(column)
+    if column < 1:
+        raise _Propagate(VALUE)
+    if column > len(table.rows[0]):
+        raise _Propagate(REF)
+    match_type = 1 if approximate is None or _bool(approximate) else 0
+    position = _lookup_position(_value(lookup), [row[0] for row in table.rows], match_type)
+    if position is None:
+        raise _Propagate(NA)
+    value = table.rows[position][column - 1]
+    return 0.0 if value is None else value
+
+
+def _fn_index(array, row, column=None):
+    rows = array.rows if isinstance(array, Range) else [[array]]
+    row = _int(row)
+    column = 0 if column is None else _int(column)
+    if column == 0 and len(rows) == 1:
+        # INDEX(A1:E1, 3) counts along the only row
+        row, column = 1, row
+    elif column == 0 and all(len(r) == 1 for r in rows):
+        column = 1
+    if row < 1 or column < 1:
+        # Whole rows/columns would be arrays, which aren't supported
+        raise _Propagate(VALUE)
+    if row > len(rows) or column > len(rows[0]):
+        raise _Propagate(REF)
+    value = rows[row - 1][column - 1]
+    return 0.0 if value is None else value
+
+
+FUNCTIONS = {
+    'ABS': _fn_abs,
+    'AND': _fn_and,
+    'AVERAGE': _fn_average,
+    'AVERAGEIF': _fn_averageif,
+    'CONCAT': _fn_concat,
+    'CONCATENATE': _fn_concatenate,
+    'COUNT': _fn_count,
+    'COUNTA': _fn_counta,
+    'COUNTIF': _fn_countif,
+    'IF': _fn_if,
+    'IFERROR': _fn_iferror,
+    'INDEX': _fn_index,
+    'INT': _fn_int,
+    'ISBLANK': _fn_isblank,
+    'ISERROR': _fn_iserror,
+    'ISNUMBER': _fn_isnumber,
+    'ISTEXT': _fn_istext,
+    'LEFT': _fn_left,
+    'LEN': _fn_len,
+    'LOWER': _fn_lower,
+    'MATCH': _fn_match,
+    'MAX': _fn_max,
+    'MID': _fn_mid,
+    'MIN': _fn_min,
+    'MOD': _fn_mod,
+    'NA': _fn_na,
+    'NOT': _fn_not,
+    'OR': _fn_or,
+    'POWER': _fn_power,
+    'PRODUCT': _fn_product,
+    'RIGHT': _fn_right,
+    'ROUND': _fn_round,
+    'ROUNDDOWN': _fn_rounddown,
+    'ROUNDUP': _fn_roundup,
+    'SQRT': _fn_sqrt,
+    'SUM': _fn_sum,
+    'SUMIF': _fn_sumif,
+    'SUMPRODUCT': _fn_sumproduct,
+    'TRIM': _fn_trim,
+    'UPPER': _fn_upper,
+    'VLOOKUP': _fn_vlookup,
+}
+
+
+# Argument positions that take ranges (None: all of them); every other
+# argument of every function must be a single value
+RANGE_ARGUMENTS = {
+    'AND': None,
+    'AVERAGE': None,
+    'AVERAGEIF': (0, 2),
+    'CONCAT': None,
+    'COUNT': None,
+    'COUNTA': None,
+    'COUNTIF': (0,),
+    'INDEX': (0,),
+    'MATCH': (1,),
+    'MAX': None,
+    'MIN': None,
+    'OR': None,
+    'PRODUCT': None,
+    'SUM': None,
+    'SUMIF': (0, 2),
+    'SUMPRODUCT': None,
+    'VLOOKUP': (1,),
+}
+
+
+def _power(base, exponent):
+    if base == 0 and exponent < 0:
+        raise _Propagate(DIV0)
+    try:
+        result = base ** exponent
+    except (OverflowError, ZeroDivisionError):
+        raise _Propagate(NUM)
+    if isinstance(result, complex) or not math.isfinite(result):
+        raise _Propagate(NUM)
+    return result
+
+
+def _binary(op, a, b):
+    """Apply an operator to two scalar values"""
+    if isinstance(a, ExcelError):
+        return a
+    if isinstance(b, ExcelError):
+        return b
+    if op == '&':
+        return _to_text(a) + _to_text(b)
+    if op in COMPARISON_OPS:
+        result = _compare(a, b)
+        return {'=': result == 0, '<>': result != 0, '<': result < 0,
+                '>': result > 0, '<=': result <= 0, '>=': result >= 0}[op]
+    x, y = _to_number(a), _to_number(b)
+    if isinstance(x, ExcelError):
+        return x
+    if isinstance(y, ExcelError):
+        return y
+    if op == '+':
+        return x + y
+    if op == '-':
+        return x - y
+    if op == '*':
+        return x * y
+    if op == '/':
+        return DIV0 if y == 0 else x / y
+    try:
+        return _power(x, y)
+    except _Propagate as e:
+        return e.error
+
+
+# ---------------------------------------------------------------------------
+# Workbook engine
+# ---------------------------------------------------------------------------
+
+def _read_shared_strings(zf):
+    if 'xl/sharedStrings.xml' not in zf.NameToInfo:
+        return []
+    strings = []
+    with zf.open('xl/sharedStrings.xml') as f:
+        for _, element in ET.iterparse(f):
+            if _local_name(element.tag) == 'si':
+                # Rich text has several <r><t> runs; phonetic hints (<rPh>) are not part of the text
+                parts = []
+                for child in element:
+                    name = _local_name(child.tag)
+                    if name == 't':
+                        parts.append(child.text or '')
+                    elif name == 'r':
+                        parts.extend(t.text or '' for t in child if _local_name(t.tag) == 't')
+                strings.append(''.join(parts))
+                element.clear()
+    return strings
+
+
+def _number_text(number):
+    if number.is_integer() and abs(number) < 1e15:
+        return str(int(number))
+    return repr(number)
+
+
+def split_cell_reference(reference):
+    """
+    Split a reference like "Sheet1!B2" or "'My Sheet'!B2" into (sheet, row, column)
+    """
+    sheet, sep, cell = reference.rpartition('!')
+    if not sep:
+        raise ValueError(f'Cell reference must include the sheet name, got {reference!r}')
+    if sheet.startswith("'") and sheet.endswith("'"):
+        sheet = sheet[1:-1].replace("''", "'")
+    match = CELL_PART_RE.match(cell)
+    if not match or not match.group(4):
+        raise ValueError(f'Invalid cell reference {reference!r}')
+    row, col = _cell_part(cell)
+    return sheet, row, col
+
+
+class FormulaEngine:
+    """
+    Formula values and dependency graph of one workbook
+
+    Example:
+        engine = FormulaEngine('model.xlsx')
+        engine.set_value('Inputs!B2', 0.05)
+        engine.recalculate()            # only cells that depend on Inputs!B2
+        engine.save()
+    """
+
+    def __init__(self, filename):
+        self.filename = str(filename)
+        self.values = {}              # (sheet, row, col) -> float, str, bool, ExcelError or None
+        self.formulas = {}            # (sheet, row, col) -> syntax tree
+        self.unsupported = {}         # (sheet, row, col) -> reason the engine can't evaluate it
+        self.max_row = defaultdict(int)
+        self._ref_dependents = defaultdict(set)
+        self._range_index = defaultdict(list)   # (sheet, col) -> [(first row, last row, formula)]
+        self._order = []
+        self._position = {}
+        self._needs_full = False      # set when some formula has no cached value
+        self._dirty = set()
+        self._computed = set()
+        self._changed_inputs = set()
+        self._load()
+        if not self.unsupported:
+            self._build_graph()
+
+    def _load(self):
+        formula_text = {}
+        shared_masters = {}
+        shared_followers = []
+
+        with zipfile.ZipFile(self.filename) as zf:
+            shared_strings = _read_shared_strings(zf)
+            self.sheet_parts = get_sheet_parts(zf)
+            for sheet, part in self.sheet_parts:
+                with zf.open(part) as f:
+                    self._load_sheet(f, sheet, shared_strings, formula_text, shared_masters, shared_followers)
+
+        self.sheet_lookup = {sheet.lower(): sheet for sheet, _ in self.sheet_parts}
+
+        for key, si in shared_followers:
+            master = shared_masters.get((key[0], si))
+            if master is None:
+                self.unsupported[key] = 'Shared formula without a master cell'
+                continue
+            text, master_row, master_col = master
+            try:
+                formula_text[key] = translate_formula(text, key[1] - master_row, key[2] - master_col)
+            except UnsupportedFormula as e:
+                self.unsupported[key] = str(e)
+
+        for key, text in formula_text.items():
+            try:
+                self.formulas[key] = parse_formula(text, key[0], self.sheet_lookup)
+            except UnsupportedFormula as e:
+                self.unsupported[key] = str(e)
+
+    def _load_sheet(self, f, sheet, shared_strings, formula_text, shared_masters, shared_followers):
+        sheet_data = None
+        row = 0
+        col = 0
+        for event, element in ET.iterparse(f, events=('start', 'end')):
+            name = _local_name(element.tag)
+            if event == 'start':
+                if name == 'sheetData':
+                    sheet_data = element
+                elif name == 'row':
+                    row = int(element.get('r') or row + 1)
+                    col = 0
+                continue
+
+            if name == 'row' and sheet_data is not None:
+                sheet_data.clear()
+            if name != 'c':
+                continue
+
+            ref = element.get('r')
+            col = _column_index(ref.rstrip('0123456789')) if ref else col + 1
+            key = (sheet, row, col)
+            cell_type = element.get('t', 'n')
+            formula = None
+            value = None
+            for child in element:
+                child_name = _local_name(child.tag)
+                if child_name == 'f':
+                    formula = child
+                elif child_name == 'v':
+                    value = child.text
+                elif child_name == 'is':
+                    value = ''.join(t.text or '' for t in child.iter() if _local_name(t.tag) == 't')
+
+            if value is None:
+                self.values[key] = None
+            elif cell_type == 's':
+                self.values[key] = shared_strings[int(value)]
+            elif cell_type == 'b':
+                self.values[key] = value == '1'
+            elif cell_type == 'e':
+                self.values[key] = ExcelError(value)
+            elif cell_type in ('str', 'inlineStr', 'd'):
+                self.values[key] = value
+            else:
+                self.values[key] = float(value)
+            self.max_row[sheet] = max(self.max_row[sheet], row)
+
+            if formula is not None:
+                if value is None:
+                    self._needs_full = True
+                formula_type = formula.get('t', 'normal')
+                if formula_type == 'shared':
+                    if formula.text:
+                        shared_masters[(sheet, formula.get('si'))] = (formula.text, row, col)
+                        formula_text[key] = formula.text
+                    else:
+                        shared_followers.append((key, formula.get('si')))
+                elif formula_type == 'normal' and formula.text:
+                    formula_text[key] = formula.text
+                else:
+                    self.unsupported[key] = f'Unsupported {formula_type} formula'
+
+    def _build_graph(self):
+        for key, tree in self.formulas.items():
+            for node in _references(tree):
+                if node[0] == 'ref':
+                    self._ref_dependents[(node[1], node[2], node[3])].add(key)
+                else:
+                    _, sheet, row1, col1, row2, col2 = node
+                    for col in range(col1, col2 + 1):
+                        self._range_index[(sheet, col)].append((row1, row2, key))
+
+        # Topological order (Kahn's algorithm); whatever is left over is on a cycle
+        indegree = dict.fromkeys(self.formulas, 0)
+        successors = {}
+        for key in self.formulas:
+            successors[key] = self._dependents(key)
+            for successor in successors[key]:
+                indegree[successor] += 1
+        ready = deque(key for key, degree in indegree.items() if degree == 0)
+        while ready:
+            key = ready.popleft()
+            self._position[key] = len(self._order)
+            self._order.append(key)
+            for successor in successors[key]:
+                indegree[successor] -= 1
+                if indegree[successor] == 0:
+                    ready.append(successor)
+        for key, degree in indegree.items():
+            if degree > 0:
+                self.unsupported[key] = 'Circular reference'
+
+    def _dependents(self, key):
+        """Formula cells that refer directly to the cell at key"""
+        sheet, row, col = key
+        found = set(self._ref_dependents.get(key, ()))
+        for first_row, last_row, dependent in self._range_index.get((sheet, col), ()):
+            if first_row <= row and (last_row is None or row <= last_row):
+                found.add(dependent)
+        return found
+
+    def get_value(self, reference):
+        """Current value of a cell such as "Sheet1!B2" (None for blank cells)"""
+        sheet, row, col = split_cell_reference(reference)
+        return self.values.get((self.sheet_lookup.get(sheet.lower(), sheet), row, col))
+
+    def set_value(self, reference, value):
+        """
+        Change an input cell; its dependents are recomputed by the next recalculate()
+
+        Args:
+            reference: Cell such as "Sheet1!B2"
+            value: Number, string, bool, or None to clear the cell
+        """
+        sheet, row, col = split_cell_reference(reference)
+        if sheet.lower() not in self.sheet_lookup:
+            raise ValueError(f'Unknown sheet in {reference!r}')
+        key = (self.sheet_lookup[sheet.lower()], row, col)
+        if key in self.formulas or key in self.unsupported:
+            raise ValueError(f'{reference} contains a formula')
+        if isinstance(value, int) and not isinstance(value, bool):
+            value = float(value)
+        self.values[key] = value
+        self.max_row[key[0]] = max(self.max_row[key[0]], row)
+        self._changed_inputs.add(key)
+        self._dirty.add(key)
+
+    def recalculate(self, full=False):
+        """
+        Evaluate formulas whose inputs changed since the workbook was loaded or last recalculated
+
+        All formulas are evaluated if full is True or if the file has formulas without
+        cached values (for example, after being written by openpyxl).
+
+        Returns:
+            list of recalculated (sheet, row, col) keys in evaluation order
+
+        Raises:
+            UnsupportedFormula: if the workbook uses anything the engine can't evaluate
+        """
+        if self.unsupported:
+            (sheet, row, col), reason = next(iter(self.unsupported.items()))
+            raise UnsupportedFormula(
+                f"{sheet}!{_column_letter(col)}{row}: {reason}"
+                + (f" (and {len(self.unsupported) - 1} more)" if len(self.unsupported) > 1 else '')
+            )
+
+        if full or self._needs_full:
+            targets = self._order
+        else:
+            affected = set()
+            stack = list(self._dirty)
+            while stack:
+                for dependent in self._dependents(stack.pop()):
+                    if dependent not in affected:
+                        affected.add(dependent)
+                        stack.append(dependent)
+            targets = sorted(affected, key=self._position.__getitem__)
+
+        for key in targets:
+            try:
+                self.values[key] = self._evaluate(key)
+            except UnsupportedFormula as e:
+                sheet, row, col = key
+                raise UnsupportedFormula(f"{sheet}!{_column_letter(col)}{row}: {e}") from None
+        self._computed.update(targets)
+        self._dirty.clear()
+        self._needs_full = False
+        return list(targets)
+
+    def _evaluate(self, key):
+        try:
+            result = self._eval(self.formulas[key])
+            result = _value(result)
+        except _Propagate as e:
+            result = e.error
+        if result is None:
+            return 0.0
+        if isinstance(result, float) and not math.isfinite(result):
+            return NUM
+        return result
+
+    def _eval(self, node):
+        kind = node[0]
+        if kind in ('num', 'str', 'bool', 'err'):
+            return node[1]
+        if kind == 'empty':
+            return None
+        if kind == 'ref':
+            return Range([[self.values.get(node[1:])]])
+        if kind == 'range':
+            _, sheet, row1, col1, row2, col2 = node
+            if row2 is None:
+                row2 = max(self.max_row[sheet], row1)
+            values = self.values
+            return Range([
+                [values.get((sheet, row, col)) for col in range(col1, col2 + 1)]
+                for row in range(row1, row2 + 1)
+            ])
+        if kind == 'call':
+            args = [self._eval(arg) for arg in node[2]]
+            try:
+                return FUNCTIONS[node[1]](*args)
+            except _Propagate as e:
+                return e.error
+            except TypeError:
+                # Wrong number of arguments
+                return VALUE
+
+        try:
+            if kind == 'op':
+                return _binary(node[1], _value(self._eval(node[2])), _value(self._eval(node[3])))
+            operand = _to_number(_value(self._eval(node[1])))
+        except _Propagate as e:
+            return e.error
+        if isinstance(operand, ExcelError):
+            return operand
+        return -operand if kind == 'neg' else operand / 100
+
+    def save(self, filename=None):
+        """
+        Write recalculated values and changed inputs to the workbook
+
+        Args:
+            filename: Output path (default: overwrite the loaded file)
+        """
+        target = str(filename or self.filename)
+        updates = defaultdict(dict)
+        for key in self._computed | self._changed_inputs:
+            updates[key[0]][(key[1], key[2])] = (self.values.get(key), key in self.formulas)
+
+        parts = dict(self.sheet_parts)
+        fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(os.path.abspath(target)), suffix='.xlsx')
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(self.filename) as src, zipfile.ZipFile(temp_path, 'w') as dst:
+                changed_parts = {parts[sheet]: cells for sheet, cells in updates.items()}
+                for info in src.infolist():
+                    data = src.read(info.filename)
+                    if info.filename in changed_parts:
+                        data = _update_sheet_xml(data, changed_parts[info.filename])
+                    dst.writestr(info, data)
+            os.replace(temp_path, target)
+        except BaseException:
+            os.unlink(temp_path)
+            raise
+
+        self.filename = target
+        self._computed.clear()
+        self._changed_inputs.clear()
+
+
+def _child_elements(node, name):
+    return [c for c in node.childNodes if c.nodeType == c.ELEMENT_NODE and c.localName == name]
+
+
+def _update_sheet_xml(data, cells):
+    """
+    Return sheet XML with new cached values
+
+    Args:
+        data: Sheet XML bytes
+        cells: Dict of (row, col) -> (value, is_formula)
+    """
+    dom = xml.dom.minidom.parseString(data)
+    sheet_data = dom.getElementsByTagNameNS('*', 'sheetData')[0]
+
+    def create(name):
+        prefix = sheet_data.prefix
+        return dom.createElementNS(sheet_data.namespaceURI, f'{prefix}:{name}' if prefix else name)
+
+    rows = {}
+    row_number = 0
+    for row_element in _child_elements(sheet_data, 'row'):
+        row_number = int(row_element.getAttribute('r') or row_number + 1)
+        rows[row_number] = row_element
+
+    for (row, col), (value, is_formula) in sorted(cells.items()):
+        if row not in rows:
+            # New input cell on a row without any cells yet
+            row_element = create('row')
+            row_element.setAttribute('r', str(row))
+            following = [element for number, element in rows.items() if number > row]
+            sheet_data.insertBefore(row_element, min(following, key=lambda e: int(e.getAttribute('r'))) if following else None)
+            rows[row] = row_element
+        row_element = rows[row]
+
+        cell = None
+        following = None
+        position = 0
+        for candidate in _child_elements(row_element, 'c'):
+            ref = candidate.getAttribute('r')
+            position = _column_index(ref.rstrip('0123456789')) if ref else position + 1
+            if position == col:
+                cell = candidate
+                break
+            if position > col:
+                following = candidate
+                break
+        if cell is None:
+            cell = create('c')
+            cell.setAttribute('r', f'{_column_letter(col)}{row}')
+            row_element.insertBefore(cell, following)
+            if row_element.hasAttribute('spans'):
+                # Optional hint that may no longer be accurate
+                row_element.removeAttribute('spans')
+
+        _set_cell_value(dom, cell, value, is_formula, create)
+
+    return dom.toxml(encoding='UTF-8')
+
+
+def _set_cell_value(dom, cell, value, is_formula, create):
+    for child in list(cell.childNodes):
+        if child.nodeType == child.ELEMENT_NODE and child.localName in ('v', 'is'):
+            cell.removeChild(child)
+    if cell.hasAttribute('t'):
+        cell.removeAttribute('t')
+    if value is None:
+        return
+
+    if isinstance(value, str) and not is_formula:
+        cell.setAttribute('t', 'inlineStr')
+        inline = create('is')
+        text = create('t')
+        if value != value.strip():
+            text.setAttribute('xml:space', 'preserve')
+        text.appendChild(dom.createTextNode(value))
+        inline.appendChild(text)
+        cell.appendChild(inline)
+        return
+
+    if isinstance(value, str):
+        cell_type, text = 'str', value
+    elif isinstance(value, bool):
+        cell_type, text = 'b', '1' if value else '0'
+    elif isinstance(value, ExcelError):
+        cell_type, text = 'e', value.code
+    else:
+        cell_type, text = None, _number_text(value)
+    if cell_type:
+        cell.setAttribute('t', cell_type)
+    v = create('v')
+    v.appendChild(dom.createTextNode(text))
+    cell.appendChild(v)
+
+
+def recalculate_workbook(filename, changes=None, output=None, full=False, timeout=30):
+    """
+    Recalculate an Excel file with the Python engine, falling back to LibreOffice
+
+    Args:
+        filename: Path to Excel file
+        changes: Optional dict of input cell ("Sheet1!B2") -> new value
+        output: Output path (default: overwrite filename)
+        full: If True, evaluate every formula instead of only those affected by changes
+        timeout: Maximum time for the LibreOffice fallback (seconds)
+
+    Returns:
+        dict with the same keys as recalc.recalc(), plus 'engine' ("python" or
+        "libreoffice"), and 'recalculated_cells' or 'fallback_reason'
+    """
+    if not Path(filename).exists():
+        return {'error': f'File {filename} does not exist'}
+    target = str(output or filename)
+
+    try:
+        engine = FormulaEngine(filename)
+        for reference, value in (changes or {}).items():
+            engine.set_value(reference, value)
+        recalculated = engine.recalculate(full=full)
+    except UnsupportedFormula as e:
+        # Inputs still need to be written for LibreOffice to see them
+        if changes:
+            engine.save(target)
+        elif target != str(filename):
+            shutil.copyfile(filename, target)
+        result = recalc(target, timeout)
+        result['engine'] = 'libreoffice'
+        result['fallback_reason'] = str(e)
+        return result
+    except (ValueError, KeyError, zipfile.BadZipFile, ET.ParseError) as e:
+        return {'error': str(e)}
+
+    engine.save(target)
+    result = check_workbook(target)
+    result['engine'] = 'python'
+    result['recalculated_cells'] = len(recalculated)
+    return result
+
+
+def _parse_cli_value(text):
+    if text.upper() in ('TRUE', 'FALSE'):
+        return text.upper() == 'TRUE'
+    if text == '':
+        return None
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Recalculate formulas without LibreOffice (falls back to recalc.py when needed)'
+    )
+    parser.add_argument('excel_file', help='Excel file to recalculate')
+    parser.add_argument('--set', action='append', default=[], metavar='CELL=VALUE',
+                        help='Change an input cell first, e.g. --set Inputs!B2=0.05 (repeatable)')
+    parser.add_argument('--output', help='Write the result here instead of overwriting the input')
+    parser.add_argument('--full', action='store_true', help='Evaluate every formula')
+    parser.add_argument('--timeout', type=int, default=30, help='Timeout for the LibreOffice fallback (seconds)')
+    args = parser.parse_args()
+
+    changes = {}
+    for assignment in args.set:
+        reference, sep, value = assignment.partition('=')
+        if not sep:
+            parser.error(f'--set expects CELL=VALUE, got {assignment!r}')
+        changes[reference] = _parse_cli_value(value)
+
+    result = recalculate_workbook(args.excel_file, changes, args.output, args.full, args.timeout)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
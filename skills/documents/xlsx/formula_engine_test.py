@@ -0,0 +1,85 @@
+import os
+import tempfile
+import unittest
+
+from openpyxl import Workbook
+
+from formula_engine import FormulaEngine, UnsupportedFormula
+
+
+# Currently this is not run automatically in CI; it's just for documentation and manual checking.
+class TestFormulaEngine(unittest.TestCase):
+
+    def setUp(self):
+        fd, self.path = tempfile.mkstemp(suffix='.xlsx')
+        os.close(fd)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def create_engine(self, formulas):
+        """Helper to load a workbook with A1:B4 = (1, 10), (2, 20), (2, 30), (3, 40)"""
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'Sheet1'
+        for row, (key, value) in enumerate([(1, 10), (2, 20), (2, 30), (3, 40)], 1):
+            ws.cell(row, 1, key)
+            ws.cell(row, 2, value)
+        for cell, formula in formulas.items():
+            ws[cell] = formula
+        wb.save(self.path)
+        return FormulaEngine(self.path)
+
+    def test_supported_range_arguments(self):
+        """Ranges where functions take ranges are evaluated"""
+        engine = self.create_engine({
+            'D1': '=SUM(A1:A4)',
+            'D2': '=SUMPRODUCT(A1:A4,B1:B4)',
+            'D3': '=SUMIF(A1:A4,2,B1:B4)',
+            'D4': '=INDEX(B1:B4,MATCH(3,A1:A4,0))',
+        })
+        engine.recalculate()
+        self.assertEqual(engine.get_value('Sheet1!D1'), 8.0)
+        self.assertEqual(engine.get_value('Sheet1!D2'), 230.0)
+        self.assertEqual(engine.get_value('Sheet1!D3'), 50.0)
+        self.assertEqual(engine.get_value('Sheet1!D4'), 40.0)
+
+    def test_range_operand_is_unsupported(self):
+        """Array arithmetic on ranges goes to LibreOffice instead of giving #VALUE!"""
+        engine = self.create_engine({'D1': '=SUMPRODUCT((A1:A4>1)*B1:B4)'})
+        self.assertIn(('Sheet1', 1, 4), engine.unsupported)
+        with self.assertRaises(UnsupportedFormula):
+            engine.recalculate()
+
+    def test_range_in_scalar_argument_is_unsupported(self):
+        """A range where a function expects a single value is not evaluated"""
+        engine = self.create_engine({
+            'D1': '=IF(A1:A3>1,"yes","no")',
+            'D2': '=ROUND(A1:A4,0)',
+        })
+        self.assertIn(('Sheet1', 1, 4), engine.unsupported)
+        self.assertIn(('Sheet1', 2, 4), engine.unsupported)
+
+    def test_approximate_match_returns_last_duplicate(self):
+        """Approximate lookups return the last of several equal keys"""
+        engine = self.create_engine({
+            'D1': '=MATCH(2,A1:A4,1)',
+            'D2': '=VLOOKUP(2,A1:B4,2,TRUE)',
+            'D3': '=MATCH(2.5,A1:A4)',
+            'D4': '=VLOOKUP(2,A1:B4,2,FALSE)',
+        })
+        engine.recalculate()
+        self.assertEqual(engine.get_value('Sheet1!D1'), 3.0)
+        self.assertEqual(engine.get_value('Sheet1!D2'), 30.0)
+        self.assertEqual(engine.get_value('Sheet1!D3'), 3.0)
+        self.assertEqual(engine.get_value('Sheet1!D4'), 20.0)
+
+    def test_wildcard_exact_match_is_unsupported(self):
+        """Exact lookups of text with wildcards are not evaluated literally"""
+        engine = self.create_engine({'D1': '=MATCH("a*",A1:A4,0)'})
+        with self.assertRaisesRegex(UnsupportedFormula, 'Sheet1!D1'):
+            engine.recalculate()
+
+
+if __name__ == '__main__':
+    unittest.main()
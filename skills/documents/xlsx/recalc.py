@@ -4,17 +4,78 @@ Excel Formula Recalculation Script
 Recalculates all formulas in an Excel file using LibreOffice
 """
 
+import argparse
 import json
 import sys
 import subprocess
 import os
 import platform
+import posixpath
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
 from pathlib import Path
-from openpyxl import load_workbook
+
+
+EXCEL_ERRORS = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
+
+
+# Basic module installed into the LibreOffice user profile. RecalculateAndSave works on the
+# document passed on the command line; RecalculateBatch works through the list of files named
+# by the RECALC_BATCH_LIST environment variable in the same session, appending one
+# "path<TAB>milliseconds<TAB>error" line per file to RECALC_BATCH_RESULTS as it goes.
+MACRO_CONTENT = '''<?xml version="1.0" encoding="UTF-8"?>
+<!DOCTYPE script:module PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN" "module.dtd">
+<script:module xmlns:script="http://openoffice.org/2000/script" script:name="Module1" script:language="StarBasic">
+    Sub RecalculateAndSave()
+      ThisComponent.calculateAll()
+      ThisComponent.store()
+      ThisComponent.close(True)
+    End Sub
+
+    Sub RecalculateBatch()
+      Dim props(0) As New com.sun.star.beans.PropertyValue
+      props(0).Name = "Hidden"
+      props(0).Value = True
+      listNum = FreeFile
+      Open Environ("RECALC_BATCH_LIST") For Input As #listNum
+      Do While Not EOF(listNum)
+        Line Input #listNum, filePath
+        If filePath &lt;&gt; "" Then
+          startTicks = GetSystemTicks()
+          errMsg = ""
+          doc = Nothing
+          On Error Resume Next
+          doc = StarDesktop.loadComponentFromURL(ConvertToURL(filePath), "_blank", 0, props())
+          If Err = 0 And IsNull(doc) Then errMsg = "Could not open file"
+          If Err = 0 And errMsg = "" Then
+            doc.calculateAll()
+            doc.store()
+          End If
+          If Err &lt;&gt; 0 Then errMsg = Error$
+          If Not IsNull(doc) Then doc.close(True)
+          On Error GoTo 0
+          resultNum = FreeFile
+          Open Environ("RECALC_BATCH_RESULTS") For Append As #resultNum
+          Print #resultNum, filePath &amp; Chr(9) &amp; (GetSystemTicks() - startTicks) &amp; Chr(9) &amp; errMsg
+          Close #resultNum
+        End If
+      Loop
+      Close #listNum
+      StarDesktop.terminate()
+    End Sub
+</script:module>'''
+
+# Set once the macro has been checked in this process, so batches don't re-check it per file
+_macro_ready = False
 
 
 def setup_libreoffice_macro():
     """Setup LibreOffice macro for recalculation if not already configured"""
+    global _macro_ready
+    if _macro_ready:
+        return True
+
     if platform.system() == 'Darwin':
         macro_dir = os.path.expanduser('~/Library/Application Support/LibreOffice/4/user/basic/Standard')
     else:
@@ -24,7 +85,9 @@ def setup_libreoffice_macro():
     
     if os.path.exists(macro_file):
         with open(macro_file, 'r') as f:
-            if 'RecalculateAndSave' in f.read():
+            # Older setups only have RecalculateAndSave; rewrite those to add the batch macro
+            if 'RecalculateBatch' in f.read():
+                _macro_ready = True
                 return True
     
     if not os.path.exists(macro_dir):
@@ -32,24 +95,33 @@ def setup_libreoffice_macro():
                       capture_output=True, timeout=10)
         os.makedirs(macro_dir, exist_ok=True)
     
-    macro_content = '''<?xml version="1.0" encoding="UTF-8"?>
-<!DOCTYPE script:module PUBLIC "-//OpenOffice.org//DTD OfficeDocument 1.0//EN" "module.dtd">
-<script:module xmlns:script="http://openoffice.org/2000/script" script:name="Module1" script:language="StarBasic">
-    Sub RecalculateAndSave()
-      ThisComponent.calculateAll()
-      ThisComponent.store()
-      ThisComponent.close(True)
-    End Sub
-</script:module>'''
-    
     try:
         with open(macro_file, 'w') as f:
-            f.write(macro_content)
+            f.write(MACRO_CONTENT)
+        _macro_ready = True
         return True
     except Exception:
         return False
 
 
+def _with_timeout(cmd, timeout):
+    """Prefix cmd with the platform's timeout command, if there is one"""
+    # Handle timeout command differences between Linux and macOS
+    if platform.system() != 'Windows':
+        timeout_cmd = 'timeout' if platform.system() == 'Linux' else None
+        if platform.system() == 'Darwin':
+            # Check if gtimeout is available on macOS
+            try:
+                subprocess.run(['gtimeout', '--version'], capture_output=True, timeout=1, check=False)
+                timeout_cmd = 'gtimeout'
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                pass
+        
+        if timeout_cmd:
+            cmd = [timeout_cmd, str(timeout)] + cmd
+    return cmd
+
+
 def recalc(filename, timeout=30):
     """
     Recalculate formulas in Excel file and report any errors
@@ -69,25 +141,11 @@ def recalc(filename, timeout=30):
     if not setup_libreoffice_macro():
         return {'error': 'Failed to setup LibreOffice macro'}
     
-    cmd = [
+    cmd = _with_timeout([
         'soffice', '--headless', '--norestore',
         'vnd.sun.star.script:Standard.Module1.RecalculateAndSave?language=Basic&location=application',
         abs_path
-    ]
-    
-    # Handle timeout command differences between Linux and macOS
-    if platform.system() != 'Windows':
-        timeout_cmd = 'timeout' if platform.system() == 'Linux' else None
-        if platform.system() == 'Darwin':
-            # Check if gtimeout is available on macOS
-            try:
-                subprocess.run(['gtimeout', '--version'], capture_output=True, timeout=1, check=False)
-                timeout_cmd = 'gtimeout'
-            except (FileNotFoundError, subprocess.TimeoutExpired):
-                pass
-        
-        if timeout_cmd:
-            cmd = [timeout_cmd, str(timeout)] + cmd
+    ], timeout)
     
     result = subprocess.run(cmd, capture_output=True, text=True)
     
@@ -98,28 +156,101 @@ def recalc(filename, timeout=30):
         else:
             return {'error': error_msg}
     
+    return check_workbook(filename)
+
+
+def recalc_batch(filenames, timeout=30, results_log=None):
+    """
+    Recalculate many Excel files in a single LibreOffice session and report errors per file
+    
+    LibreOffice starts once and opens, recalculates, saves and closes each file in turn,
+    instead of starting a new soffice process per file.
+    
+    Args:
+        filenames: Paths to Excel files
+        timeout: Maximum time per file (seconds); the whole session is limited to
+            timeout * number of files
+        results_log: Optional path of a JSON-lines file; one record per file is appended
+    
+    Returns:
+        list of dicts in input order, each with 'file', 'seconds' (LibreOffice time to
+        open, recalculate and save) and either the same keys as recalc() or 'error'
+    """
+    results = {}
+    queue = []
+    for filename in filenames:
+        if Path(filename).exists():
+            queue.append(str(Path(filename).absolute()))
+        else:
+            results[filename] = {'error': f'File {filename} does not exist'}
+
+    if queue and not setup_libreoffice_macro():
+        for path in queue:
+            results[path] = {'error': 'Failed to setup LibreOffice macro'}
+        queue = []
+
+    if queue:
+        with tempfile.TemporaryDirectory(prefix='recalc_batch_') as temp_dir:
+            list_file = os.path.join(temp_dir, 'files.txt')
+            results_file = os.path.join(temp_dir, 'results.txt')
+            with open(list_file, 'w') as f:
+                f.write('\n'.join(queue) + '\n')
+
+            cmd = _with_timeout([
+                'soffice', '--headless', '--norestore',
+                'vnd.sun.star.script:Standard.Module1.RecalculateBatch?language=Basic&location=application',
+            ], timeout * len(queue))
+            env = dict(os.environ, RECALC_BATCH_LIST=list_file, RECALC_BATCH_RESULTS=results_file)
+            session = subprocess.run(cmd, capture_output=True, text=True, env=env)
+
+            finished = {}
+            if os.path.exists(results_file):
+                with open(results_file) as f:
+                    for line in f:
+                        path, millis, error_msg = (line.rstrip('\r\n').split('\t') + ['', ''])[:3]
+                        finished[path] = (round(int(millis or 0) / 1000, 3), error_msg)
+
+            for path in queue:
+                if path not in finished:
+                    if session.returncode == 124:
+                        error_msg = 'Batch timed out before this file was recalculated'
+                    else:
+                        error_msg = session.stderr or 'LibreOffice exited before this file was recalculated'
+                    results[path] = {'error': error_msg}
+                    continue
+                seconds, error_msg = finished[path]
+                results[path] = {'error': error_msg} if error_msg else check_workbook(path)
+                results[path]['seconds'] = seconds
+
+    ordered = []
+    log_file = open(results_log, 'a', encoding='utf-8') if results_log else None
+    try:
+        for filename in filenames:
+            key = filename if filename in results else str(Path(filename).absolute())
+            entry = {'file': filename, **results[key]}
+            ordered.append(entry)
+            if log_file:
+                log_file.write(json.dumps(entry) + '\n')
+    finally:
+        if log_file:
+            log_file.close()
+    return ordered
+
+
+def check_workbook(filename):
+    """
+    Report Excel errors and the formula count of an already recalculated file
+    
+    Args:
+        filename: Path to Excel file
+    
+    Returns:
+        dict with error locations and counts (see recalc)
+    """
     # Check for Excel errors in the recalculated file - scan ALL cells
     try:
-        wb = load_workbook(filename, data_only=True)
-        
-        excel_errors = ['#VALUE!', '#DIV/0!', '#REF!', '#NAME?', '#NULL!', '#NUM!', '#N/A']
-        error_details = {err: [] for err in excel_errors}
-        total_errors = 0
-        
-        for sheet_name in wb.sheetnames:
-            ws = wb[sheet_name]
-            # Check ALL rows and columns - no limits
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value is not None and isinstance(cell.value, str):
-                        for err in excel_errors:
-                            if err in cell.value:
-                                location = f"{sheet_name}!{cell.coordinate}"
-                                error_details[err].append(location)
-                                total_errors += 1
-                                break
-        
-        wb.close()
+        error_details, formula_count = scan_workbook(filename)
+        total_errors = sum(len(locations) for locations in error_details.values())
         
         # Build result summary
         result = {
@@ -136,17 +267,7 @@ def recalc(filename, timeout=30):
                     'locations': locations[:20]  # Show up to 20 locations
                 }
         
-        # Add formula count for context - also check ALL cells
-        wb_formulas = load_workbook(filename, data_only=False)
-        formula_count = 0
-        for sheet_name in wb_formulas.sheetnames:
-            ws = wb_formulas[sheet_name]
-            for row in ws.iter_rows():
-                for cell in row:
-                    if cell.value and isinstance(cell.value, str) and cell.value.startswith('='):
-                        formula_count += 1
-        wb_formulas.close()
-        
+        # Add formula count for context
         result['total_formulas'] = formula_count
         
         return result
@@ -155,9 +276,139 @@ def recalc(filename, timeout=30):
         return {'error': str(e)}
 
 
+def _local_name(tag):
+    """Tag name without its namespace (handles both transitional and strict OOXML)"""
+    return tag.rsplit('}', 1)[-1]
+
+
+def _column_letter(index):
+    """Convert a 1-based column index to its letter(s), e.g. 28 -> 'AB'"""
+    letters = ''
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(ord('A') + remainder) + letters
+    return letters
+
+
+def _column_index(letters):
+    """Convert column letter(s) to a 1-based column index, e.g. 'AB' -> 28"""
+    index = 0
+    for ch in letters:
+        index = index * 26 + ord(ch) - ord('A') + 1
+    return index
+
+
+def get_sheet_parts(zf):
+    """
+    Return (sheet name, part name) for each worksheet in workbook order
+    
+    Args:
+        zf: Open zipfile.ZipFile of the workbook
+    """
+    with zf.open('xl/_rels/workbook.xml.rels') as f:
+        rels = ET.parse(f).getroot()
+    targets = {}
+    for rel in rels:
+        target = rel.get('Target', '')
+        if target.startswith('/'):
+            targets[rel.get('Id')] = target.lstrip('/')
+        else:
+            targets[rel.get('Id')] = posixpath.normpath(posixpath.join('xl', target))
+
+    with zf.open('xl/workbook.xml') as f:
+        workbook = ET.parse(f).getroot()
+    sheets = []
+    for element in workbook.iter():
+        if _local_name(element.tag) == 'sheet':
+            r_id = next((v for k, v in element.attrib.items() if _local_name(k) == 'id'), None)
+            part = targets.get(r_id)
+            # Chartsheets and dialogsheets have no cells to scan
+            if part and part in zf.NameToInfo and 'worksheets/' in part:
+                sheets.append((element.get('name'), part))
+    return sheets
+
+
+def scan_workbook(filename):
+    """
+    Find error cells and count formulas in a single streaming pass over the sheet XML
+    
+    Cells are read with iterparse and discarded row by row, so memory use stays flat
+    regardless of workbook size. Error cells are the ones stored with t="e" (the cached
+    result of a formula that failed); formula cells are the ones with an <f> element.
+    
+    Args:
+        filename: Path to Excel file
+    
+    Returns:
+        (error_details, formula_count) where error_details maps each error value to a
+        list of "Sheet!A1" locations in sheet and row order
+    """
+    error_details = {err: [] for err in EXCEL_ERRORS}
+    formula_count = 0
+
+    with zipfile.ZipFile(filename) as zf:
+        for sheet_name, part in get_sheet_parts(zf):
+            with zf.open(part) as f:
+                sheet_data = None
+                row_number = 0
+                column_number = 0
+                for event, element in ET.iterparse(f, events=('start', 'end')):
+                    name = _local_name(element.tag)
+                    if event == 'start':
+                        if name == 'sheetData':
+                            sheet_data = element
+                        elif name == 'row':
+                            row_number = int(element.get('r') or row_number + 1)
+                            column_number = 0
+                        continue
+
+                    if name == 'c':
+                        # The r attribute is optional; fall back to the cell's position
+                        ref = element.get('r')
+                        if ref:
+                            column_number = _column_index(ref.rstrip('0123456789'))
+                        else:
+                            column_number += 1
+                            ref = f"{_column_letter(column_number)}{row_number}"
+
+                        value = None
+                        for child in element:
+                            child_name = _local_name(child.tag)
+                            if child_name == 'f':
+                                formula_count += 1
+                            elif child_name == 'v':
+                                value = child.text
+                        if element.get('t') == 'e' and value:
+                            error_details.setdefault(value, []).append(f"{sheet_name}!{ref}")
+                    elif name == 'row' and sheet_data is not None:
+                        # Drop finished rows so the tree never holds more than one
+                        sheet_data.clear()
+
+    return error_details, formula_count
+
+
+def main_batch(args):
+    parser = argparse.ArgumentParser(
+        prog='recalc.py --batch',
+        description='Recalculate many Excel files in one LibreOffice session'
+    )
+    parser.add_argument('files', nargs='+', help='Excel files to recalculate')
+    parser.add_argument('--timeout', type=int, default=30, help='Maximum time per file (seconds)')
+    parser.add_argument('--results', help='JSON-lines file to append per-file results to')
+    args = parser.parse_args(args)
+
+    results = recalc_batch(args.files, args.timeout, args.results)
+    print(json.dumps(results, indent=2))
+    sys.exit(1 if any('error' in r for r in results) else 0)
+
+
 def main():
+    if len(sys.argv) > 1 and sys.argv[1] == '--batch':
+        main_batch(sys.argv[2:])
+
     if len(sys.argv) < 2:
         print("Usage: python recalc.py <excel_file> [timeout_seconds]")
+        print("       python recalc.py --batch <excel_file>... [--timeout seconds] [--results results.jsonl]")
         print("\nRecalculates all formulas in an Excel file using LibreOffice")
         print("\nReturns JSON with error details:")
         print("  - status: 'success' or 'errors_found'")
@@ -6,6 +6,7 @@ Provides functions for drawing shapes, text, emojis, and compositing elements
 together to create animation frames.
 """
 
+from functools import lru_cache
 from typing import Optional
 
 import numpy as np
@@ -80,9 +81,9 @@ def draw_text(
     """
     draw = ImageDraw.Draw(frame)
 
-    # Uses Pillow's default font.
+    # Uses Pillow's default font (loaded once, see _default_font).
     # If the font should be changed for the emoji, add additional logic here.
-    font = ImageFont.load_default()
+    font = _default_font()
 
     if centered:
         bbox = draw.textbbox((0, 0), text, font=font)
@@ -96,6 +97,12 @@ def draw_text(
     return frame
 
 
+@lru_cache(maxsize=None)
+def _default_font() -> ImageFont.ImageFont | ImageFont.FreeTypeFont:
+    """Pillow's default font, cached so it isn't reloaded for every frame."""
+    return ImageFont.load_default()
+
+
 def create_gradient_background(
     width: int,
     height: int,
@@ -105,6 +112,9 @@ def create_gradient_background(
     """
     Create a vertical gradient background.
 
+    Gradients are cached by size and colors, so calling this for every frame only
+    costs a copy of the cached image.
+
     Args:
         width: Frame width
         height: Frame height
@@ -112,26 +122,30 @@ def create_gradient_background(
         bottom_color: RGB color at bottom
 
     Returns:
-        PIL Image with gradient
+        PIL Image with gradient (a new image the caller can draw on)
     """
-    frame = Image.new("RGB", (width, height))
-    draw = ImageDraw.Draw(frame)
-
-    # Calculate color step for each row
-    r1, g1, b1 = top_color
-    r2, g2, b2 = bottom_color
-
-    for y in range(height):
-        # Interpolate color
-        ratio = y / height
-        r = int(r1 * (1 - ratio) + r2 * ratio)
-        g = int(g1 * (1 - ratio) + g2 * ratio)
-        b = int(b1 * (1 - ratio) + b2 * ratio)
+    return _cached_gradient(
+        width, height, tuple(top_color), tuple(bottom_color)
+    ).copy()
 
-        # Draw horizontal line
-        draw.line([(0, y), (width, y)], fill=(r, g, b))
 
-    return frame
+@lru_cache(maxsize=32)
+def _cached_gradient(
+    width: int,
+    height: int,
+    top_color: tuple[int, int, int],
+    bottom_color: tuple[int, int, int],
+) -> Image.Image:
+    """Gradient image shared by all callers; never draw on it directly."""
+    # Interpolate the color of every row at once
+    ratio = (np.arange(height) / height)[:, None]
+    top = np.array(top_color, dtype=np.float64)
+    bottom = np.array(bottom_color, dtype=np.float64)
+    rows = (top * (1 - ratio) + bottom * ratio).astype(np.uint8)  # Truncates like int()
+
+    # Repeat each row across the frame width
+    pixels = np.ascontiguousarray(np.broadcast_to(rows[:, None, :], (height, width, 3)))
+    return Image.fromarray(pixels, mode="RGB")
 
 
 def draw_star(
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Frame Store - Compact storage for the frames of a GIF.
+
+Frames are kept as uint8 RGB in one preallocated buffer instead of a list of
+separate arrays, either in memory or in a memory-mapped file on disk, so long or
+high-resolution animations don't need all their frames in RAM.
+"""
+
+import os
+import tempfile
+import weakref
+from pathlib import Path
+from typing import Iterable, Iterator, Optional
+
+import numpy as np
+
+
+class FrameStore:
+    """Append-only sequence of equally sized uint8 RGB frames in one buffer."""
+
+    def __init__(self, width: int, height: int, capacity: int = 16):
+        """
+        Initialize an in-memory frame store.
+
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            capacity: Number of frames to preallocate room for (grows as needed)
+        """
+        self.width = width
+        self.height = height
+        self._length = 0
+        self._buffer = self._allocate(max(1, capacity))
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        """Return a buffer for `capacity` frames holding the current frames."""
+        buffer = np.empty((capacity, self.height, self.width, 3), dtype=np.uint8)
+        if self._length:
+            buffer[: self._length] = self._buffer[: self._length]
+        return buffer
+
+    def __len__(self) -> int:
+        return self._length
+
+    def __getitem__(self, index: int) -> np.ndarray:
+        """Frame at `index` as a read-only (height, width, 3) view."""
+        if index < 0:
+            index += self._length
+        if not 0 <= index < self._length:
+            raise IndexError("frame index out of range")
+        frame = self._buffer[index]
+        frame.flags.writeable = False
+        return frame
+
+    def __iter__(self) -> Iterator[np.ndarray]:
+        for i in range(self._length):
+            yield self[i]
+
+    def append(self, frame: np.ndarray):
+        """
+        Copy a frame into the store.
+
+        Args:
+            frame: (height, width, 3) uint8 RGB array
+        """
+        if frame.shape != (self.height, self.width, 3):
+            raise ValueError(
+                f"Frame shape {frame.shape} doesn't match store "
+                f"({self.height}, {self.width}, 3)"
+            )
+        if self._length == len(self._buffer):
+            # Grow geometrically so appends stay amortized O(1)
+            self._buffer = self._allocate(2 * len(self._buffer))
+        self._buffer[self._length] = frame
+        self._length += 1
+
+    def extend(self, frames: Iterable[np.ndarray]):
+        """Copy several frames into the store."""
+        for frame in frames:
+            self.append(frame)
+
+    def batches(self, batch_size: int = 16) -> Iterator[np.ndarray]:
+        """
+        Iterate over the frames in consecutive batches.
+
+        Args:
+            batch_size: Maximum number of frames per batch
+
+        Yields:
+            Read-only (frames, height, width, 3) views
+        """
+        for start in range(0, self._length, batch_size):
+            batch = self._buffer[start : min(start + batch_size, self._length)]
+            batch.flags.writeable = False
+            yield batch
+
+    def keep(self, indices: Iterable[int]):
+        """
+        Keep only the frames at `indices`, compacting them in place.
+
+        Args:
+            indices: Increasing frame indices to keep
+        """
+        count = 0
+        for index in indices:
+            if not count <= index < self._length:
+                raise IndexError("indices must be increasing and in range")
+            if index != count:
+                self._buffer[count] = self._buffer[index]
+            count += 1
+        self._length = count
+
+    def empty_like(self, width: int, height: int) -> "FrameStore":
+        """New empty store of the same kind for frames of another size."""
+        return FrameStore(width, height, capacity=max(1, self._length))
+
+    def clear(self):
+        """Remove all frames."""
+        self._length = 0
+
+    def close(self):
+        """Release the store's storage."""
+        self._length = 0
+        self._buffer = self._buffer[:0]
+
+
+class DiskFrameStore(FrameStore):
+    """Frame store backed by a memory-mapped temporary file."""
+
+    def __init__(
+        self,
+        width: int,
+        height: int,
+        capacity: int = 16,
+        directory: Optional[str | Path] = None,
+    ):
+        """
+        Initialize a disk-backed frame store.
+
+        Args:
+            width: Frame width in pixels
+            height: Frame height in pixels
+            capacity: Number of frames to preallocate room for (grows as needed)
+            directory: Directory for the backing file (default: system temp dir)
+        """
+        self.directory = directory
+        fd, self.path = tempfile.mkstemp(suffix=".frames", dir=directory)
+        os.close(fd)
+        # Delete the backing file when the store is garbage collected
+        self._finalizer = weakref.finalize(self, _remove_file, self.path)
+        self._buffer = None
+        super().__init__(width, height, capacity)
+
+    def _allocate(self, capacity: int) -> np.ndarray:
+        if self._buffer is not None:
+            self._buffer.flush()
+        frame_size = self.height * self.width * 3
+        # Growing the file keeps the existing frames in place
+        with open(self.path, "r+b") as f:
+            f.truncate(capacity * frame_size)
+        return np.memmap(
+            self.path,
+            dtype=np.uint8,
+            mode="r+",
+            shape=(capacity, self.height, self.width, 3),
+        )
+
+    def empty_like(self, width: int, height: int) -> "DiskFrameStore":
+        return DiskFrameStore(
+            width, height, capacity=max(1, self._length), directory=self.directory
+        )
+
+    def close(self):
+        """Release the memory map and delete the backing file."""
+        self._length = 0
+        self._buffer = None
+        self._finalizer()
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
@@ -6,18 +6,52 @@ This module provides the main interface for creating GIFs from programmatically
 generated frames, with automatic optimization for Slack's requirements.
 """
 
+import struct
 from pathlib import Path
-from typing import Optional
+from typing import Callable, Iterable, Iterator, Optional, Sequence
 
-import imageio.v3 as imageio
 import numpy as np
-from PIL import Image
+from PIL import GifImagePlugin, Image
+
+from core.frame_store import DiskFrameStore, FrameStore
+
+# Bits kept per channel when looking up a color's palette index (64x64x64 table)
+LUT_BITS = 6
+
+# 4x4 Bayer matrix for ordered dithering
+BAYER_4X4 = np.array(
+    [[0, 8, 2, 10], [12, 4, 14, 6], [3, 11, 1, 9], [15, 7, 13, 5]], dtype=np.float32
+)
+
+# Candidate settings for save_to_target(), from best to worst quality
+TARGET_SCALES = (1.0, 0.75, 0.5, 0.375, 0.25)
+TARGET_FRAME_STEPS = (1, 2, 3)
+TARGET_COLORS = (128, 96, 64, 48, 32, 16)
+
+# Frame pairs encoded to estimate the size of a delta-region GIF
+ESTIMATE_SAMPLES = 8
+
+# Settings are only skipped without a full encode when their estimated size is
+# more than this factor over the budget (estimates can be off by a few percent)
+ESTIMATE_MARGIN = 1.1
+
+
+def _sample_indices(count: int, sample_size: int) -> list[int]:
+    """Evenly spaced indices of up to `sample_size` items out of `count`."""
+    sample_size = min(sample_size, count)
+    return [int(i * count / sample_size) for i in range(sample_size)]
 
 
 class GIFBuilder:
     """Builder for creating optimized GIFs from frames."""
 
-    def __init__(self, width: int = 480, height: int = 480, fps: int = 15):
+    def __init__(
+        self,
+        width: int = 480,
+        height: int = 480,
+        fps: int = 15,
+        frame_dir: Optional[str | Path] = None,
+    ):
         """
         Initialize GIF builder.
 
@@ -25,11 +59,16 @@ class GIFBuilder:
             width: Frame width in pixels
             height: Frame height in pixels
             fps: Frames per second
+            frame_dir: If given, keep frames in a memory-mapped file in this
+                       directory instead of in RAM (for long or large animations)
         """
         self.width = width
         self.height = height
         self.fps = fps
-        self.frames: list[np.ndarray] = []
+        if frame_dir is None:
+            self.frames: FrameStore = FrameStore(width, height)
+        else:
+            self.frames = DiskFrameStore(width, height, directory=frame_dir)
 
     def add_frame(self, frame: np.ndarray | Image.Image):
         """
@@ -39,7 +78,7 @@ class GIFBuilder:
             frame: Frame as numpy array or PIL Image (will be converted to RGB)
         """
         if isinstance(frame, Image.Image):
-            frame = np.array(frame.convert("RGB"))
+            frame = np.asarray(frame.convert("RGB"))
 
         # Ensure frame is correct size
         if frame.shape[:2] != (self.height, self.width):
@@ -47,8 +86,9 @@ class GIFBuilder:
             pil_frame = pil_frame.resize(
                 (self.width, self.height), Image.Resampling.LANCZOS
             )
-            frame = np.array(pil_frame)
+            frame = np.asarray(pil_frame)
 
+        # Copied into the frame store
         self.frames.append(frame)
 
     def add_frames(self, frames: list[np.ndarray | Image.Image]):
@@ -69,57 +109,349 @@ class GIFBuilder:
         Returns:
             List of color-optimized frames
         """
+        if use_global_palette and len(self.frames) > 1:
+            indexed_frames, palette = self.quantize_frames(num_colors)
+            return [palette[indices] for indices in indexed_frames]
+
+        # Use per-frame quantization
         optimized = []
+        for frame in self.frames:
+            pil_frame = Image.fromarray(frame)
+            quantized = pil_frame.quantize(colors=num_colors, method=2, dither=1)
+            optimized.append(np.array(quantized.convert("RGB")))
+        return optimized
 
-        if use_global_palette and len(self.frames) > 1:
-            # Create a global palette from all frames
-            # Sample frames to build palette
-            sample_size = min(5, len(self.frames))
-            sample_indices = [
-                int(i * len(self.frames) / sample_size) for i in range(sample_size)
-            ]
-            sample_frames = [self.frames[i] for i in sample_indices]
-
-            # Combine sample frames into a single image for palette generation
-            # Flatten each frame to get all pixels, then stack them
-            all_pixels = np.vstack(
-                [f.reshape(-1, 3) for f in sample_frames]
-            )  # (total_pixels, 3)
-
-            # Create a properly-shaped RGB image from the pixel data
-            # We'll make a roughly square image from all the pixels
-            total_pixels = len(all_pixels)
-            width = min(512, int(np.sqrt(total_pixels)))  # Reasonable width, max 512
-            height = (total_pixels + width - 1) // width  # Ceiling division
-
-            # Pad if necessary to fill the rectangle
-            pixels_needed = width * height
-            if pixels_needed > total_pixels:
-                padding = np.zeros((pixels_needed - total_pixels, 3), dtype=np.uint8)
-                all_pixels = np.vstack([all_pixels, padding])
-
-            # Reshape to proper RGB image format (H, W, 3)
-            img_array = (
-                all_pixels[:pixels_needed].reshape(height, width, 3).astype(np.uint8)
+    def quantize_frames(
+        self, num_colors: int = 128, dither: bool = False
+    ) -> tuple[list[np.ndarray], np.ndarray]:
+        """
+        Map all frames to a single global palette.
+
+        The palette is built once from a sample of the frames, then every frame is
+        mapped to it through a precomputed RGB -> palette index lookup table.
+
+        Args:
+            num_colors: Target number of colors (8-256)
+            dither: Apply ordered dithering (smoother gradients, larger files)
+
+        Returns:
+            Tuple of (palette index frames as (height, width) uint8 arrays,
+            palette as (colors, 3) uint8 array)
+        """
+        palette, indexed_frames = self._quantize_stream(num_colors, dither)
+        return list(indexed_frames), palette
+
+    def _quantize_stream(
+        self, num_colors: int, dither: bool
+    ) -> tuple[np.ndarray, Iterator[np.ndarray]]:
+        """
+        Like quantize_frames(), but map frames to the palette one at a time.
+
+        Returns:
+            Tuple of (palette, iterator over palette index frames)
+        """
+        palette = self._build_palette(self.frames, num_colors)
+        lut = self._palette_lut(palette)
+        offsets = (
+            self._dither_offsets(self.width, self.height, len(palette)) if dither else None
+        )
+        indexed_frames = (
+            self._map_to_palette(frame, lut, offsets) for frame in self.frames
+        )
+        return palette, indexed_frames
+
+    @staticmethod
+    def _build_palette(frames: Sequence[np.ndarray], num_colors: int) -> np.ndarray:
+        """Build a global palette ((colors, 3) uint8) from a sample of the frames."""
+        # Sample frames to build palette
+        sample_frames = [frames[i] for i in _sample_indices(len(frames), 5)]
+
+        # Combine sample frames into a single image for palette generation
+        # Flatten each frame to get all pixels, then stack them
+        all_pixels = np.vstack(
+            [f.reshape(-1, 3) for f in sample_frames]
+        )  # (total_pixels, 3)
+
+        # Create a properly-shaped RGB image from the pixel data
+        # We'll make a roughly square image from all the pixels
+        total_pixels = len(all_pixels)
+        width = min(512, int(np.sqrt(total_pixels)))  # Reasonable width, max 512
+        height = (total_pixels + width - 1) // width  # Ceiling division
+
+        # Pad by repeating pixels so the padding doesn't add a color of its own
+        pixels_needed = width * height
+        if pixels_needed > total_pixels:
+            all_pixels = np.vstack([all_pixels, all_pixels[: pixels_needed - total_pixels]])
+
+        # Reshape to proper RGB image format (H, W, 3)
+        img_array = all_pixels.reshape(height, width, 3).astype(np.uint8)
+        combined_img = Image.fromarray(img_array, mode="RGB")
+
+        # Generate global palette, keeping only the entries actually used
+        quantized = combined_img.quantize(colors=num_colors, method=2)
+        colors = np.array(quantized.getpalette(), dtype=np.uint8).reshape(-1, 3)
+        used = np.unique(np.asarray(quantized))
+        return colors[used]
+
+    @staticmethod
+    def _palette_lut(palette: np.ndarray) -> np.ndarray:
+        """
+        Lookup table from a LUT_BITS-per-channel RGB key to the nearest palette index.
+
+        Args:
+            palette: (colors, 3) uint8 palette
+
+        Returns:
+            uint8 array with one palette index per key
+        """
+        # Center of each cell of the RGB grid
+        levels = (np.arange(1 << LUT_BITS) << (8 - LUT_BITS)) + (1 << (7 - LUT_BITS))
+        grid = np.stack(
+            np.meshgrid(levels, levels, levels, indexing="ij"), axis=-1
+        ).reshape(-1, 3).astype(np.float32)
+
+        # argmin |g - p|^2 == argmin |p|^2 - 2 g.p (exact in float32 for 8-bit values)
+        pal = palette.astype(np.float32)
+        pal_norms = (pal**2).sum(axis=1)
+        lut = np.empty(len(grid), dtype=np.uint8)
+        chunk = 1 << 15
+        for start in range(0, len(grid), chunk):
+            distances = pal_norms - 2 * (grid[start : start + chunk] @ pal.T)
+            lut[start : start + chunk] = distances.argmin(axis=1)
+        return lut
+
+    @staticmethod
+    def _dither_offsets(width: int, height: int, num_colors: int) -> np.ndarray:
+        """Ordered dithering offsets ((height, width, 1) float32) for a palette size."""
+        # Spread the threshold over roughly one palette step per channel
+        spread = 256 / max(2.0, num_colors ** (1 / 3))
+        pattern = (BAYER_4X4 + 0.5) / 16 - 0.5
+        reps = (height // 4 + 1, width // 4 + 1)
+        return np.tile(pattern * spread, reps)[:height, :width, None]
+
+    @staticmethod
+    def _map_to_palette(
+        frame: np.ndarray, lut: np.ndarray, offsets: Optional[np.ndarray] = None
+    ) -> np.ndarray:
+        """Map an RGB frame to (height, width) uint8 palette indices through a LUT."""
+        if offsets is not None:
+            frame = np.clip(frame + offsets, 0, 255).astype(np.uint8)
+        channels = (frame >> (8 - LUT_BITS)).astype(np.intp)
+        keys = (channels[..., 0] << (2 * LUT_BITS)) | (
+            channels[..., 1] << LUT_BITS
+        ) | channels[..., 2]
+        return lut[keys]
+
+    @staticmethod
+    def _write_gif(
+        output_path: Path,
+        indexed_frames: Iterable[np.ndarray],
+        palette: np.ndarray,
+        duration: float,
+    ):
+        """Write palette index frames sharing one palette as a looping GIF."""
+        flat_palette = palette.flatten().tolist()
+        images = []
+        for indices in indexed_frames:
+            image = Image.fromarray(indices)
+            image.putpalette(flat_palette)
+            images.append(image)
+        images[0].save(
+            output_path,
+            save_all=True,
+            append_images=images[1:],
+            duration=duration,
+            loop=0,  # Infinite loop
+        )
+
+    @classmethod
+    def _write_delta_gif(
+        cls,
+        output_path: Path,
+        indexed_frames: Iterable[np.ndarray],
+        palette: np.ndarray,
+        duration: float,
+    ):
+        """Write palette index frames as a looping delta-region GIF (see _encode_delta_gif)."""
+        with open(output_path, "wb") as f:
+            for chunk in cls._encode_delta_gif(indexed_frames, palette, duration):
+                f.write(chunk)
+
+    @classmethod
+    def _encode_delta_gif(
+        cls,
+        indexed_frames: Iterable[np.ndarray],
+        palette: np.ndarray,
+        duration: float,
+    ) -> Iterator[bytes]:
+        """
+        Encode palette index frames as a looping GIF that only stores what changes.
+
+        Each frame after the first is cropped to the bounding box of the pixels that
+        differ from the previous frame, pixels inside it that did not change are
+        written as a reserved transparent index, and frames are drawn on top of the
+        previous one (disposal 1). Identical frames extend the previous frame's
+        duration instead of being written.
+
+        Args:
+            indexed_frames: (height, width) uint8 palette index frames
+            palette: (colors, 3) uint8 palette shared by all frames
+            duration: Duration of each frame in milliseconds
+
+        Yields:
+            Chunks of the GIF file
+        """
+        previous = None
+        pending = None  # Frame waiting for its final duration
+        for indices in indexed_frames:
+            if previous is None:
+                height, width = indices.shape
+                header, transparent = cls._gif_header(width, height, palette)
+                yield header
+                pending = [indices, (0, 0), duration, None]
+                previous = indices
+                continue
+
+            delta = cls._delta_region(previous, indices, transparent)
+            if delta is None:
+                # Identical to the previous frame: just show that one longer
+                pending[2] += duration
+                continue
+
+            yield cls._encode_frame(*pending)
+            pending = [*delta, duration, transparent]
+            previous = indices
+
+        yield cls._encode_frame(*pending)
+        yield b";"  # Trailer
+
+    @staticmethod
+    def _gif_header(
+        width: int, height: int, palette: np.ndarray
+    ) -> tuple[bytes, Optional[int]]:
+        """
+        GIF header, global color table and loop extension for a delta-region GIF.
+
+        Returns:
+            Tuple of (header bytes, reserved transparent index or None if the
+            palette has no free entry)
+        """
+        # Reserve the first unused index for transparency (none left with 256 colors)
+        transparent = len(palette) if len(palette) < 256 else None
+        entries = len(palette) + (transparent is not None)
+        table_bits = max(1, (entries - 1).bit_length())
+        color_table = np.zeros((1 << table_bits, 3), dtype=np.uint8)
+        color_table[: len(palette)] = palette
+
+        header = (
+            b"GIF89a"
+            + struct.pack("<HHBBB", width, height, 0x80 | (table_bits - 1), 0, 0)
+            + color_table.tobytes()
+            # NETSCAPE2.0 application extension: loop forever
+            + b"!\xff\x0bNETSCAPE2.0\x03\x01"
+            + struct.pack("<H", 0)
+            + b"\x00"
+        )
+        return header, transparent
+
+    @staticmethod
+    def _delta_region(
+        previous: np.ndarray, indices: np.ndarray, transparent: Optional[int]
+    ) -> Optional[tuple[np.ndarray, tuple[int, int]]]:
+        """
+        Changed region of a frame relative to the previous one.
+
+        Returns:
+            Tuple of (region with unchanged pixels set to `transparent`, (left, top)
+            offset), or None if the frames are identical
+        """
+        changed = indices != previous
+        rows = np.flatnonzero(changed.any(axis=1))
+        if len(rows) == 0:
+            return None
+        cols = np.flatnonzero(changed.any(axis=0))
+        top, bottom = rows[0], rows[-1] + 1
+        left, right = cols[0], cols[-1] + 1
+
+        region = indices[top:bottom, left:right]
+        if transparent is not None:
+            region = np.where(
+                changed[top:bottom, left:right], region, np.uint8(transparent)
             )
-            combined_img = Image.fromarray(img_array, mode="RGB")
+        return region, (int(left), int(top))
+
+    @staticmethod
+    def _encode_frame(
+        region: np.ndarray,
+        offset: tuple[int, int],
+        duration: float,
+        transparency: Optional[int],
+    ) -> bytes:
+        """Encode one frame (control extension, image descriptor and LZW data)."""
+        params = {"duration": duration, "disposal": 1}
+        if transparency is not None:
+            params["transparency"] = transparency
+        image = Image.fromarray(region)
+        return b"".join(GifImagePlugin.getdata(image, offset=offset, **params))
+
+    @classmethod
+    def _estimate_delta_size(
+        cls,
+        frame_at: Callable[[int], np.ndarray],
+        changed_areas: list[int],
+        palette: np.ndarray,
+    ) -> int:
+        """
+        Estimate the size of a delta-region GIF without encoding every frame.
 
-            # Generate global palette
-            global_palette = combined_img.quantize(colors=num_colors, method=2)
+        The first frame and up to ESTIMATE_SAMPLES evenly spaced frame-to-frame
+        deltas are encoded. Their bytes per changed pixel is then applied to the
+        changed area of every delta, so frames with much more or less motion than
+        the sampled ones are still accounted for.
 
-            # Apply global palette to all frames
-            for frame in self.frames:
-                pil_frame = Image.fromarray(frame)
-                quantized = pil_frame.quantize(palette=global_palette, dither=1)
-                optimized.append(np.array(quantized.convert("RGB")))
-        else:
-            # Use per-frame quantization
-            for frame in self.frames:
-                pil_frame = Image.fromarray(frame)
-                quantized = pil_frame.quantize(colors=num_colors, method=2, dither=1)
-                optimized.append(np.array(quantized.convert("RGB")))
+        Args:
+            frame_at: Returns the j-th palette index frame (0 <= j <= len(changed_areas))
+            changed_areas: Changed area of each frame-to-frame delta (see _changed_areas)
+            palette: (colors, 3) uint8 palette shared by all frames
 
-        return optimized
+        Returns:
+            Estimated file size in bytes
+        """
+        first = frame_at(0)
+        header, transparent = cls._gif_header(first.shape[1], first.shape[0], palette)
+        size = len(header) + len(cls._encode_frame(first, (0, 0), 0, None)) + 1
+
+        changed = [j + 1 for j, area in enumerate(changed_areas) if area]
+        if not changed:
+            return size
+
+        samples = [changed[k] for k in _sample_indices(len(changed), ESTIMATE_SAMPLES)]
+        sampled_bytes = 0
+        for j in samples:
+            delta = cls._delta_region(frame_at(j - 1), frame_at(j), transparent)
+            if delta is not None:
+                sampled_bytes += len(cls._encode_frame(*delta, 0, transparent))
+        sampled_area = sum(changed_areas[j - 1] for j in samples)
+        return size + round(sampled_bytes * sum(changed_areas) / sampled_area)
+
+    @staticmethod
+    def _changed_areas(frames: Iterable[np.ndarray]) -> list[int]:
+        """Area (pixels) of the changed bounding box between each pair of consecutive frames."""
+        areas = []
+        previous = None
+        for frame in frames:
+            if previous is not None:
+                changed = frame != previous
+                if changed.ndim == 3:
+                    changed = changed.any(axis=2)
+                rows = np.flatnonzero(changed.any(axis=1))
+                cols = np.flatnonzero(changed.any(axis=0))
+                if len(rows):
+                    areas.append(int((rows[-1] - rows[0] + 1) * (cols[-1] - cols[0] + 1)))
+                else:
+                    areas.append(0)
+            previous = frame
+        return areas
 
     def deduplicate_frames(self, threshold: float = 0.9995) -> int:
         """
@@ -135,27 +467,50 @@ class GIFBuilder:
         if len(self.frames) < 2:
             return 0
 
-        deduplicated = [self.frames[0]]
-        removed_count = 0
+        keep = self._distinct_frame_indices(threshold)
+        removed_count = len(self.frames) - len(keep)
+        self.frames.keep(keep)
+        return removed_count
 
-        for i in range(1, len(self.frames)):
-            # Compare with previous frame
-            prev_frame = np.array(deduplicated[-1], dtype=np.float32)
-            curr_frame = np.array(self.frames[i], dtype=np.float32)
+    def _distinct_frame_indices(self, threshold: float) -> list[int]:
+        """Indices of the frames deduplicate_frames() would keep."""
+        if not self.frames:
+            return []
 
-            # Calculate similarity (normalized)
-            diff = np.abs(prev_frame - curr_frame)
-            similarity = 1.0 - (np.mean(diff) / 255.0)
+        # Scratch space for the differences, reused for every comparison
+        buffers = (
+            np.empty((self.height, self.width, 3), dtype=np.uint8),
+            np.empty((self.height, self.width, 3), dtype=np.uint8),
+        )
+
+        keep = [0]
+        for i in range(1, len(self.frames)):
+            # Compare with previous kept frame
+            similarity = self._similarity(self.frames[keep[-1]], self.frames[i], buffers)
 
             # Keep frame if sufficiently different
             # High threshold (0.9995+) means only remove nearly identical frames
             if similarity < threshold:
-                deduplicated.append(self.frames[i])
-            else:
-                removed_count += 1
+                keep.append(i)
+        return keep
 
-        self.frames = deduplicated
-        return removed_count
+    @staticmethod
+    def _similarity(
+        a: np.ndarray, b: np.ndarray, buffers: tuple[np.ndarray, np.ndarray]
+    ) -> float:
+        """
+        Similarity (0.0-1.0) of two uint8 frames: 1 - mean absolute difference / 255.
+
+        Args:
+            a, b: Frames to compare
+            buffers: Two uint8 scratch arrays of the frames' shape
+        """
+        high, low = buffers
+        # |a - b| without leaving uint8 (no float copies): max(a, b) - min(a, b)
+        np.maximum(a, b, out=high)
+        np.minimum(a, b, out=low)
+        np.subtract(high, low, out=high)
+        return 1.0 - high.sum(dtype=np.uint64) / high.size / 255.0
 
     def save(
         self,
@@ -163,6 +518,8 @@ class GIFBuilder:
         num_colors: int = 128,
         optimize_for_emoji: bool = False,
         remove_duplicates: bool = False,
+        dither: bool = False,
+        delta_frames: bool = True,
     ) -> dict:
         """
         Save frames as optimized GIF for Slack.
@@ -172,6 +529,9 @@ class GIFBuilder:
             num_colors: Number of colors to use (fewer = smaller file)
             optimize_for_emoji: If True, optimize for emoji size (128x128, fewer colors)
             remove_duplicates: If True, remove duplicate consecutive frames (opt-in)
+            dither: If True, apply ordered dithering (smoother gradients, larger file)
+            delta_frames: If True, store only the changed region of each frame
+                          (much smaller files); False writes full frames
 
         Returns:
             Dictionary with file info (path, size, dimensions, frame_count)
@@ -197,12 +557,13 @@ class GIFBuilder:
                 )
                 self.width = 128
                 self.height = 128
-                # Resize all frames
-                resized_frames = []
+                # Resize all frames, one at a time, into a new store
+                resized_frames = self.frames.empty_like(128, 128)
                 for frame in self.frames:
                     pil_frame = Image.fromarray(frame)
                     pil_frame = pil_frame.resize((128, 128), Image.Resampling.LANCZOS)
-                    resized_frames.append(np.array(pil_frame))
+                    resized_frames.append(np.asarray(pil_frame))
+                self.frames.close()
                 self.frames = resized_frames
             num_colors = min(num_colors, 48)  # More aggressive color limit for emoji
 
@@ -213,23 +574,19 @@ class GIFBuilder:
                 )
                 # Keep every nth frame to get close to 12 frames
                 keep_every = max(1, len(self.frames) // 12)
-                self.frames = [
-                    self.frames[i] for i in range(0, len(self.frames), keep_every)
-                ]
+                self.frames.keep(range(0, len(self.frames), keep_every))
 
-        # Optimize colors with global palette
-        optimized_frames = self.optimize_colors(num_colors, use_global_palette=True)
+        # Quantize once to a global palette and stream the indexed frames to the writer
+        palette, indexed_frames = self._quantize_stream(num_colors, dither=dither)
 
         # Calculate frame duration in milliseconds
         frame_duration = 1000 / self.fps
 
         # Save GIF
-        imageio.imwrite(
-            output_path,
-            optimized_frames,
-            duration=frame_duration,
-            loop=0,  # Infinite loop
-        )
+        if delta_frames:
+            self._write_delta_gif(output_path, indexed_frames, palette, frame_duration)
+        else:
+            self._write_gif(output_path, indexed_frames, palette, frame_duration)
 
         # Get file info
         file_size_kb = output_path.stat().st_size / 1024
@@ -240,9 +597,9 @@ class GIFBuilder:
             "size_kb": file_size_kb,
             "size_mb": file_size_mb,
             "dimensions": f"{self.width}x{self.height}",
-            "frame_count": len(optimized_frames),
+            "frame_count": len(self.frames),
             "fps": self.fps,
-            "duration_seconds": len(optimized_frames) / self.fps,
+            "duration_seconds": len(self.frames) / self.fps,
             "colors": num_colors,
         }
 
@@ -251,7 +608,7 @@ class GIFBuilder:
         print(f"  Path: {output_path}")
         print(f"  Size: {file_size_kb:.1f} KB ({file_size_mb:.2f} MB)")
         print(f"  Dimensions: {self.width}x{self.height}")
-        print(f"  Frames: {len(optimized_frames)} @ {self.fps} fps")
+        print(f"  Frames: {len(self.frames)} @ {self.fps} fps")
         print(f"  Duration: {info['duration_seconds']:.1f}s")
         print(f"  Colors: {num_colors}")
 
@@ -264,6 +621,183 @@ class GIFBuilder:
 
         return info
 
+    def save_to_target(
+        self,
+        output_path: str | Path,
+        max_bytes: int,
+        remove_duplicates: bool = False,
+        dither: bool = False,
+        min_dimension: int = 32,
+    ) -> dict:
+        """
+        Save the highest-quality GIF that fits in `max_bytes`.
+
+        Settings are tried from best to worst: at each resolution (full size first),
+        fewer colors are tried before frames are dropped, and the resolution is only
+        reduced when no color/frame combination fits. Dropped frames make the
+        remaining ones last longer, so the animation keeps its length.
+
+        Each setting's size is first estimated by encoding a sample of its frames;
+        settings whose estimate is clearly over budget (by more than
+        ESTIMATE_MARGIN) are skipped, and all others are fully encoded and checked. Duplicate removal,
+        resized frames, palettes and the sampled palette-mapped frames are computed
+        once and shared between attempts. The builder's frames are not modified.
+
+        Args:
+            output_path: Where to save the GIF
+            max_bytes: Maximum file size in bytes
+            remove_duplicates: If True, remove duplicate consecutive frames (opt-in)
+            dither: If True, apply ordered dithering (smoother gradients, larger file)
+            min_dimension: Never scale the GIF's smaller side below this (pixels)
+
+        Returns:
+            Dictionary with file info (as save()), plus "max_bytes" and "fits"
+            (False if even the smallest setting was too large; that one is saved)
+        """
+        if not self.frames:
+            raise ValueError("No frames to save. Add frames with add_frame() first.")
+
+        output_path = Path(output_path)
+
+        if remove_duplicates:
+            frame_indices = self._distinct_frame_indices(threshold=0.9995)
+        else:
+            frame_indices = list(range(len(self.frames)))
+
+        # Caches for the current size, filled as attempts need them. Only the frames
+        # sampled for size estimates are kept palette-mapped; full encodes map
+        # frames as they stream to the encoder.
+        resized: list[FrameStore] = []
+        palettes: dict[int, tuple[np.ndarray, np.ndarray]] = {}
+        indexed: dict[tuple[int, int], np.ndarray] = {}
+        positions = {i: j for j, i in enumerate(frame_indices)}
+
+        def frame_at(size: tuple[int, int], i: int) -> np.ndarray:
+            if size == (self.width, self.height):
+                return self.frames[i]
+            if not resized:
+                # Resize every frame once, into a store of the same kind as ours
+                store = self.frames.empty_like(*size)
+                for index in frame_indices:
+                    pil_frame = Image.fromarray(self.frames[index])
+                    pil_frame = pil_frame.resize(size, Image.Resampling.LANCZOS)
+                    store.append(np.asarray(pil_frame))
+                resized.append(store)
+            return resized[0][positions[i]]
+
+        def palette_at(size: tuple[int, int], num_colors: int) -> np.ndarray:
+            if num_colors not in palettes:
+                # Same palette whichever frames are dropped, so mapped frames are shared
+                sample = [
+                    frame_at(size, frame_indices[j])
+                    for j in _sample_indices(len(frame_indices), 5)
+                ]
+                palette = self._build_palette(sample, num_colors)
+                palettes[num_colors] = (palette, self._palette_lut(palette))
+            return palettes[num_colors][0]
+
+        def indexed_at(
+            size: tuple[int, int], num_colors: int, i: int, cache: bool = True
+        ) -> np.ndarray:
+            if (num_colors, i) in indexed:
+                return indexed[num_colors, i]
+            palette_at(size, num_colors)
+            palette, lut = palettes[num_colors]
+            offsets = self._dither_offsets(*size, len(palette)) if dither else None
+            indices = self._map_to_palette(frame_at(size, i), lut, offsets)
+            if cache:
+                indexed[num_colors, i] = indices
+            return indices
+
+        def encode(size, step, num_colors) -> bytes:
+            return b"".join(
+                self._encode_delta_gif(
+                    (
+                        indexed_at(size, num_colors, i, cache=False)
+                        for i in frame_indices[::step]
+                    ),
+                    palette_at(size, num_colors),
+                    1000 * step / self.fps,
+                )
+            )
+
+        setting = None
+        encoded = None
+        for scale in TARGET_SCALES:
+            size = (max(1, round(self.width * scale)), max(1, round(self.height * scale)))
+            if scale < 1 and min(size) < min_dimension:
+                break
+            for store in resized:
+                store.close()
+            resized.clear()
+            palettes.clear()
+            indexed.clear()
+
+            frame_counts = set()
+            for step in TARGET_FRAME_STEPS:
+                kept = frame_indices[::step]
+                if len(kept) in frame_counts:
+                    continue
+                frame_counts.add(len(kept))
+                # Where the frames change, measured once on the RGB frames and shared
+                # by the estimates for every palette size
+                changed_areas = self._changed_areas(frame_at(size, i) for i in kept)
+
+                for num_colors in TARGET_COLORS:
+                    setting = (size, step, num_colors)
+                    estimate = self._estimate_delta_size(
+                        lambda j: indexed_at(size, num_colors, kept[j]),
+                        changed_areas,
+                        palette_at(size, num_colors),
+                    )
+                    if estimate > max_bytes * ESTIMATE_MARGIN:
+                        continue
+                    data = encode(*setting)
+                    if len(data) <= max_bytes:
+                        encoded = data
+                        break
+                if encoded is not None:
+                    break
+            if encoded is not None:
+                break
+
+        fits = encoded is not None
+        size, step, num_colors = setting
+        if not fits:
+            # Nothing fits: save the smallest setting tried
+            encoded = encode(*setting)
+        for store in resized:
+            store.close()
+        output_path.write_bytes(encoded)
+
+        frame_count = len(frame_indices[::step])
+        fps = self.fps / step
+        file_size_kb = len(encoded) / 1024
+        info = {
+            "path": str(output_path),
+            "size_kb": file_size_kb,
+            "size_mb": file_size_kb / 1024,
+            "dimensions": f"{size[0]}x{size[1]}",
+            "frame_count": frame_count,
+            "fps": fps,
+            "duration_seconds": frame_count / fps,
+            "colors": num_colors,
+            "max_bytes": max_bytes,
+            "fits": fits,
+        }
+
+        if fits:
+            print(f"\n✓ GIF created within {max_bytes / 1024:.1f} KB!")
+        else:
+            print(f"\n  Note: No setting fits in {max_bytes / 1024:.1f} KB; saved the smallest")
+        print(f"  Path: {output_path}")
+        print(f"  Size: {file_size_kb:.1f} KB")
+        print(f"  Dimensions: {info['dimensions']}")
+        print(f"  Frames: {frame_count} @ {fps:g} fps")
+        print(f"  Colors: {num_colors}")
+
+        return info
+
     def clear(self):
         """Clear all frames (useful for creating multiple GIFs)."""
-        self.frames = []
+        self.frames.clear()
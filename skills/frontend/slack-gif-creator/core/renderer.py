@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Frame Renderer - Render animation frames in parallel.
+
+Frames are described by a pure function of the frame index and the eased animation
+progress, rendered by a pool of worker processes, and added to a GIFBuilder in order.
+"""
+
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Optional
+
+import numpy as np
+from PIL import Image
+
+from core.easing import get_easing
+from core.gif_builder import GIFBuilder
+
+# Type of a frame function: (frame_index, t) -> frame
+FrameFunction = Callable[[int, float], np.ndarray | Image.Image]
+
+
+def timeline(
+    num_frames: int, easing: str | Callable[[float], float] = "linear"
+) -> list[float]:
+    """
+    Eased progress value for each frame.
+
+    Args:
+        num_frames: Number of frames
+        easing: Name of an easing function (see core.easing) or an easing function
+
+    Returns:
+        List of t values, from easing(0.0) for the first frame to easing(1.0) for the last
+    """
+    ease_func = get_easing(easing) if isinstance(easing, str) else easing
+    if num_frames == 1:
+        return [ease_func(0.0)]
+    return [ease_func(i / (num_frames - 1)) for i in range(num_frames)]
+
+
+def _render_chunk(
+    frame_fn: FrameFunction, indices: list[int], times: list[float]
+) -> list[np.ndarray]:
+    """Render frames in a worker process and return them as RGB arrays."""
+    frames = []
+    for index, t in zip(indices, times):
+        frame = frame_fn(index, t)
+        if isinstance(frame, Image.Image):
+            frame = np.asarray(frame.convert("RGB"))
+        frames.append(frame)
+    return frames
+
+
+def render_frames(
+    builder: GIFBuilder,
+    frame_fn: FrameFunction,
+    num_frames: int,
+    easing: str | Callable[[float], float] = "linear",
+    jobs: Optional[int] = None,
+    chunk_size: int = 4,
+) -> int:
+    """
+    Render frames in parallel and add them to the builder in order.
+
+    `frame_fn(frame_index, t)` is called once per frame, where t is the eased
+    progress (0.0 to 1.0) of the frame, and returns the frame as a PIL Image or
+    numpy array. It runs in worker processes, so it must be a module-level function
+    (or functools.partial of one) that depends only on its arguments, and scripts
+    using this should guard their entry point with `if __name__ == "__main__":`.
+
+    Only a few chunks per worker are in flight at once, and each finished chunk is
+    added to the builder's frame store as soon as all frames before it are in.
+
+    Args:
+        builder: GIFBuilder to add the frames to
+        frame_fn: Pure frame function (frame_index, t) -> frame
+        num_frames: Number of frames to render
+        easing: Name of an easing function (see core.easing) or an easing function
+        jobs: Worker processes (default: CPU count; 1 renders in this process)
+        chunk_size: Frames rendered per task
+
+    Returns:
+        Number of frames added
+    """
+    times = timeline(num_frames, easing) if num_frames > 0 else []
+    chunks = [
+        (
+            list(range(start, min(start + chunk_size, num_frames))),
+            times[start : start + chunk_size],
+        )
+        for start in range(0, num_frames, chunk_size)
+    ]
+    jobs = jobs or os.cpu_count() or 1
+
+    if jobs == 1 or len(chunks) == 1:
+        for indices, chunk_times in chunks:
+            builder.add_frames(_render_chunk(frame_fn, indices, chunk_times))
+        return num_frames
+
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        pending = deque()
+        for indices, chunk_times in chunks:
+            pending.append(
+                executor.submit(_render_chunk, frame_fn, indices, chunk_times)
+            )
+            if len(pending) >= jobs * 2:
+                builder.add_frames(pending.popleft().result())
+        while pending:
+            builder.add_frames(pending.popleft().result())
+
+    return num_frames